@@ -0,0 +1,58 @@
+"""
+Process-local caches for Launch TMS
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from .metrics import record_cache_lookup
+
+
+class LocalTTLCache:
+    """
+    Thread-safe LRU cache whose entries also expire after ``ttl`` seconds.
+
+    Entries live in the current worker process only, so the TTL bounds how
+    long another process can serve a value after it was invalidated here.
+    Hits and misses are reported to /api/metrics under ``name``.
+    """
+
+    def __init__(self, name, max_size=10000, ttl=60):
+        self.name = name
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(key)
+                hit = True
+            else:
+                if entry is not None:
+                    del self._entries[key]
+                entry = None
+                hit = False
+        record_cache_lookup(self.name, hit)
+        return entry[0] if entry else None
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
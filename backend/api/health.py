@@ -0,0 +1,154 @@
+"""
+Readiness checks for Launch TMS
+
+Each check returns a dict with ``status`` ('ok' or 'fail'), ``latency_ms``
+and an optional ``detail``. Results are cached in-process for a few
+seconds so frequent load balancer probes do not add load.
+"""
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connection, transaction
+from django.db.migrations.executor import MigrationExecutor
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='health-check')
+_lock = threading.Lock()
+_cached_result = None
+_cached_at = 0.0
+_migrations_ok_at = 0.0
+
+
+def _options():
+    return getattr(settings, 'HEALTH_CHECKS', {})
+
+
+def _result(ok, started, detail=None):
+    result = {
+        'status': 'ok' if ok else 'fail',
+        'latency_ms': round((time.perf_counter() - started) * 1000, 2),
+    }
+    if detail:
+        result['detail'] = detail
+    return result
+
+
+def _over_budget(result, budget_ms):
+    if result['status'] == 'ok' and result['latency_ms'] > budget_ms:
+        result['status'] = 'fail'
+        result['detail'] = f"latency {result['latency_ms']}ms exceeds budget of {budget_ms}ms"
+    return result
+
+
+def check_database():
+    """Round trip to the database, bounded by statement_timeout on PostgreSQL"""
+    timeout_ms = _options().get('DATABASE_TIMEOUT_MS', 500)
+    started = time.perf_counter()
+    try:
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                if connection.vendor == 'postgresql':
+                    cursor.execute('SET LOCAL statement_timeout = %s', [int(timeout_ms)])
+                cursor.execute('SELECT 1')
+                cursor.fetchone()
+    except DatabaseError as e:
+        connection.close_if_unusable_or_obsolete()
+        return _result(False, started, str(e))
+    return _over_budget(_result(True, started), timeout_ms)
+
+
+def check_migrations():
+    """
+    All migrations applied. Loading the migration graph is comparatively
+    expensive, so a passing result is reused for MIGRATIONS_CACHE_SECONDS.
+    """
+    global _migrations_ok_at
+    started = time.perf_counter()
+    if time.monotonic() - _migrations_ok_at < _options().get('MIGRATIONS_CACHE_SECONDS', 300):
+        return _result(True, started)
+    try:
+        executor = MigrationExecutor(connection)
+        plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+    except DatabaseError as e:
+        return _result(False, started, str(e))
+    if plan:
+        pending = [f'{migration.app_label}.{migration.name}' for migration, _ in plan]
+        return _result(False, started, f"unapplied migrations: {', '.join(pending[:10])}")
+    _migrations_ok_at = time.monotonic()
+    return _result(True, started)
+
+
+def _cache_round_trip():
+    key = f'health-check:{uuid.uuid4().hex}'
+    cache.set(key, 'ok', 10)
+    value = cache.get(key)
+    cache.delete(key)
+    return value == 'ok'
+
+
+def check_cache():
+    """Write/read round trip to the default cache, abandoned after CACHE_TIMEOUT_MS"""
+    timeout_ms = _options().get('CACHE_TIMEOUT_MS', 200)
+    started = time.perf_counter()
+    try:
+        ok = _executor.submit(_cache_round_trip).result(timeout=timeout_ms / 1000)
+    except FutureTimeout:
+        return _result(False, started, f"no response within {timeout_ms}ms")
+    except Exception as e:
+        return _result(False, started, str(e))
+    return _result(ok, started, None if ok else 'value read back did not match')
+
+
+def check_database_connections():
+    """
+    Connections on the database server, from every client and database, below
+    MAX_CONNECTION_USAGE of max_connections (PostgreSQL only). This is server
+    headroom, not the usage of this process's own connections.
+    """
+    max_usage = _options().get('MAX_CONNECTION_USAGE', 0.9)
+    timeout_ms = _options().get('DATABASE_TIMEOUT_MS', 500)
+    started = time.perf_counter()
+    if connection.vendor != 'postgresql':
+        return _result(True, started, 'not applicable')
+    try:
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL statement_timeout = %s', [int(timeout_ms)])
+                cursor.execute(
+                    "SELECT COUNT(*), current_setting('max_connections')::int FROM pg_stat_activity"
+                )
+                in_use, max_connections = cursor.fetchone()
+    except DatabaseError as e:
+        connection.close_if_unusable_or_obsolete()
+        return _result(False, started, str(e))
+    usage = in_use / max_connections if max_connections else 0.0
+    result = _result(usage < max_usage, started, f"{in_use}/{max_connections} server connections in use (all clients)")
+    result['usage'] = round(usage, 3)
+    return result
+
+
+CHECKS = {
+    'database': check_database,
+    'migrations': check_migrations,
+    'cache': check_cache,
+    'database_connections': check_database_connections,
+}
+
+
+def run_readiness_checks():
+    """Run every readiness check, reusing a recent result when available"""
+    global _cached_result, _cached_at
+    ttl = _options().get('CACHE_SECONDS', 5)
+    with _lock:
+        if _cached_result is not None and time.monotonic() - _cached_at < ttl:
+            return _cached_result
+        checks = {name: check() for name, check in CHECKS.items()}
+        _cached_result = {
+            'status': 'ok' if all(c['status'] == 'ok' for c in checks.values()) else 'fail',
+            'checks': checks,
+        }
+        _cached_at = time.monotonic()
+        return _cached_result
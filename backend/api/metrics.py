@@ -0,0 +1,227 @@
+"""
+Prometheus-style metrics for Launch TMS
+
+Request metrics are kept in a small in-process registry (one per worker
+process) and rendered in the Prometheus text exposition format. Domain
+gauges come from a few aggregate queries whose results are cached, so
+frequent scrapes do not add database load.
+"""
+import bisect
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Count
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+OPEN_LOAD_EXCLUDED_STATUSES = ['delivered', 'cancelled']
+
+
+def _format_labels(names, values):
+    if not names:
+        return ''
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{name}="{escaped}"')
+    return '{' + ','.join(pairs) + '}'
+
+
+class Counter:
+    """Monotonic counter with optional labels"""
+    type_name = 'counter'
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        for label_values, value in items:
+            yield self.name, _format_labels(self.label_names, label_values), value
+
+
+class Histogram:
+    """Cumulative histogram with fixed buckets and optional labels"""
+    type_name = 'histogram'
+
+    def __init__(self, name, documentation, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(label_values)
+            if state is None:
+                state = self._values[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def samples(self):
+        with self._lock:
+            items = [(labels, (list(counts), total, count)) for labels, (counts, total, count) in self._values.items()]
+        label_names = self.label_names + ('le',)
+        for label_values, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                yield f'{self.name}_bucket', _format_labels(label_names, label_values + (le,)), cumulative
+            labels = _format_labels(self.label_names, label_values)
+            yield f'{self.name}_sum', labels, total
+            yield f'{self.name}_count', labels, count
+
+
+REQUEST_LATENCY = Histogram(
+    'launch_tms_http_request_duration_seconds',
+    'HTTP request latency by route',
+    labels=('method', 'route', 'status'),
+)
+REQUEST_QUERIES = Counter(
+    'launch_tms_http_request_db_queries_total',
+    'Database queries executed while serving HTTP requests',
+    labels=('method', 'route'),
+)
+CACHE_REQUESTS = Counter(
+    'launch_tms_cache_requests_total',
+    'Application cache lookups by cache name and result (hit/miss)',
+    labels=('cache', 'result'),
+)
+
+REGISTRY = [REQUEST_LATENCY, REQUEST_QUERIES, CACHE_REQUESTS]
+
+
+def record_cache_lookup(cache_name, hit):
+    """Count a hit or miss for one of the application caches"""
+    CACHE_REQUESTS.inc(cache_name, 'hit' if hit else 'miss')
+
+
+def get_or_compute(key, timeout, compute, cache_name='default'):
+    """Fetch ``key`` from the shared cache, computing and storing it on a miss"""
+    value = cache.get(key)
+    if value is not None:
+        record_cache_lookup(cache_name, True)
+        return value
+    record_cache_lookup(cache_name, False)
+    value = compute()
+    cache.set(key, value, timeout)
+    return value
+
+
+def collect_domain_gauges():
+    """Open loads by status, active drivers and trucks in maintenance, per company"""
+    from loads.models import Load
+    from drivers.models import Driver
+    from vehicles.models import Truck
+
+    open_loads = list(
+        Load.objects.exclude(status__in=OPEN_LOAD_EXCLUDED_STATUSES)
+        .values('company__code', 'status')
+        .annotate(total=Count('id'))
+        .order_by()
+    )
+    active_drivers = list(
+        Driver.objects.filter(status='active')
+        .values('company__code')
+        .annotate(total=Count('id'))
+        .order_by()
+    )
+    trucks_in_maintenance = list(
+        Truck.objects.filter(status='maintenance')
+        .values('company__code')
+        .annotate(total=Count('id'))
+        .order_by()
+    )
+    return {
+        'open_loads': [(row['company__code'], row['status'], row['total']) for row in open_loads],
+        'active_drivers': [(row['company__code'], row['total']) for row in active_drivers],
+        'trucks_in_maintenance': [(row['company__code'], row['total']) for row in trucks_in_maintenance],
+    }
+
+
+def collect_connection_stats():
+    """Server-side connection usage per database alias (PostgreSQL only)"""
+    stats = []
+    for connection in connections.all():
+        if connection.vendor != 'postgresql':
+            continue
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT COALESCE(state, 'unknown'), COUNT(*) FROM pg_stat_activity "
+                "WHERE datname = current_database() GROUP BY 1"
+            )
+            states = cursor.fetchall()
+            cursor.execute("SELECT current_setting('max_connections')::int")
+            max_connections = cursor.fetchone()[0]
+        stats.append((connection.alias, states, max_connections))
+    return stats
+
+
+def _gauge_samples():
+    options = getattr(settings, 'METRICS', {})
+    ttl = options.get('GAUGE_CACHE_SECONDS', 30)
+    gauges = get_or_compute('metrics:domain-gauges', ttl, collect_domain_gauges, cache_name='metrics')
+    connection_stats = get_or_compute('metrics:connection-stats', ttl, collect_connection_stats, cache_name='metrics')
+
+    lines = [
+        '# HELP launch_tms_open_loads Loads not yet delivered or cancelled, by status',
+        '# TYPE launch_tms_open_loads gauge',
+    ]
+    for company, load_status, total in gauges['open_loads']:
+        lines.append(f'launch_tms_open_loads{_format_labels(("company", "status"), (company, load_status))} {total}')
+    lines += [
+        '# HELP launch_tms_active_drivers Drivers with active status',
+        '# TYPE launch_tms_active_drivers gauge',
+    ]
+    for company, total in gauges['active_drivers']:
+        lines.append(f'launch_tms_active_drivers{_format_labels(("company",), (company,))} {total}')
+    lines += [
+        '# HELP launch_tms_trucks_in_maintenance Trucks currently in maintenance',
+        '# TYPE launch_tms_trucks_in_maintenance gauge',
+    ]
+    for company, total in gauges['trucks_in_maintenance']:
+        lines.append(f'launch_tms_trucks_in_maintenance{_format_labels(("company",), (company,))} {total}')
+
+    lines += [
+        '# HELP launch_tms_db_connections Connections to the application database from all clients, by state',
+        '# TYPE launch_tms_db_connections gauge',
+    ]
+    for alias, states, _ in connection_stats:
+        for state, total in states:
+            lines.append(f'launch_tms_db_connections{_format_labels(("alias", "state"), (alias, state))} {total}')
+    lines += [
+        '# HELP launch_tms_db_max_connections Configured max_connections of the database server',
+        '# TYPE launch_tms_db_max_connections gauge',
+    ]
+    for alias, _, max_connections in connection_stats:
+        lines.append(f'launch_tms_db_max_connections{_format_labels(("alias",), (alias,))} {max_connections}')
+    return lines
+
+
+def render_prometheus():
+    """Render every metric in the Prometheus text exposition format"""
+    gauge_lines = _gauge_samples()
+    lines = []
+    for metric in REGISTRY:
+        lines.append(f'# HELP {metric.name} {metric.documentation}')
+        lines.append(f'# TYPE {metric.name} {metric.type_name}')
+        for name, labels, value in metric.samples():
+            lines.append(f'{name}{labels} {value}')
+    lines.extend(gauge_lines)
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,160 @@
+"""
+Middleware for Launch TMS
+"""
+import logging
+import os
+import random
+import re
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from .metrics import REQUEST_LATENCY, REQUEST_QUERIES
+from .profiling import RequestProfile
+
+logger = logging.getLogger('api.profiling')
+
+
+class MetricsMiddleware:
+    """Records per-route latency and database query counts for /api/metrics"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        query_count = [0]
+
+        def count_query(execute, sql, params, many, context):
+            query_count[0] += 1
+            return execute(sql, params, many, context)
+
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(count_query))
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - started
+
+        match = getattr(request, 'resolver_match', None)
+        route = match.view_name if match and match.view_name else 'unresolved'
+        REQUEST_LATENCY.observe(elapsed, request.method, route, str(response.status_code))
+        if query_count[0]:
+            REQUEST_QUERIES.inc(request.method, route, amount=query_count[0])
+        return response
+
+
+class RequestProfilingMiddleware:
+    """
+    Records SQL count/time, serialization time, render time and response size.
+
+    Off unless ``REQUEST_PROFILING['ENABLED']`` is set. When enabled, a request
+    is profiled if it carries the profiling header (matching ``HEADER_TOKEN``
+    when one is configured) or is picked by ``SAMPLE_RATE``. Profiled requests
+    get a ``Server-Timing`` header and a structured log line; when
+    ``PROFILE_DIR`` is set, sampled requests slower than ``SLOW_REQUEST_MS``
+    also get a cProfile/pyinstrument dump.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        options = getattr(settings, 'REQUEST_PROFILING', {})
+        self.enabled = options.get('ENABLED', False)
+        self.header = 'HTTP_' + options.get('HEADER', 'X-Profile-Request').upper().replace('-', '_')
+        self.header_token = options.get('HEADER_TOKEN', '')
+        self.sample_rate = options.get('SAMPLE_RATE', 0.0)
+        self.slow_request_ms = options.get('SLOW_REQUEST_MS', 500)
+        self.profile_dir = options.get('PROFILE_DIR', '')
+        self.profiler = options.get('PROFILER', 'cprofile')
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        sampled = self.sample_rate > 0 and random.random() < self.sample_rate
+        if not (sampled or self._requested(request)):
+            return self.get_response(request)
+
+        profile = RequestProfile(sampled=sampled)
+        request.request_profile = profile
+        profiler = self._start_profiler() if sampled and self.profile_dir else None
+
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(profile.record_query))
+            response = self.get_response(request)
+
+        profile.finish(response)
+        if profiler is not None:
+            self._stop_profiler(profiler, request, profile)
+
+        response['Server-Timing'] = profile.server_timing()
+        logger.info(profile.as_log_line(request, response))
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        profile = getattr(request, 'request_profile', None)
+        if profile is not None:
+            profile.mark_view_started()
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered after this hook, so this splits view and render time
+        profile = getattr(request, 'request_profile', None)
+        if profile is not None:
+            profile.mark_view_finished()
+            response.add_post_render_callback(profile.mark_rendered)
+        return response
+
+    def _requested(self, request):
+        value = request.META.get(self.header)
+        if not value:
+            return False
+        if self.header_token:
+            return value == self.header_token
+        return value.lower() in ('1', 'true', 'yes')
+
+    def _start_profiler(self):
+        if self.profiler == 'pyinstrument':
+            try:
+                from pyinstrument import Profiler
+            except ImportError:
+                logger.warning("pyinstrument is not installed; falling back to cProfile")
+            else:
+                profiler = Profiler()
+                profiler.start()
+                return profiler
+
+        import cProfile
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is already active on this thread
+            return None
+        return profiler
+
+    def _stop_profiler(self, profiler, request, profile):
+        is_cprofile = hasattr(profiler, 'disable')
+        if is_cprofile:
+            profiler.disable()
+        else:
+            profiler.stop()
+
+        if profile.total_ms < self.slow_request_ms:
+            return
+
+        slug = re.sub(r'[^A-Za-z0-9]+', '-', request.path).strip('-') or 'root'
+        filename = f"{time.strftime('%Y%m%d-%H%M%S')}-{request.method}-{slug}-{int(profile.total_ms)}ms"
+        try:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            if is_cprofile:
+                path = os.path.join(self.profile_dir, f'{filename}.prof')
+                profiler.dump_stats(path)
+            else:
+                path = os.path.join(self.profile_dir, f'{filename}.html')
+                with open(path, 'w') as fh:
+                    fh.write(profiler.output_html())
+            logger.info(f"Wrote profile for slow request {request.method} {request.path} to {path}")
+        except OSError as e:
+            logger.error(f"Failed to write request profile: {str(e)}")
@@ -0,0 +1,96 @@
+"""
+Per-request profiling data for Launch TMS
+"""
+import json
+import time
+
+
+class RequestProfile:
+    """
+    Timing breakdown for a single request.
+
+    ``serialize_ms`` is the time spent inside the view outside the database.
+    For the DRF viewsets that is dominated by serializer work, since querysets
+    are evaluated lazily while the serializer walks them.
+    """
+
+    def __init__(self, sampled=False):
+        self.sampled = sampled
+        self.started = time.perf_counter()
+        self.view_started = None
+        self.view_finished = None
+        self.view_sql_ms = 0.0
+        self.render_finished = None
+        self.finished = None
+        self.sql_count = 0
+        self.sql_ms = 0.0
+        self.response_bytes = None
+
+    def record_query(self, execute, sql, params, many, context):
+        """Database execute wrapper: counts and times every query"""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_count += 1
+            self.sql_ms += (time.perf_counter() - started) * 1000
+
+    def mark_view_started(self):
+        self.view_started = time.perf_counter()
+        self.view_sql_ms = self.sql_ms
+
+    def mark_view_finished(self):
+        self.view_finished = time.perf_counter()
+        self.view_sql_ms = self.sql_ms - self.view_sql_ms
+
+    def mark_rendered(self, response=None):
+        self.render_finished = time.perf_counter()
+
+    def finish(self, response):
+        self.finished = time.perf_counter()
+        if self.view_started and not self.view_finished:
+            self.mark_view_finished()
+        if not getattr(response, 'streaming', False):
+            self.response_bytes = len(response.content)
+
+    @property
+    def total_ms(self):
+        return ((self.finished or time.perf_counter()) - self.started) * 1000
+
+    @property
+    def serialize_ms(self):
+        if not (self.view_started and self.view_finished):
+            return None
+        return max(0.0, (self.view_finished - self.view_started) * 1000 - self.view_sql_ms)
+
+    @property
+    def render_ms(self):
+        if not (self.view_finished and self.render_finished):
+            return None
+        return (self.render_finished - self.view_finished) * 1000
+
+    def server_timing(self):
+        """Value for the ``Server-Timing`` response header"""
+        metrics = [f'db;dur={self.sql_ms:.2f};desc="{self.sql_count} queries"']
+        if self.serialize_ms is not None:
+            metrics.append(f'serialize;dur={self.serialize_ms:.2f}')
+        if self.render_ms is not None:
+            metrics.append(f'render;dur={self.render_ms:.2f}')
+        metrics.append(f'total;dur={self.total_ms:.2f}')
+        return ', '.join(metrics)
+
+    def as_log_line(self, request, response):
+        """Structured (JSON) representation for log aggregation"""
+        return json.dumps({
+            'event': 'request_profile',
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'sampled': self.sampled,
+            'total_ms': round(self.total_ms, 2),
+            'db_queries': self.sql_count,
+            'db_ms': round(self.sql_ms, 2),
+            'serialize_ms': None if self.serialize_ms is None else round(self.serialize_ms, 2),
+            'render_ms': None if self.render_ms is None else round(self.render_ms, 2),
+            'response_bytes': self.response_bytes,
+        })
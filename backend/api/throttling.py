@@ -0,0 +1,220 @@
+"""
+Request throttling for Launch TMS
+
+Each request takes a token from one bucket per applicable key: the user's
+company, the user, and (for anonymous requests) the client IP. A bucket
+holds up to its burst size and refills at the configured rate (600/min is
+one token every 0.1 s), so a client can never exceed burst + rate over any
+interval, including across minute boundaries. An empty bucket answers 429
+with a Retry-After header for when the next token arrives.
+
+Buckets use GCRA: the cache stores one number per key, the theoretical
+arrival time of the next request, and a request is allowed when that time
+is no more than ``burst`` emission intervals ahead of now. With Redis the
+check-and-update runs as one Lua script (atomic across workers, on the
+Redis clock); the local-memory cache is per process, so a process lock
+makes its get/set atomic.
+
+Budgets separate traffic classes so that a bulk import or export cannot
+exhaust the allowance for ordinary reads and writes:
+
+* ``read`` / ``write`` - chosen from the HTTP method by default
+* ``export`` / ``bulk`` - opted into by the view
+* ``login`` - credential endpoints, limited per client IP and per submitted
+  account (``LOGIN_THROTTLES``) so password guessing gets a tight budget of
+  its own
+
+ViewSets set ``throttle_budget`` (whole view) or ``throttle_budgets``
+(per action, e.g. ``{'bulk_assign': 'bulk'}``); function views use
+``@throttle_classes(throttles_for('export'))``.
+
+Rates come from ``THROTTLING['RATES']`` and burst sizes from
+``THROTTLING['BURSTS']`` (same budget/kind layout; a missing burst means a
+whole period's allowance). Buckets live in the cache named by
+``THROTTLING['CACHE']`` (local memory by default, Redis when ``REDIS_URL``
+is configured), which is shared by all workers only in the Redis case.
+"""
+import hashlib
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.throttling import BaseThrottle
+
+PERIODS = {'s': 1, 'sec': 1, 'm': 60, 'min': 60, 'h': 3600, 'hour': 3600, 'd': 86400, 'day': 86400}
+
+
+def parse_rate(rate):
+    """Return (requests, seconds) for a rate such as '600/min', or None"""
+    if not rate:
+        return None
+    num, period = rate.split('/')
+    return int(num), PERIODS[period]
+
+
+def _options():
+    return getattr(settings, 'THROTTLING', {})
+
+
+# KEYS[1] bucket; ARGV: emission interval, burst (both seconds-based floats).
+# Returns '' when allowed, else the seconds until a token is available.
+GCRA_SCRIPT = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+local interval = tonumber(ARGV[1])
+local tolerance = interval * tonumber(ARGV[2])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then tat = now end
+local new_tat = tat + interval
+local wait = new_tat - tolerance - now
+if wait > 0 then return tostring(wait) end
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil((new_tat - now) * 1000))
+return ''
+"""
+
+_local_lock = threading.Lock()
+
+
+def _redis_client(cache, key):
+    """The redis-py client behind Django's RedisCache, or None for other backends"""
+    backend = getattr(cache, '_cache', None)
+    if not hasattr(backend, 'get_client'):
+        return None
+    return backend.get_client(key, write=True)
+
+
+def take_token(cache, key, interval, burst):
+    """
+    Take one token from the GCRA bucket ``key``. Returns None when allowed,
+    else the seconds until a token is available.
+    """
+    client = _redis_client(cache, key)
+    if client is not None:
+        wait = client.eval(GCRA_SCRIPT, 1, cache.make_and_validate_key(key), interval, burst)
+        wait = wait.decode() if isinstance(wait, bytes) else wait
+        return float(wait) if wait else None
+
+    tolerance = interval * burst
+    with _local_lock:
+        now = time.time()
+        tat = max(cache.get(key, now), now)
+        new_tat = tat + interval
+        wait = new_tat - tolerance - now
+        if wait > 0:
+            return wait
+        cache.set(key, new_tat, math.ceil(new_tat - now))
+    return None
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Base class; subclasses define ``kind`` and ``get_bucket_key``"""
+    kind = None
+    budget = None
+
+    def get_bucket_key(self, request):
+        raise NotImplementedError
+
+    def get_budget(self, request, view):
+        if self.budget:
+            return self.budget
+        action = getattr(view, 'action', None)
+        budgets = getattr(view, 'throttle_budgets', None) or {}
+        if action in budgets:
+            return budgets[action]
+        budget = getattr(view, 'throttle_budget', None)
+        if budget:
+            return budget
+        return 'read' if request.method in SAFE_METHODS else 'write'
+
+    def allow_request(self, request, view):
+        self.wait_seconds = None
+        options = _options()
+        if not options.get('ENABLED', True):
+            return True
+
+        ident = self.get_bucket_key(request)
+        if ident is None:
+            return True
+        budget = self.get_budget(request, view)
+        parsed = parse_rate(options.get('RATES', {}).get(budget, {}).get(self.kind))
+        if parsed is None:
+            return True
+        limit, period = parsed
+        burst = options.get('BURSTS', {}).get(budget, {}).get(self.kind) or limit
+
+        cache = caches[options.get('CACHE', 'default')]
+        key = f"throttle:{budget}:{self.kind}:{ident}"
+        self.wait_seconds = take_token(cache, key, period / limit, burst)
+        return self.wait_seconds is None
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class CompanyRateThrottle(TokenBucketThrottle):
+    """Shared bucket for every user of a company"""
+    kind = 'company'
+
+    def get_bucket_key(self, request):
+        user = request.user
+        if not getattr(user, 'is_authenticated', False):
+            return None
+        company_id = getattr(user, 'company_id', None)
+        return str(company_id) if company_id else None
+
+
+class UserRateThrottle(TokenBucketThrottle):
+    """Bucket per authenticated user"""
+    kind = 'user'
+
+    def get_bucket_key(self, request):
+        user = request.user
+        if not getattr(user, 'is_authenticated', False):
+            return None
+        return str(user.pk)
+
+
+class IPRateThrottle(TokenBucketThrottle):
+    """Bucket per client IP for anonymous requests"""
+    kind = 'ip'
+
+    def get_bucket_key(self, request):
+        if getattr(request.user, 'is_authenticated', False):
+            return None
+        return self.get_ident(request)
+
+
+class AccountRateThrottle(TokenBucketThrottle):
+    """Bucket per submitted login identifier, however many IPs the attempts come from"""
+    kind = 'account'
+    budget = 'login'
+
+    def get_bucket_key(self, request):
+        identifier = request.data.get('email') if hasattr(request.data, 'get') else None
+        if not isinstance(identifier, str) or not identifier.strip():
+            return None
+        # Hashed to keep arbitrary input out of cache keys
+        return hashlib.sha256(identifier.strip().lower().encode()).hexdigest()
+
+
+class LoginIPRateThrottle(IPRateThrottle):
+    """Bucket per client IP for credential endpoints"""
+    budget = 'login'
+
+
+DEFAULT_THROTTLES = [CompanyRateThrottle, UserRateThrottle, IPRateThrottle]
+LOGIN_THROTTLES = [LoginIPRateThrottle, AccountRateThrottle]
+_budget_throttles = {}
+
+
+def throttles_for(budget):
+    """Throttle classes pinned to ``budget``, for function-based views"""
+    if budget not in _budget_throttles:
+        _budget_throttles[budget] = [
+            type(f'{budget.title()}{throttle.__name__}', (throttle,), {'budget': budget})
+            for throttle in DEFAULT_THROTTLES
+        ]
+    return _budget_throttles[budget]
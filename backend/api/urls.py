@@ -22,11 +22,16 @@ from companies.auth_views import (
     user_permissions,
 )
 from drivers.views import DriverViewSet
-from vehicles.views import TruckViewSet, TrailerViewSet
-from loads.views import LoadViewSet
+from vehicles.views import TruckViewSet, TrailerViewSet, MaintenanceRecordViewSet
+from loads.views import LoadViewSet, LoadEventViewSet
+from dispatch.views import nearest, optimize, truck_positions
+from reports.views import export_table, incidents, load_volume, lsw_daily, utilization
+from documents.views import (
+    DocumentDownloadView, DocumentImageView, DocumentThumbnailView, upload_session, upload_sessions,
+)
 
 # Import API views
-from .views import health_check
+from .views import health_check, liveness, readiness, metrics
 
 # Create router and register viewsets
 router = DefaultRouter()
@@ -38,11 +43,37 @@ router.register(r'users', UserViewSet)
 router.register(r'drivers', DriverViewSet)
 router.register(r'trucks', TruckViewSet)
 router.register(r'trailers', TrailerViewSet)
+router.register(r'maintenance-records', MaintenanceRecordViewSet)
 router.register(r'loads', LoadViewSet)
+router.register(r'load-events', LoadEventViewSet)
 
 urlpatterns = [
     # Health check
     path('health/', health_check, name='health_check'),
+    path('health/live/', liveness, name='health_live'),
+    path('health/ready/', readiness, name='health_ready'),
+    
+    # Prometheus metrics
+    path('metrics', metrics, name='metrics'),
+    
+    # Dispatch
+    path('dispatch/nearest/', nearest, name='dispatch_nearest'),
+    path('dispatch/positions/', truck_positions, name='dispatch_positions'),
+    path('dispatch/optimize/', optimize, name='dispatch_optimize'),
+    
+    # Reports
+    path('reports/lsw-daily/', lsw_daily, name='reports_lsw_daily'),
+    path('reports/load-volume/', load_volume, name='reports_load_volume'),
+    path('reports/utilization/', utilization, name='reports_utilization'),
+    path('reports/incidents/', incidents, name='reports_incidents'),
+    path('reports/export/<str:table>/', export_table, name='reports_export'),
+    
+    # Documents
+    path('documents/uploads/', upload_sessions, name='document_uploads'),
+    path('documents/uploads/<uuid:pk>/', upload_session, name='document_upload'),
+    path('documents/<str:kind>/<uuid:pk>/download/', DocumentDownloadView.as_view(), name='document_download'),
+    path('documents/<str:kind>/<uuid:pk>/thumbnail/', DocumentThumbnailView.as_view(), name='document_thumbnail'),
+    path('documents/<str:kind>/<uuid:pk>/image/', DocumentImageView.as_view(), name='document_image'),
       # Public endpoints (no authentication required)
     path('companies/public/', public_companies, name='public_companies'),
     
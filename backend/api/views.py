@@ -1,13 +1,19 @@
 """
 API Views for Launch TMS
 """
+import hmac
+
 from django.shortcuts import render
-from rest_framework.decorators import api_view, permission_classes
+from django.http import HttpResponse
+from rest_framework.decorators import api_view, authentication_classes, permission_classes, throttle_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework import status
 from django.conf import settings
 
+from .health import run_readiness_checks
+from .metrics import render_prometheus
+
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def health_check(request):
@@ -28,3 +34,43 @@ def health_check(request):
             '/api/companies/',
         ]
     }, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@authentication_classes([])
+@permission_classes([AllowAny])
+@throttle_classes([])
+def liveness(request):
+    """
+    Liveness probe: the process is up and serving requests.
+    Deliberately touches no external dependency.
+    """
+    return Response({'status': 'ok'}, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@authentication_classes([])
+@permission_classes([AllowAny])
+@throttle_classes([])
+def readiness(request):
+    """
+    Readiness probe: database round trip, migrations, cache and connection
+    usage, each within its latency budget. Returns 503 when any check fails.
+    """
+    result = run_readiness_checks()
+    http_status = status.HTTP_200_OK if result['status'] == 'ok' else status.HTTP_503_SERVICE_UNAVAILABLE
+    return Response(result, status=http_status)
+
+
+def metrics(request):
+    """
+    Prometheus text-format metrics: request latency, query counts, cache
+    hit rates, database connection usage and domain gauges
+    """
+    token = settings.METRICS.get('TOKEN')
+    user = getattr(request, 'user', None)
+    # Fail closed: without a configured token only staff sessions may read metrics
+    authorized = bool(token) and hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}')
+    if not authorized and not (user is not None and user.is_authenticated and user.is_staff):
+        return HttpResponse('Unauthorized\n', status=401, content_type='text/plain')
+    return HttpResponse(render_prometheus(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,11 @@
+"""
+Launch TMS API benchmark suite
+
+Seeds a reproducible dataset of configurable size and measures latency,
+throughput, query counts and peak memory for the main REST endpoints.
+
+Usage (from the backend directory):
+    python -m benchmarks seed --loads 100000
+    python -m benchmarks run --loads 100000 --output results/HEAD.json
+    python -m benchmarks compare results/base.json results/HEAD.json
+"""
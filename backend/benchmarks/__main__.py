@@ -0,0 +1,85 @@
+"""
+Command line entry point: python -m benchmarks {seed,run,login,compare,clear}
+"""
+import argparse
+import os
+import sys
+
+import django
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Launch TMS API benchmarks')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    size_help = 'Number of loads, or one of: small (1k), medium (100k), large (1M)'
+
+    seed_parser = subparsers.add_parser('seed', help='Create the benchmark dataset')
+    seed_parser.add_argument('--loads', default='small', help=size_help)
+    seed_parser.add_argument('--seed', type=int, default=42, help='Random seed for reproducible data')
+
+    run_parser = subparsers.add_parser('run', help='Seed (if needed) and run the benchmarks')
+    run_parser.add_argument('--loads', default='small', help=size_help)
+    run_parser.add_argument('--seed', type=int, default=42, help='Random seed for reproducible data')
+    run_parser.add_argument('--iterations', type=int, default=50, help='Timed requests per scenario')
+    run_parser.add_argument('--warmup', type=int, default=5, help='Untimed requests per scenario')
+    run_parser.add_argument('--scenario', action='append', help='Only run the named scenario (repeatable)')
+    run_parser.add_argument('--output', help='Write JSON results to this path')
+
+    login_parser = subparsers.add_parser('login', help='Measure sustained login throughput')
+    login_parser.add_argument('--loads', default='small', help=size_help)
+    login_parser.add_argument('--seed', type=int, default=42, help='Random seed for reproducible data')
+    login_parser.add_argument('--concurrency', type=int, default=8, help='Concurrent login workers')
+    login_parser.add_argument('--duration', type=float, default=30.0, help='Seconds to sustain the load')
+    login_parser.add_argument('--target', type=float, default=200, help='Required logins/sec per node')
+    login_parser.add_argument('--output', help='Write JSON results to this path')
+
+    compare_parser = subparsers.add_parser('compare', help='Compare two result files')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.10, help='Allowed p95 regression (0.10 = 10%%)')
+
+    subparsers.add_parser('clear', help='Delete the benchmark dataset')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'compare':
+        from .compare import compare_results
+        return 0 if compare_results(args.baseline, args.current, args.threshold) else 1
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'launch_tms.settings')
+    # Measure the application, not the rate limiter
+    os.environ.setdefault('THROTTLING_ENABLED', 'False')
+    django.setup()
+
+    from .seed import clear_dataset, resolve_size, seed_dataset
+
+    if args.command == 'clear':
+        clear_dataset()
+        return 0
+
+    num_loads = resolve_size(args.loads)
+    seed_dataset(num_loads, seed=args.seed)
+    if args.command == 'seed':
+        return 0
+
+    from .runner import run_benchmarks, write_results
+    if args.command == 'login':
+        from .login import run_login_throughput
+        results = run_login_throughput(
+            num_loads, concurrency=args.concurrency, duration=args.duration, target_rps=args.target,
+        )
+    else:
+        results = run_benchmarks(num_loads, iterations=args.iterations, warmup=args.warmup, only=args.scenario)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        write_results(results, args.output)
+        print(f"Results written to {args.output}")
+    if args.command == 'login' and not results['scenarios']['login_throughput']['meets_target']:
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,30 @@
+"""
+Regression comparison between two benchmark result files
+"""
+import json
+
+
+def compare_results(baseline_path, current_path, threshold=0.10, stdout=print):
+    """
+    Print per-scenario p95 deltas between two result files.
+    Returns True when no scenario regressed beyond ``threshold``.
+    """
+    with open(baseline_path) as fh:
+        baseline = json.load(fh)
+    with open(current_path) as fh:
+        current = json.load(fh)
+
+    ok = True
+    stdout(f"{'scenario':<26}{'base p95':>12}{'curr p95':>12}{'delta':>9}{'queries':>12}")
+    for name, summary in current['scenarios'].items():
+        base = baseline['scenarios'].get(name)
+        if not base:
+            stdout(f"{name:<26}{'-':>12}{summary['p95_ms']:>12}{'new':>9}")
+            continue
+        delta = (summary['p95_ms'] - base['p95_ms']) / base['p95_ms'] if base['p95_ms'] else 0.0
+        queries = f"{base['query_count']}->{summary['query_count']}"
+        regressed = delta > threshold or summary['query_count'] > base['query_count']
+        marker = ' !' if regressed else ''
+        stdout(f"{name:<26}{base['p95_ms']:>12}{summary['p95_ms']:>12}{delta:>+9.1%}{queries:>12}{marker}")
+        ok = ok and not regressed
+    return ok
@@ -0,0 +1,86 @@
+"""
+Sustained login throughput benchmark
+
+Simulates a shift change: ``concurrency`` workers log in back to back for
+``duration`` seconds and the achieved logins/sec is compared against the
+per-node target. Password hashing dominates the cost, so results depend on
+``PASSWORD_PBKDF2_ITERATIONS`` and the number of CPU cores.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection
+from django.test import Client
+
+from .runner import HTTP_HOST, collect_metadata, percentile
+from .seed import BENCH_USER_EMAIL, BENCH_USER_PASSWORD
+
+LOGIN_PATH = '/api/auth/login/'
+DEFAULT_TARGET_RPS = 200
+
+
+def _login_worker(deadline, timings, failures, lock):
+    client = Client(HTTP_HOST=HTTP_HOST)
+    payload = {'email': BENCH_USER_EMAIL, 'password': BENCH_USER_PASSWORD}
+    local_timings = []
+    local_failures = 0
+    try:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            response = client.post(LOGIN_PATH, data=payload, content_type='application/json')
+            local_timings.append((time.perf_counter() - started) * 1000)
+            if response.status_code != 200:
+                local_failures += 1
+    finally:
+        connection.close()
+    with lock:
+        timings.extend(local_timings)
+        failures.append(local_failures)
+
+
+def run_login_throughput(num_loads, concurrency=8, duration=30.0, target_rps=DEFAULT_TARGET_RPS, stdout=print):
+    """Run the login load test and return a results document"""
+    from django.conf import settings
+
+    iterations = settings.PASSWORD_HASHING.get('PBKDF2_ITERATIONS')
+    stdout(f"Logging in with {concurrency} workers for {duration:g}s (PBKDF2 iterations: {iterations})...")
+
+    timings, failures, lock = [], [], threading.Lock()
+    started = time.perf_counter()
+    deadline = started + duration
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [
+            executor.submit(_login_worker, deadline, timings, failures, lock)
+            for _ in range(concurrency)
+        ]
+        for future in futures:
+            future.result()
+    elapsed = time.perf_counter() - started
+    timings.sort()
+
+    failed = sum(failures)
+    succeeded = len(timings) - failed
+    throughput = round(succeeded / elapsed, 2) if elapsed else 0.0
+    summary = {
+        'method': 'POST',
+        'path': LOGIN_PATH,
+        'concurrency': concurrency,
+        'duration_s': round(elapsed, 2),
+        'requests': len(timings),
+        'failures': failed,
+        'p50_ms': round(percentile(timings, 50), 3),
+        'p95_ms': round(percentile(timings, 95), 3),
+        'p99_ms': round(percentile(timings, 99), 3),
+        'throughput_rps': throughput,
+        'target_rps': target_rps,
+        'meets_target': failed == 0 and throughput >= target_rps,
+        'pbkdf2_iterations': iterations,
+    }
+    stdout(
+        f"  {throughput} logins/s (target {target_rps}) p50={summary['p50_ms']}ms "
+        f"p95={summary['p95_ms']}ms failures={failed}"
+    )
+
+    meta = collect_metadata(num_loads, len(timings), 0)
+    return {'meta': meta, 'scenarios': {'login_throughput': summary}}
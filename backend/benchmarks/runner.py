@@ -0,0 +1,161 @@
+"""
+Scenario runner for the benchmark suite
+
+Requests are issued in-process through Django's test client so results
+measure the application stack (middleware, auth, ORM, serialization,
+rendering) without network noise.
+"""
+import json
+import platform
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import django
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from .seed import BENCH_USER_EMAIL, BENCH_USER_PASSWORD
+
+HTTP_HOST = 'localhost'
+
+
+class Scenario:
+    """A single benchmarked request"""
+
+    def __init__(self, name, method, path, data=None, authenticated=True):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.data = data
+        self.authenticated = authenticated
+
+    def request(self, client, headers):
+        if self.method == 'POST':
+            return client.post(self.path, data=self.data, content_type='application/json', **headers)
+        return client.get(self.path, **headers)
+
+
+SCENARIOS = [
+    Scenario('load_list', 'GET', '/api/loads/'),
+    Scenario('driver_list', 'GET', '/api/drivers/'),
+    Scenario('organization_hierarchy', 'GET', '/api/organizations/hierarchy/'),
+    Scenario('login', 'POST', '/api/auth/login/', data={
+        'email': BENCH_USER_EMAIL, 'password': BENCH_USER_PASSWORD,
+    }, authenticated=False),
+]
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100.0 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def obtain_access_token(client):
+    response = client.post('/api/auth/login/', data={
+        'email': BENCH_USER_EMAIL, 'password': BENCH_USER_PASSWORD,
+    }, content_type='application/json')
+    if response.status_code != 200:
+        raise RuntimeError(f"Benchmark login failed ({response.status_code}): {response.content[:200]!r}")
+    return response.json()['access']
+
+
+def run_scenario(scenario, client, headers, iterations, warmup):
+    """Measure one scenario and return its summary statistics"""
+    request_headers = headers if scenario.authenticated else {}
+
+    for _ in range(warmup):
+        scenario.request(client, request_headers)
+
+    # Query count and response size from a single captured request
+    with CaptureQueriesContext(connection) as queries:
+        response = scenario.request(client, request_headers)
+    if response.status_code >= 400:
+        raise RuntimeError(f"{scenario.name} returned {response.status_code}: {response.content[:200]!r}")
+    query_count = len(queries.captured_queries)
+    response_bytes = len(response.content)
+
+    # Peak memory from a single traced request (tracing skews timings)
+    tracemalloc.start()
+    scenario.request(client, request_headers)
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        request_started = time.perf_counter()
+        scenario.request(client, request_headers)
+        timings.append((time.perf_counter() - request_started) * 1000)
+    elapsed = time.perf_counter() - started
+    timings.sort()
+
+    return {
+        'method': scenario.method,
+        'path': scenario.path,
+        'iterations': iterations,
+        'p50_ms': round(percentile(timings, 50), 3),
+        'p95_ms': round(percentile(timings, 95), 3),
+        'p99_ms': round(percentile(timings, 99), 3),
+        'mean_ms': round(sum(timings) / len(timings), 3),
+        'max_ms': round(timings[-1], 3),
+        'throughput_rps': round(iterations / elapsed, 2) if elapsed else 0.0,
+        'query_count': query_count,
+        'peak_memory_bytes': peak_memory,
+        'response_bytes': response_bytes,
+    }
+
+
+def run_benchmarks(num_loads, iterations=50, warmup=5, only=None, stdout=print):
+    """Run every (or the selected) scenario and return a results document"""
+    client = Client(HTTP_HOST=HTTP_HOST)
+    headers = {'HTTP_AUTHORIZATION': f'Bearer {obtain_access_token(client)}'}
+
+    results = {}
+    for scenario in SCENARIOS:
+        if only and scenario.name not in only:
+            continue
+        stdout(f"Running {scenario.name} ({iterations} iterations)...")
+        results[scenario.name] = run_scenario(scenario, client, headers, iterations, warmup)
+        summary = results[scenario.name]
+        stdout(
+            f"  p50={summary['p50_ms']}ms p95={summary['p95_ms']}ms p99={summary['p99_ms']}ms "
+            f"rps={summary['throughput_rps']} queries={summary['query_count']}"
+        )
+
+    return {
+        'meta': collect_metadata(num_loads, iterations, warmup),
+        'scenarios': results,
+    }
+
+
+def collect_metadata(num_loads, iterations, warmup):
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'git_commit': _git_commit(),
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+        'dataset_loads': num_loads,
+        'iterations': iterations,
+        'warmup': warmup,
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL, text=True,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_results(results, path):
+    with open(path, 'w') as fh:
+        json.dump(results, fh, indent=2, sort_keys=True)
@@ -0,0 +1,231 @@
+"""
+Deterministic dataset seeding for the benchmark suite
+
+All benchmark rows live under a dedicated company (code ``BENCH``) so they
+can be created and removed without touching real tenant data.
+"""
+import io
+import random
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+from django.core.management import call_command
+from django.db import transaction
+
+from companies.models import Company, Division, Department, Terminal, CustomUser
+from drivers.models import Driver
+from vehicles.models import Truck, Trailer
+from loads.models import Load
+
+BENCH_COMPANY_CODE = 'BENCH'
+BENCH_USER_EMAIL = 'bench@launchtms.com'
+BENCH_USER_PASSWORD = 'bench-password-123'
+
+# Named dataset sizes (number of loads)
+DATASET_SIZES = {
+    'small': 1_000,
+    'medium': 100_000,
+    'large': 1_000_000,
+}
+
+BATCH_SIZE = 5000
+
+CITIES = [
+    ('Houston', 'TX', '77001', Decimal('29.76043'), Decimal('-95.36980')),
+    ('Dallas', 'TX', '75201', Decimal('32.77666'), Decimal('-96.79699')),
+    ('Chicago', 'IL', '60601', Decimal('41.87811'), Decimal('-87.62980')),
+    ('Atlanta', 'GA', '30301', Decimal('33.74900'), Decimal('-84.38798')),
+    ('Denver', 'CO', '80201', Decimal('39.73924'), Decimal('-104.99025')),
+    ('Memphis', 'TN', '37501', Decimal('35.14953'), Decimal('-90.04898')),
+    ('Phoenix', 'AZ', '85001', Decimal('33.44838'), Decimal('-112.07404')),
+    ('Columbus', 'OH', '43085', Decimal('39.96118'), Decimal('-82.99879')),
+]
+
+LOAD_STATUSES = ['pending', 'assigned', 'in_transit', 'delivered', 'cancelled']
+LOAD_STATUS_WEIGHTS = [5, 5, 15, 70, 5]
+# Pickup dates count back from this instant, so a seed always yields the same rows
+LOAD_DATE_ANCHOR = datetime(2025, 7, 1, tzinfo=timezone.utc)
+
+
+def resolve_size(value):
+    """Accept a named dataset size or an explicit load count"""
+    if str(value) in DATASET_SIZES:
+        return DATASET_SIZES[str(value)]
+    return int(value)
+
+
+def get_bench_company():
+    return Company.objects.filter(code=BENCH_COMPANY_CODE).first()
+
+
+def clear_dataset(stdout=print):
+    """Remove every row owned by the benchmark company"""
+    company = get_bench_company()
+    if company:
+        stdout(f"Clearing benchmark dataset ({company.loads.count()} loads)...")
+        company.delete()
+    CustomUser.objects.filter(email=BENCH_USER_EMAIL).delete()
+
+
+def seed_dataset(num_loads, seed=42, stdout=print):
+    """
+    Create the benchmark dataset, reusing it when it already has the
+    requested number of loads. Returns the benchmark company.
+    """
+    company = get_bench_company()
+    if company and company.loads.count() == num_loads:
+        stdout(f"Reusing existing benchmark dataset with {num_loads} loads")
+        return company
+    if company:
+        clear_dataset(stdout)
+
+    rng = random.Random(seed)
+    stdout(f"Seeding benchmark dataset with {num_loads} loads...")
+
+    with transaction.atomic():
+        company = Company.objects.create(
+            name='Benchmark Freight', code=BENCH_COMPANY_CODE,
+            email='bench@launchtms.com', address_city='Houston', address_state='TX',
+        )
+        terminals = _create_hierarchy(company)
+        _create_user(company, terminals[0])
+
+    num_units = max(50, num_loads // 200)
+    drivers = _bulk_create(Driver, (
+        _build_driver(rng, company, terminals, i) for i in range(num_units)
+    ), stdout)
+    trucks = _bulk_create(Truck, (
+        _build_truck(rng, company, terminals, i) for i in range(num_units)
+    ), stdout)
+    _bulk_create(Trailer, (
+        _build_trailer(rng, company, terminals, i) for i in range(num_units)
+    ), stdout)
+    _bulk_create(Load, (
+        _build_load(rng, company, terminals, drivers, trucks, i) for i in range(num_loads)
+    ), stdout, keep=False)
+    # bulk_create sends no signals, so the daily rollups are built in one pass afterwards
+    output = io.StringIO()
+    call_command('rebuild_load_rollups', all=True, company=BENCH_COMPANY_CODE, stdout=output)
+    stdout(output.getvalue().strip())
+
+    stdout(f"Seeded {num_units} drivers/trucks/trailers and {num_loads} loads")
+    return company
+
+
+def _create_hierarchy(company):
+    terminals = []
+    division = Division.objects.create(company=company, name='Bench Operations', code='OPS')
+    for d in range(3):
+        department = Department.objects.create(division=division, name=f'Bench Department {d + 1}', code=f'D{d + 1}')
+        for t in range(3):
+            city, state, zip_code, _, _ = CITIES[(d * 3 + t) % len(CITIES)]
+            terminals.append(Terminal.objects.create(
+                department=department, name=f'{city} Terminal', code=f'T{d + 1}{t + 1}',
+                address_city=city, address_state=state, address_zip=zip_code,
+            ))
+    return terminals
+
+
+def _create_user(company, terminal):
+    CustomUser.objects.filter(email=BENCH_USER_EMAIL).delete()
+    department = terminal.department
+    return CustomUser.objects.create_user(
+        username=BENCH_USER_EMAIL, email=BENCH_USER_EMAIL, password=BENCH_USER_PASSWORD,
+        first_name='Bench', last_name='User', role='company_admin',
+        company=company, division=department.division, department=department,
+    )
+
+
+def _bulk_create(model, objects, stdout, keep=True):
+    """Insert generated objects in batches, optionally returning them"""
+    created = []
+    batch = []
+    total = 0
+    for obj in objects:
+        batch.append(obj)
+        if len(batch) >= BATCH_SIZE:
+            total += _flush(model, batch, created if keep else None)
+            batch = []
+            if total % (BATCH_SIZE * 20) == 0:
+                stdout(f"  {model.__name__}: {total} rows")
+    if batch:
+        total += _flush(model, batch, created if keep else None)
+    return created
+
+
+def _flush(model, batch, created):
+    model.objects.bulk_create(batch, batch_size=BATCH_SIZE)
+    if created is not None:
+        created.extend(batch)
+    return len(batch)
+
+
+def _build_driver(rng, company, terminals, i):
+    terminal = terminals[i % len(terminals)]
+    hire_date = date(2010, 1, 1) + timedelta(days=rng.randint(0, 5000))
+    return Driver(
+        first_name=f'Driver{i}', last_name=f'Bench{i % 97}',
+        phone_number=f'555-{i:07d}', hire_date=hire_date,
+        tier=rng.choice(['tier_1', 'tier_2', 'tier_3', 'tier_4']),
+        status=rng.choices(['active', 'on_leave', 'in_training'], weights=[90, 5, 5])[0],
+        license_number=f'BENCH-{i:08d}', license_expiry=date(2027, 1, 1) + timedelta(days=i % 700),
+        emergency_contact_name='Bench Contact', emergency_contact_phone='555-0000000',
+        emergency_contact_relationship='Spouse',
+        company=company, division=terminal.department.division,
+        department=terminal.department, home_terminal=terminal,
+    )
+
+
+def _build_truck(rng, company, terminals, i):
+    terminal = terminals[i % len(terminals)]
+    last_maintenance = date(2025, 1, 1) + timedelta(days=rng.randint(0, 300))
+    return Truck(
+        make=rng.choice(['Freightliner', 'Peterbilt', 'Kenworth', 'Volvo']),
+        model=rng.choice(['Cascadia', '579', 'T680', 'VNL']), year=rng.randint(2015, 2025),
+        license_plate=f'BN{i:07d}', vin=f'BENCHT{i:011d}', color='White',
+        status=rng.choices(['available', 'assigned', 'maintenance'], weights=[60, 35, 5])[0],
+        mileage=rng.randint(10_000, 900_000), last_maintenance=last_maintenance,
+        next_maintenance_due=last_maintenance + timedelta(days=90),
+        registration_expiry=date(2027, 1, 1), insurance_expiry=date(2027, 1, 1),
+        company=company, division=terminal.department.division,
+        department=terminal.department, home_terminal=terminal,
+    )
+
+
+def _build_trailer(rng, company, terminals, i):
+    terminal = terminals[i % len(terminals)]
+    return Trailer(
+        trailer_number=f'BT{i:07d}', vin=f'BENCHR{i:011d}',
+        trailer_type=rng.choice(['dry_van', 'flatbed', 'refrigerated', 'tanker']),
+        status=rng.choices(['available', 'assigned', 'maintenance'], weights=[60, 35, 5])[0],
+        company=company, division=terminal.department.division,
+        department=terminal.department, home_terminal=terminal,
+    )
+
+
+def _build_load(rng, company, terminals, drivers, trucks, i):
+    origin = terminals[i % len(terminals)]
+    destination = terminals[(i * 7 + 3) % len(terminals)]
+    pickup_city = CITIES[i % len(CITIES)]
+    delivery_city = CITIES[(i * 5 + 1) % len(CITIES)]
+    pickup_date = LOAD_DATE_ANCHOR - timedelta(days=rng.randint(0, 400), hours=rng.randint(0, 23))
+    transit_hours = rng.randint(4, 60)
+    status = rng.choices(LOAD_STATUSES, weights=LOAD_STATUS_WEIGHTS)[0]
+    unit = i % len(drivers)
+    return Load(
+        load_number=f'B{i:09d}', bol_number=f'BOL{i:09d}',
+        shipper='Bench Shipper', receiver='Bench Receiver',
+        pickup_address='1 Dock Rd', pickup_city=pickup_city[0], pickup_state=pickup_city[1],
+        pickup_zip=pickup_city[2], pickup_lat=pickup_city[3], pickup_lng=pickup_city[4],
+        delivery_address='2 Yard Ave', delivery_city=delivery_city[0], delivery_state=delivery_city[1],
+        delivery_zip=delivery_city[2], delivery_lat=delivery_city[3], delivery_lng=delivery_city[4],
+        assigned_driver=drivers[unit] if status != 'pending' else None,
+        assigned_truck=trucks[unit] if status != 'pending' else None,
+        status=status, cargo_description='General freight',
+        weight=rng.randint(5_000, 45_000), distance=rng.randint(50, 1500),
+        estimated_transit_time=transit_hours,
+        pickup_date=pickup_date, delivery_date=pickup_date + timedelta(hours=transit_hours),
+        rate=Decimal(rng.randint(50_000, 500_000)) / 100,
+        company=company, division=origin.department.division, department=origin.department,
+        origin_terminal=origin, destination_terminal=destination,
+    )
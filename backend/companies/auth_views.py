@@ -3,12 +3,13 @@ Authentication views for Launch TMS
 """
 from django.contrib.auth import authenticate
 from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.db.models.functions import Lower
 from django.utils.translation import gettext_lazy as _
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenObtainPairView
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from django.contrib.auth.password_validation import validate_password
@@ -20,15 +21,40 @@ from django.core.mail import send_mail
 from django.conf import settings
 import logging
 
+from api.throttling import LOGIN_THROTTLES
+
+from .authentication import get_user_instance
 from .models import CustomUser, Company
+from .permissions import get_effective_scope
+from .revocation import CachedRevocationRefreshToken
 from .serializers import UserSerializer, UserRegistrationSerializer
 
 
 logger = logging.getLogger(__name__)
 
 
+def find_login_user(identifier):
+    """
+    Find a user by case-insensitive email or exact username in one query.
+
+    The email predicate matches the ``user_email_lower_idx`` expression
+    index. An email match wins over a username match.
+    """
+    identifier = identifier.strip()
+    candidates = list(
+        CustomUser.objects
+        .annotate(email_lower=Lower('email'))
+        .filter(Q(email_lower=identifier.lower()) | Q(username=identifier))[:2]
+    )
+    for user in candidates:
+        if user.email_lower == identifier.lower():
+            return user
+    return candidates[0] if candidates else None
+
+
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     """Custom JWT token serializer that includes user data and supports email login"""
+    token_class = CachedRevocationRefreshToken
     
     @classmethod
     def get_token(cls, user):
@@ -37,7 +63,7 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         # Add custom claims
         token['user_id'] = str(user.id)
         token['email'] = user.email
-        token['company_id'] = str(user.company.id) if user.company else None
+        token['company_id'] = str(user.company_id) if user.company_id else None
         token['role'] = user.role
         
         return token
@@ -52,11 +78,9 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         
         # If email is provided, try to find the user by email
         if email and not username:
-            try:
-                user = CustomUser.objects.get(email=email)
+            user = find_login_user(email)
+            if user is not None:
                 attrs['username'] = user.username
-            except CustomUser.DoesNotExist:
-                pass
         
         data: Dict[str, Any] = super().validate(attrs)
         
@@ -69,6 +93,7 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes(LOGIN_THROTTLES)
 def login_view(request):
     """
     Custom login view that supports email authentication
@@ -82,24 +107,21 @@ def login_view(request):
                 'error': 'Email and password are required'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Try to find user by email first, then by username
-        user = None
-        try:
-            user = CustomUser.objects.get(email=email)
-        except CustomUser.DoesNotExist:
-            try:
-                user = CustomUser.objects.get(username=email)
-            except CustomUser.DoesNotExist:
-                pass
+        # Email (case-insensitive) or username, in a single indexed query
+        user = find_login_user(email)
+        if user is None:
+            # Hash anyway so response time does not reveal unknown accounts
+            CustomUser().set_password(password)
         
+        # check_password re-encodes the hash if PASSWORD_HASHING changed
         if user and user.check_password(password) and user.is_active:
             # Generate tokens
-            refresh = RefreshToken.for_user(user)
+            refresh = CachedRevocationRefreshToken.for_user(user)
             
             # Add custom claims to tokens
             refresh['user_id'] = str(user.id)
             refresh['email'] = user.email
-            refresh['company_id'] = str(user.company.id) if user.company else None
+            refresh['company_id'] = str(user.company_id) if user.company_id else None
             refresh['role'] = user.role
             
             # Return user data with tokens
@@ -136,7 +158,7 @@ def register_user(request):
             user = serializer.save()
             
             # Generate tokens
-            refresh = RefreshToken.for_user(user)
+            refresh = CachedRevocationRefreshToken.for_user(user)
             
             # Return user data with tokens
             user_serializer = UserSerializer(user)
@@ -173,7 +195,7 @@ def logout_user(request):
         refresh_token = request.data.get('refresh_token')
         
         if refresh_token:
-            token = RefreshToken(refresh_token)
+            token = CachedRevocationRefreshToken(refresh_token)
             token.blacklist()
             
         return Response({
@@ -195,7 +217,7 @@ def verify_token(request):
     Verify token and return user data
     """
     try:
-        user_serializer = UserSerializer(request.user)
+        user_serializer = UserSerializer(get_user_instance(request.user))
         return Response({
             'valid': True,
             'user': user_serializer.data
@@ -216,7 +238,7 @@ def update_profile(request):
     Update user profile
     """
     try:
-        user = request.user
+        user = get_user_instance(request.user)
         serializer = UserSerializer(user, data=request.data, partial=True)
         
         if serializer.is_valid():
@@ -246,7 +268,7 @@ def change_password(request):
     Change user password
     """
     try:
-        user = request.user
+        user = get_user_instance(request.user)
         current_password = request.data.get('current_password')
         new_password = request.data.get('new_password')
         
@@ -288,6 +310,7 @@ def change_password(request):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes(LOGIN_THROTTLES)
 def reset_password_request(request):
     """
     Request password reset
@@ -392,62 +415,15 @@ def user_permissions(request):
     Get user permissions and capabilities
     """
     try:
-        user = request.user
-        
-        # Calculate permissions based on role and organizational structure
-        permissions = []
-        
-        # Base permissions for all authenticated users
-        permissions.extend([
-            'view_dashboard',
-            'view_profile',
-            'update_profile',
-        ])
-        
-        # Role-based permissions
-        if user.role in ['system_admin']:
-            permissions.extend([
-                'manage_companies',
-                'manage_users',
-                'view_all_data',
-                'manage_system_settings',
-            ])
-        elif user.role in ['company_admin']:
-            permissions.extend([
-                'manage_company_users',
-                'view_company_data',
-                'manage_company_settings',
-                'manage_drivers',
-                'manage_vehicles',
-                'manage_loads',
-            ])
-        elif user.role in ['department_manager']:
-            permissions.extend([
-                'view_department_data',
-                'manage_department_drivers',
-                'manage_department_vehicles',
-                'manage_department_loads',
-            ])
-        elif user.role in ['user']:
-            permissions.extend([
-                'view_assigned_data',
-                'update_assigned_loads',
-            ])
-        
-        # Department-specific permissions
-        if user.department:
-            permissions.append(f'access_department_{user.department.id}')
-        
-        # Terminal-specific permissions
-        if user.terminal:
-            permissions.append(f'access_terminal_{user.terminal.id}')
+        effective = get_effective_scope(request.user)
+        scope = effective.scope
         
         return Response({
-            'permissions': permissions,
-            'role': user.role,
-            'company_id': str(user.company.id) if user.company else None,
-            'department_id': str(user.department.id) if user.department else None,
-            'terminal_id': str(user.terminal.id) if user.terminal else None,
+            'permissions': effective.permission_list,
+            'role': scope.role,
+            'company_id': str(scope.company_id) if scope.company_id else None,
+            'department_id': str(scope.department_id) if scope.department_id else None,
+            'terminal_id': str(scope.terminal_id) if scope.terminal_id else None,
         }, status=status.HTTP_200_OK)
         
     except Exception as e:
@@ -0,0 +1,94 @@
+"""
+JWT authentication for Launch TMS without a per-request user lookup
+"""
+from django.core.exceptions import ValidationError
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .scope import get_user_scope
+
+
+class ClaimsUser:
+    """
+    Lightweight authenticated user built from a validated token and the
+    cached UserScope.
+
+    Role and organizational IDs are available without any query. Any other
+    attribute (names, email, preferences, model methods) is delegated to the
+    CustomUser row, which is loaded on first access only. Views that modify
+    the user must operate on ``get_user_instance(request.user)``.
+    """
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, scope, token):
+        self.scope = scope
+        self.token = token
+        self.id = self.pk = scope.user_id
+        self.company_id = scope.company_id
+        self.division_id = scope.division_id
+        self.department_id = scope.department_id
+        self.terminal_id = scope.terminal_id
+        self.role = scope.role
+        self.is_active = scope.is_active
+        self.is_staff = scope.is_staff
+        self.is_superuser = scope.is_superuser
+
+    @cached_property
+    def instance(self):
+        from .models import CustomUser
+        return CustomUser.objects.select_related('company', 'division', 'department', 'terminal').get(pk=self.pk)
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return getattr(self.instance, name)
+
+    def __eq__(self, other):
+        return getattr(other, 'pk', None) == self.pk
+
+    def __hash__(self):
+        return hash(self.pk)
+
+    def __str__(self):
+        return str(self.instance)
+
+
+def get_user_instance(user):
+    """Return the CustomUser model instance behind ``user``"""
+    if isinstance(user, ClaimsUser):
+        return user.instance
+    return user
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that resolves the user from the scope cache instead of
+    loading the CustomUser row, so the common case costs no queries.
+    """
+
+    def get_user(self, validated_token):
+        if getattr(api_settings, 'CHECK_REVOKE_TOKEN', False):
+            # Revocation by password hash needs the full row
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        try:
+            scope = get_user_scope(user_id)
+        except (ValueError, ValidationError):
+            # Malformed user ID claim
+            scope = None
+        if scope is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if not scope.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        return ClaimsUser(scope, validated_token)
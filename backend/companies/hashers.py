@@ -0,0 +1,22 @@
+"""
+Password hashers for Launch TMS
+"""
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2-SHA256 with the iteration count taken from
+    ``PASSWORD_HASHING['PBKDF2_ITERATIONS']``.
+
+    It keeps Django's ``pbkdf2_sha256`` algorithm name, so existing hashes
+    verify unchanged and are transparently re-encoded at the configured cost
+    on the user's next successful login.
+    """
+
+    @property
+    def iterations(self):
+        return getattr(settings, 'PASSWORD_HASHING', {}).get(
+            'PBKDF2_ITERATIONS', PBKDF2PasswordHasher.iterations
+        )
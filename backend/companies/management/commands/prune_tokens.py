@@ -0,0 +1,47 @@
+"""
+Management command to prune expired JWT refresh tokens
+"""
+from django.core.management.base import BaseCommand
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+from rest_framework_simplejwt.utils import aware_utcnow
+
+
+class Command(BaseCommand):
+    help = 'Delete expired outstanding and blacklisted refresh tokens in batches (run on a schedule)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Tokens deleted per statement',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report how many tokens would be deleted without deleting them',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        expired = OutstandingToken.objects.filter(expires_at__lte=aware_utcnow())
+
+        if options['dry_run']:
+            self.stdout.write(
+                self.style.WARNING(f"DRY RUN: Would delete {expired.count()} expired tokens")
+            )
+            return
+
+        # Short batches keep row locks and WAL bursts small on large tables;
+        # blacklist entries are deleted along with their outstanding token
+        deleted_total = 0
+        while True:
+            batch = list(expired.order_by('id').values_list('id', flat=True)[:batch_size])
+            if not batch:
+                break
+            OutstandingToken.objects.filter(id__in=batch).delete()
+            deleted_total += len(batch)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Deleted {deleted_total} expired tokens")
+        )
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.4 on 2026-10-19 17:35
+
+import companies.models
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0002_alter_customuser_company'),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name='customuser',
+            managers=[
+                ('objects', companies.models.ScopedUserManager()),
+            ],
+        ),
+    ]
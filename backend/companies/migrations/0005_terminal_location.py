@@ -0,0 +1,32 @@
+# Generated by Django 5.0.4 on 2026-10-19 17:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0004_customuser_email_lower_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='terminal',
+            name='geohash',
+            field=models.CharField(blank=True, max_length=12),
+        ),
+        migrations.AddField(
+            model_name='terminal',
+            name='lat',
+            field=models.DecimalField(blank=True, decimal_places=8, max_digits=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='terminal',
+            name='lng',
+            field=models.DecimalField(blank=True, decimal_places=8, max_digits=11, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='terminal',
+            index=models.Index(fields=['geohash'], name='terminal_geohash_idx', opclasses=['varchar_pattern_ops']),
+        ),
+    ]
@@ -2,9 +2,12 @@
 Company and organizational models for Launch TMS
 """
 from django.db import models
-from django.contrib.auth.models import AbstractUser
+from django.db.models.functions import Lower
+from django.contrib.auth.models import AbstractUser, UserManager
 import uuid
 
+from .scoping import ScopedManager, ScopedQuerySet
+
 
 class BaseModel(models.Model):
     """Base model with common fields"""
@@ -12,6 +15,8 @@ class BaseModel(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = ScopedManager()
+    
     class Meta:
         abstract = True
 
@@ -33,6 +38,10 @@ class Company(BaseModel):
     is_active = models.BooleanField(default=True)
     timezone = models.CharField(max_length=50, default='UTC')
     
+    SCOPE_LOOKUPS = {
+        'company': ('id',),
+    }
+    
     class Meta:
         verbose_name_plural = "Companies"
     
@@ -48,6 +57,11 @@ class Division(BaseModel):
     manager_email = models.EmailField(blank=True)
     is_active = models.BooleanField(default=True)
     
+    SCOPE_LOOKUPS = {
+        'company': ('company',),
+        'division': ('id',),
+    }
+    
     class Meta:
         unique_together = ['company', 'code']
     
@@ -63,6 +77,12 @@ class Department(BaseModel):
     manager_email = models.EmailField(blank=True)
     is_active = models.BooleanField(default=True)
     
+    SCOPE_LOOKUPS = {
+        'company': ('division__company',),
+        'division': ('division',),
+        'department': ('id',),
+    }
+    
     class Meta:
         unique_together = ['division', 'code']
     
@@ -81,6 +101,9 @@ class Terminal(BaseModel):
     address_city = models.CharField(max_length=100, blank=True)
     address_state = models.CharField(max_length=50, blank=True)
     address_zip = models.CharField(max_length=20, blank=True)
+    lat = models.DecimalField(max_digits=10, decimal_places=8, null=True, blank=True)
+    lng = models.DecimalField(max_digits=11, decimal_places=8, null=True, blank=True)
+    geohash = models.CharField(max_length=12, blank=True)
     
     # Contact information
     phone = models.CharField(max_length=20, blank=True)
@@ -88,11 +111,34 @@ class Terminal(BaseModel):
     
     is_active = models.BooleanField(default=True)
     
+    SCOPE_LOOKUPS = {
+        'company': ('department__division__company',),
+        'division': ('department__division',),
+        'department': ('department',),
+        'terminal': ('id',),
+    }
+    
     class Meta:
         unique_together = ['department', 'code']
+        indexes = [
+            models.Index(fields=['geohash'], name='terminal_geohash_idx', opclasses=['varchar_pattern_ops']),
+        ]
     
     def __str__(self):
         return f"{self.department.division.company.code}-{self.department.division.code}-{self.department.code}-{self.code}: {self.name}"
+    
+    def save(self, *args, **kwargs):
+        from dispatch.geo import encode
+        self.geohash = encode(self.lat, self.lng) if self.lat is not None and self.lng is not None else ''
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'lat', 'lng'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'geohash'}
+        super().save(*args, **kwargs)
+
+
+class ScopedUserManager(UserManager.from_queryset(ScopedQuerySet)):
+    """User manager with tenant scoping"""
+    pass
 
 
 class CustomUser(AbstractUser):
@@ -117,5 +163,19 @@ class CustomUser(AbstractUser):
     language = models.CharField(max_length=10, default='en')
     timezone = models.CharField(max_length=50, default='UTC')
     
+    objects = ScopedUserManager()
+    
+    SCOPE_LOOKUPS = {
+        'company': ('company',),
+        'division': ('division',),
+        'department': ('department',),
+        'terminal': ('terminal',),
+    }
+    
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(Lower('email'), name='user_email_lower_idx'),
+        ]
+    
     def __str__(self):
         return f"{self.get_full_name()} ({self.email})"
@@ -0,0 +1,169 @@
+"""
+Role-based permission engine for Launch TMS
+
+Role → permission sets are compiled once at import. Each user's effective
+scope (permissions plus the organizational IDs they can reach) is resolved
+from the cached UserScope and cached per process, so permission checks are
+set lookups instead of per-request queries.
+"""
+from django.conf import settings
+from rest_framework.permissions import BasePermission
+
+from api.cache import LocalTTLCache
+
+from .scope import get_user_scope
+from .scoping import scope_level
+
+BASE_PERMISSIONS = (
+    'view_dashboard',
+    'view_profile',
+    'update_profile',
+)
+
+ROLE_PERMISSIONS = {
+    'system_admin': (
+        'manage_companies',
+        'manage_users',
+        'view_all_data',
+        'manage_system_settings',
+    ),
+    'company_admin': (
+        'manage_company_users',
+        'view_company_data',
+        'manage_company_settings',
+        'manage_drivers',
+        'manage_vehicles',
+        'manage_loads',
+    ),
+    'department_manager': (
+        'view_department_data',
+        'manage_department_drivers',
+        'manage_department_vehicles',
+        'manage_department_loads',
+    ),
+    'user': (
+        'view_assigned_data',
+        'update_assigned_loads',
+    ),
+}
+
+# Ordered for the API response, frozen for membership checks
+_ROLE_PERMISSION_LISTS = {
+    role: BASE_PERMISSIONS + permissions for role, permissions in ROLE_PERMISSIONS.items()
+}
+_ROLE_PERMISSION_SETS = {
+    role: frozenset(permissions) for role, permissions in _ROLE_PERMISSION_LISTS.items()
+}
+_EMPTY = frozenset()
+
+
+class EffectiveScope:
+    """A user's resolved permissions and reachable organizational IDs"""
+    __slots__ = ('scope', 'level', 'permission_list', 'permissions', 'terminal_ids')
+
+    def __init__(self, scope, terminal_ids):
+        self.scope = scope
+        self.level = scope_level(scope)
+        self.permission_list = list(_ROLE_PERMISSION_LISTS.get(scope.role, BASE_PERMISSIONS))
+        if scope.department_id:
+            self.permission_list.append(f'access_department_{scope.department_id}')
+        if scope.terminal_id:
+            self.permission_list.append(f'access_terminal_{scope.terminal_id}')
+        self.permissions = _ROLE_PERMISSION_SETS.get(scope.role, frozenset(BASE_PERMISSIONS))
+        # None means every terminal is reachable
+        self.terminal_ids = terminal_ids
+
+    def has_perm(self, permission):
+        return permission in self.permissions
+
+    def has_any_perm(self, permissions):
+        return not self.permissions.isdisjoint(permissions)
+
+    def can_access_terminal(self, terminal_id):
+        if self.terminal_ids is None:
+            return True
+        return terminal_id is not None and str(terminal_id) in self.terminal_ids
+
+
+def _accessible_terminal_ids(scope, level):
+    from .models import Terminal
+
+    if level is None:
+        return None
+    if level == 'terminal':
+        return frozenset([str(scope.terminal_id)])
+    if not scope.company_id:
+        return _EMPTY
+    terminals = Terminal.objects.filter(department__division__company_id=scope.company_id)
+    if level == 'department':
+        terminals = terminals.filter(department_id=scope.department_id)
+    elif level == 'division':
+        terminals = terminals.filter(department__division_id=scope.division_id)
+    return frozenset(str(pk) for pk in terminals.values_list('id', flat=True))
+
+
+_options = getattr(settings, 'USER_SCOPE_CACHE', {})
+_effective_cache = LocalTTLCache(
+    'effective_scope',
+    max_size=_options.get('MAX_SIZE', 10000),
+    ttl=_options.get('TTL_SECONDS', 60),
+)
+
+
+def get_effective_scope(user):
+    """Return the cached EffectiveScope for an authenticated user, or None"""
+    if user is None or not getattr(user, 'is_authenticated', False):
+        return None
+    key = str(user.pk)
+    effective = _effective_cache.get(key)
+    if effective is not None:
+        return effective
+
+    scope = getattr(user, 'scope', None) or get_user_scope(user.pk)
+    if scope is None:
+        return None
+    effective = EffectiveScope(scope, _accessible_terminal_ids(scope, scope_level(scope)))
+    _effective_cache.set(key, effective)
+    return effective
+
+
+def invalidate_effective_scope(user_id):
+    _effective_cache.delete(str(user_id))
+
+
+def clear_effective_scopes():
+    _effective_cache.clear()
+
+
+# ModelViewSet actions that change rows
+WRITE_ACTIONS = ('create', 'update', 'partial_update', 'destroy')
+
+
+def write_permissions(*permissions, actions=WRITE_ACTIONS):
+    """``required_permissions`` entries granting ``actions`` to holders of any of ``permissions``"""
+    needed = frozenset(permissions)
+    return {action: needed for action in actions}
+
+
+class HasTMSPermission(BasePermission):
+    """
+    Grants access when the user holds any of the view's required permissions.
+
+    Views declare ``required_permissions`` as a mapping of action (or HTTP
+    method, lowercased) to an iterable of permission names; actions missing
+    from the mapping only require authentication. System admins pass every
+    check.
+    """
+
+    def has_permission(self, request, view):
+        effective = get_effective_scope(request.user)
+        if effective is None:
+            return False
+        if effective.level is None:
+            return True
+        required = getattr(view, 'required_permissions', {})
+        action = getattr(view, 'action', None) or request.method.lower()
+        needed = required.get(action)
+        if not needed:
+            return True
+        return effective.has_any_perm(needed)
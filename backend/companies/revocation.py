@@ -0,0 +1,105 @@
+"""
+Refresh token revocation for Launch TMS
+
+Revoked refresh tokens are stored durably in simplejwt's token blacklist
+tables and mirrored into the Django cache as one key per JTI: ``1`` for a
+revoked token (expiring with the token itself) and ``0`` for one checked
+and found valid (expiring after ``NOT_REVOKED_TTL``). Checking a token on
+refresh is then usually a cache lookup instead of a blacklist query. A key
+that is missing (evicted, culled, or never cached) is always answered from
+the blacklist, so losing cache entries costs a query but never accepts a
+revoked token. A marker key, expiring after ``WARM_TTL``, records that
+the revoked JTIs were bulk-loaded from the database.
+
+The cache must be shared by every process (Redis in production): a token
+blacklisted through one process is only seen by another via the shared
+``1`` entry, and a process-local cache could keep answering ``0`` for up to
+``NOT_REVOKED_TTL`` seconds.
+"""
+import logging
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import aware_utcnow, datetime_from_epoch
+
+logger = logging.getLogger(__name__)
+
+_options = getattr(settings, 'TOKEN_REVOCATION', {})
+KEY_PREFIX = _options.get('KEY_PREFIX', 'revoked-jti')
+WARM_MARKER_KEY = f'{KEY_PREFIX}:warm'
+WARM_TTL = _options.get('WARM_TTL', 3600)
+NOT_REVOKED_TTL = _options.get('NOT_REVOKED_TTL', 300)
+
+
+def _cache():
+    return caches[_options.get('CACHE', 'default')]
+
+
+def _key(jti):
+    return f'{KEY_PREFIX}:{jti}'
+
+
+def _seconds_until(expires_at):
+    return max(1, int((expires_at - aware_utcnow()).total_seconds()))
+
+
+def warm_revocation_cache(force=False):
+    """Load every unexpired blacklisted JTI into the cache unless already loaded"""
+    cache = _cache()
+    if not force and cache.get(WARM_MARKER_KEY):
+        return 0
+
+    rows = BlacklistedToken.objects.filter(
+        token__expires_at__gt=aware_utcnow(),
+    ).values_list('token__jti', 'token__expires_at')
+
+    count = 0
+    for jti, expires_at in rows.iterator(chunk_size=2000):
+        cache.set(_key(jti), 1, _seconds_until(expires_at))
+        count += 1
+    cache.set(WARM_MARKER_KEY, 1, WARM_TTL)
+    logger.info(f"Loaded {count} revoked refresh tokens into the revocation cache")
+    return count
+
+
+def is_revoked(jti):
+    warm_revocation_cache()
+    cache = _cache()
+    state = cache.get(_key(jti))
+    if state is not None:
+        return bool(state)
+
+    # Not in the cache: the blacklist is authoritative
+    expires_at = BlacklistedToken.objects.filter(token__jti=jti).values_list('token__expires_at', flat=True).first()
+    if expires_at is not None:
+        cache.set(_key(jti), 1, _seconds_until(expires_at))
+        return True
+    cache.set(_key(jti), 0, NOT_REVOKED_TTL)
+    return False
+
+
+def mark_revoked(jti, expires_at):
+    _cache().set(_key(jti), 1, _seconds_until(expires_at))
+
+
+class CachedRevocationRefreshToken(RefreshToken):
+    """RefreshToken whose blacklist check is served from the revocation cache"""
+
+    def check_blacklist(self):
+        if is_revoked(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        result = super().blacklist()
+        mark_revoked(self.payload[api_settings.JTI_CLAIM], datetime_from_epoch(self.payload['exp']))
+        return result
+
+
+class CachedRevocationTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = CachedRevocationRefreshToken
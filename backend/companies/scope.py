@@ -0,0 +1,84 @@
+"""
+Cached organizational scope of users
+
+A user's scope is the small set of columns that authentication and data
+filtering need on every request: role, active flags and the company /
+division / department / terminal IDs. It is cached per process and
+invalidated whenever the user row is saved or deleted.
+"""
+from django.conf import settings
+
+from api.cache import LocalTTLCache
+
+SCOPE_FIELDS = [
+    'id', 'company_id', 'division_id', 'department_id', 'terminal_id',
+    'role', 'is_active', 'is_staff', 'is_superuser',
+]
+
+
+class UserScope:
+    """Immutable snapshot of a user's role and organizational assignments"""
+    __slots__ = (
+        'user_id', 'company_id', 'division_id', 'department_id', 'terminal_id',
+        'role', 'is_active', 'is_staff', 'is_superuser',
+    )
+
+    def __init__(self, user_id, company_id=None, division_id=None, department_id=None,
+                 terminal_id=None, role='user', is_active=True, is_staff=False, is_superuser=False):
+        self.user_id = user_id
+        self.company_id = company_id
+        self.division_id = division_id
+        self.department_id = department_id
+        self.terminal_id = terminal_id
+        self.role = role
+        self.is_active = is_active
+        self.is_staff = is_staff
+        self.is_superuser = is_superuser
+
+    @classmethod
+    def from_row(cls, row):
+        return cls(
+            user_id=row['id'], company_id=row['company_id'], division_id=row['division_id'],
+            department_id=row['department_id'], terminal_id=row['terminal_id'], role=row['role'],
+            is_active=row['is_active'], is_staff=row['is_staff'], is_superuser=row['is_superuser'],
+        )
+
+    @classmethod
+    def from_user(cls, user):
+        return cls(
+            user_id=user.pk, company_id=user.company_id, division_id=user.division_id,
+            department_id=user.department_id, terminal_id=user.terminal_id, role=user.role,
+            is_active=user.is_active, is_staff=user.is_staff, is_superuser=user.is_superuser,
+        )
+
+
+_options = getattr(settings, 'USER_SCOPE_CACHE', {})
+_scope_cache = LocalTTLCache(
+    'user_scope',
+    max_size=_options.get('MAX_SIZE', 10000),
+    ttl=_options.get('TTL_SECONDS', 60),
+)
+
+
+def get_user_scope(user_id):
+    """Return the cached UserScope for ``user_id``, loading it with one query on a miss"""
+    key = str(user_id)
+    scope = _scope_cache.get(key)
+    if scope is not None:
+        return scope
+
+    from .models import CustomUser
+    row = CustomUser.objects.filter(pk=user_id).values(*SCOPE_FIELDS).first()
+    if row is None:
+        return None
+    scope = UserScope.from_row(row)
+    _scope_cache.set(key, scope)
+    return scope
+
+
+def invalidate_user_scope(user_id):
+    _scope_cache.delete(str(user_id))
+
+
+def clear_user_scopes():
+    _scope_cache.clear()
@@ -0,0 +1,172 @@
+"""
+Tenant scoping for Launch TMS querysets
+
+Every model declares ``SCOPE_LOOKUPS``: for each organizational level
+('company', 'division', 'department', 'terminal') the field paths that tie a
+row to that level. ``Model.objects.for_user(user)`` turns the user's role and
+assignments into a single indexed WHERE clause, so a request never reads
+another tenant's rows, and ``ScopedQuerysetMixin`` keeps viewset writes
+from pointing into them.
+"""
+from django.core.exceptions import ImproperlyConfigured, ValidationError as DjangoValidationError
+from django.db import models
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+
+SCOPE_LEVELS = ['terminal', 'department', 'division', 'company']
+
+
+def resolve_user_scope(user):
+    """Return the UserScope for an authenticated user, or None"""
+    from .scope import UserScope
+
+    if user is None or not getattr(user, 'is_authenticated', False):
+        return None
+    scope = getattr(user, 'scope', None)
+    if scope is not None:
+        return scope
+    return UserScope.from_user(user)
+
+
+def scope_level(scope):
+    """
+    The organizational level a user's data access is limited to, or None
+    for unrestricted access.
+
+    system_admin sees everything, company_admin their company,
+    department_manager their department, and other users their terminal.
+    When an assignment is missing, the next broader level applies.
+    """
+    if scope.role == 'system_admin':
+        return None
+    if scope.role == 'company_admin':
+        candidates = ['company']
+    elif scope.role == 'department_manager':
+        candidates = ['department', 'division', 'company']
+    else:
+        candidates = SCOPE_LEVELS
+    for level in candidates:
+        if getattr(scope, f'{level}_id'):
+            return level
+    return 'company'
+
+
+class ScopedQuerySet(models.QuerySet):
+    """QuerySet with tenant scoping driven by the model's SCOPE_LOOKUPS"""
+
+    def for_user(self, user):
+        scope = resolve_user_scope(user)
+        if scope is None:
+            return self.none()
+        level = scope_level(scope)
+        if level is None:
+            return self
+        if not scope.company_id:
+            return self.none()
+        return self.filter(self.scope_filter(scope, level))
+
+    def scope_filter(self, scope, level):
+        lookups = getattr(self.model, 'SCOPE_LOOKUPS', None)
+        if not lookups or 'company' not in lookups:
+            raise ImproperlyConfigured(f"{self.model.__name__} must define SCOPE_LOOKUPS['company']")
+
+        condition = self._any_of(lookups['company'], scope.company_id)
+        # Narrow to the most specific level both the model and the user's assignments can express
+        for candidate in SCOPE_LEVELS[SCOPE_LEVELS.index(level):-1]:
+            value = getattr(scope, f'{candidate}_id')
+            if candidate in lookups and value:
+                condition &= self._any_of(lookups[candidate], value)
+                break
+        return condition
+
+    @staticmethod
+    def _any_of(paths, value):
+        condition = Q()
+        for path in paths:
+            condition |= Q(**{path: value})
+        return condition
+
+
+ScopedManager = models.Manager.from_queryset(ScopedQuerySet)
+
+
+class ScopedQuerysetMixin:
+    """
+    ViewSet mixin limiting ``get_queryset`` to the requesting user's scope.
+    Writes by users other than system_admin always land in their own company,
+    and every foreign key they set must point at a row inside their scope.
+    Pair it with ``HasTMSPermission`` and a ``required_permissions`` mapping
+    to limit which roles may write.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().for_user(self.request.user)
+
+    @property
+    def effective_scope(self):
+        """The requesting user's cached permissions and reachable terminals"""
+        from .permissions import get_effective_scope
+        return get_effective_scope(self.request.user)
+
+    def _unrestricted(self):
+        effective = self.effective_scope
+        return effective is not None and effective.level is None
+
+    def _check_related(self, serializer):
+        """Reject foreign keys (given as instances or raw ``*_id`` values) to rows outside the user's scope"""
+        data = serializer.validated_data
+        # Report errors under the API field names (``assignedDriverId`` rather than ``assigned_driver_id``)
+        names = {field.source: name for name, field in serializer.fields.items()}
+        errors = {}
+        for field in serializer.Meta.model._meta.concrete_fields:
+            if not field.is_relation or field.name == 'company':
+                continue
+            for key in (field.name, field.attname):
+                value = data.get(key)
+                if value is None:
+                    continue
+                pk = value.pk if isinstance(value, models.Model) else value
+                if field.related_model._meta.label == 'companies.Terminal':
+                    # Reachable terminals are precomputed in the cached effective scope
+                    if not self.effective_scope.can_access_terminal(pk):
+                        errors[names.get(key, key)] = ['Terminal not found']
+                    continue
+                related = field.related_model._default_manager
+                if not hasattr(related, 'for_user'):
+                    continue
+                try:
+                    found = related.for_user(self.request.user).filter(pk=pk).exists()
+                except (ValueError, DjangoValidationError):
+                    found = False
+                if not found:
+                    errors[names.get(key, key)] = [f'{field.related_model._meta.verbose_name.capitalize()} not found']
+        if errors:
+            raise ValidationError(errors)
+
+    def _save_scoped(self, serializer, creating):
+        model_fields = {field.name for field in serializer.Meta.model._meta.fields}
+        company_id = getattr(self.request.user, 'company_id', None)
+        if self._unrestricted():
+            if creating and company_id and 'company' in model_fields and 'company' not in serializer.validated_data:
+                serializer.save(company_id=company_id)
+            else:
+                serializer.save()
+            return
+
+        self._check_related(serializer)
+        if 'company' not in model_fields:
+            serializer.save()
+            return
+        # The client cannot choose the company
+        serializer.validated_data.pop('company', None)
+        serializer.validated_data.pop('company_id', None)
+        if creating:
+            serializer.save(company_id=company_id)
+        else:
+            serializer.save()
+
+    def perform_create(self, serializer):
+        self._save_scoped(serializer, creating=True)
+
+    def perform_update(self, serializer):
+        self._save_scoped(serializer, creating=False)
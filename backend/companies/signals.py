@@ -0,0 +1,28 @@
+"""
+Signal handlers for companies app
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import CustomUser, Department, Division, Terminal
+from .permissions import clear_effective_scopes, invalidate_effective_scope
+from .scope import invalidate_user_scope
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def invalidate_cached_user_scope(sender, instance, **kwargs):
+    """Drop the cached scope whenever a user's row changes"""
+    invalidate_user_scope(instance.pk)
+    invalidate_effective_scope(instance.pk)
+
+
+@receiver(post_save, sender=Terminal)
+@receiver(post_delete, sender=Terminal)
+@receiver(post_save, sender=Department)
+@receiver(post_delete, sender=Department)
+@receiver(post_save, sender=Division)
+@receiver(post_delete, sender=Division)
+def invalidate_effective_scopes(sender, instance, **kwargs):
+    """Reachable terminal sets depend on the org tree, so drop them all when it changes"""
+    clear_effective_scopes()
@@ -1,3 +1,244 @@
+"""
+Tests for tenant scoping and role permissions
+"""
+from datetime import timedelta
+from decimal import Decimal
+
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from drivers.models import Driver
+from loads.models import Load
+from vehicles.models import Truck
+
+from .models import Company, CustomUser, Department, Division, Terminal
+from .permissions import get_effective_scope
+
+
+def make_company(code):
+    """A company with one division, department and terminal; returns the terminal"""
+    company = Company.objects.create(name=f'{code} Freight', code=code)
+    division = Division.objects.create(company=company, name='Main', code=f'{code}-D')
+    department = Department.objects.create(division=division, name='Ops', code=f'{code}-O')
+    return Terminal.objects.create(department=department, name='Yard', code=f'{code}-T')
+
+
+def make_terminal(department, code):
+    return Terminal.objects.create(department=department, name=code, code=code)
+
+
+def make_user(username, role='user', company=None, division=None, department=None, terminal=None):
+    return CustomUser.objects.create_user(
+        username=username, email=f'{username}@example.com', password='not-used-123',
+        role=role, company=company, division=division, department=department, terminal=terminal,
+    )
+
+
+def make_load(number, origin, destination=None, **fields):
+    """A load picked up at ``origin``, filed under its department"""
+    department = origin.department
+    pickup = fields.pop('pickup_date', timezone.now())
+    values = dict(
+        load_number=number, shipper='Shipper', pickup_address='1 Dock Rd', pickup_city='Dallas',
+        pickup_state='TX', pickup_zip='75201', delivery_address='2 Yard Ave', delivery_city='Houston',
+        delivery_state='TX', delivery_zip='77001', cargo_description='Freight', weight=10000,
+        distance=240, pickup_date=pickup, delivery_date=pickup + timedelta(hours=6), rate=Decimal('1500.00'),
+        company=department.division.company, division=department.division, department=department,
+        origin_terminal=origin, destination_terminal=destination,
+    )
+    values.update(fields)
+    return Load.objects.create(**values)
+
+
+def make_truck(plate, terminal):
+    department = terminal.department
+    today = timezone.localdate()
+    return Truck.objects.create(
+        make='Volvo', model='VNL', year=2022, license_plate=plate, vin=f'VIN{plate:0>14}', color='White',
+        last_maintenance=today, next_maintenance_due=today, registration_expiry=today, insurance_expiry=today,
+        company=department.division.company, division=department.division, department=department,
+        home_terminal=terminal,
+    )
+
+
+def make_driver(license_number, terminal):
+    department = terminal.department
+    today = timezone.localdate()
+    return Driver.objects.create(
+        first_name='Dana', last_name='Reyes', phone_number='555-0100', hire_date=today,
+        license_number=license_number, license_expiry=today + timedelta(days=365),
+        emergency_contact_name='Sam Reyes', emergency_contact_phone='555-0101', emergency_contact_relationship='Spouse',
+        company=department.division.company, division=department.division, department=department,
+        home_terminal=terminal,
+    )
+
+
+class ForUserTests(TestCase):
+    """``Model.objects.for_user`` at every role level"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.t1 = make_company('ACME')
+        cls.department = cls.t1.department
+        cls.division = cls.department.division
+        cls.company = cls.division.company
+        cls.t2 = make_terminal(cls.department, 'T2')
+        other_department = Department.objects.create(division=cls.division, name='East', code='EAST')
+        cls.t3 = make_terminal(other_department, 'T3')
+        other_division = Division.objects.create(company=cls.company, name='South', code='SOUTH')
+        cls.t4 = make_terminal(Department.objects.create(division=other_division, name='Gulf', code='GULF'), 'T4')
+        cls.foreign = make_company('OTHER')
+
+        cls.l1 = make_load('L1', cls.t1)
+        cls.l2 = make_load('L2', cls.t2)
+        cls.l3 = make_load('L3', cls.t3)
+        # Picked up elsewhere but delivered to t1
+        cls.l4 = make_load('L4', cls.t4, destination=cls.t1)
+        cls.l5 = make_load('L5', cls.foreign)
+
+    def visible(self, user):
+        return set(Load.objects.for_user(user).values_list('load_number', flat=True))
+
+    def test_system_admin_sees_every_company(self):
+        admin = make_user('root', role='system_admin')
+        self.assertEqual(self.visible(admin), {'L1', 'L2', 'L3', 'L4', 'L5'})
+
+    def test_company_admin_sees_own_company(self):
+        user = make_user('admin', role='company_admin', company=self.company, department=self.department)
+        self.assertEqual(self.visible(user), {'L1', 'L2', 'L3', 'L4'})
+
+    def test_department_manager_sees_department(self):
+        user = make_user(
+            'manager', role='department_manager', company=self.company,
+            division=self.division, department=self.department,
+        )
+        self.assertEqual(self.visible(user), {'L1', 'L2'})
+
+    def test_department_manager_without_department_falls_back_to_division(self):
+        user = make_user('divmanager', role='department_manager', company=self.company, division=self.division)
+        self.assertEqual(self.visible(user), {'L1', 'L2', 'L3'})
+
+    def test_terminal_user_sees_loads_from_or_to_terminal(self):
+        user = make_user(
+            'clerk', company=self.company, division=self.division, department=self.department, terminal=self.t1,
+        )
+        self.assertEqual(self.visible(user), {'L1', 'L4'})
+
+    def test_user_without_company_sees_nothing(self):
+        self.assertEqual(self.visible(make_user('drifter')), set())
+
+    def test_anonymous_sees_nothing(self):
+        self.assertEqual(self.visible(None), set())
+
+    def test_effective_scope_terminals_match_for_user(self):
+        user = make_user(
+            'manager', role='department_manager', company=self.company,
+            division=self.division, department=self.department,
+        )
+        effective = get_effective_scope(user)
+        self.assertTrue(effective.can_access_terminal(self.t2.pk))
+        self.assertFalse(effective.can_access_terminal(self.t3.pk))
+        self.assertEqual(
+            effective.terminal_ids, {str(pk) for pk in Terminal.objects.for_user(user).values_list('id', flat=True)},
+        )
+
+    def test_effective_scope_follows_org_tree_changes(self):
+        user = make_user('admin', role='company_admin', company=self.company)
+        self.assertEqual(len(get_effective_scope(user).terminal_ids), 4)
+        make_terminal(self.department, 'T5')
+        self.assertEqual(len(get_effective_scope(user).terminal_ids), 5)
+
+
+class ScopedWriteTests(TestCase):
+    """``ScopedQuerysetMixin`` writes through the API"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.terminal = make_company('ACME')
+        cls.company = cls.terminal.department.division.company
+        cls.foreign_terminal = make_company('OTHER')
+        cls.foreign_company = cls.foreign_terminal.department.division.company
+        cls.admin = make_user('admin', role='company_admin', company=cls.company)
+        cls.load = make_load('L1', cls.terminal)
+        cls.truck = make_truck('T1', cls.terminal)
+        cls.foreign_truck = make_truck('T2', cls.foreign_terminal)
+        cls.driver = make_driver('D1', cls.terminal)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_foreign_key_into_another_company_is_rejected(self):
+        response = self.client.patch(
+            f'/api/loads/{self.load.pk}/', {'assignedTruckId': str(self.foreign_truck.pk)}, format='json',
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('assignedTruckId', response.data)
+        self.load.refresh_from_db()
+        self.assertIsNone(self.load.assigned_truck_id)
+
+    def test_foreign_key_inside_scope_is_accepted(self):
+        response = self.client.patch(
+            f'/api/loads/{self.load.pk}/', {'assignedTruckId': str(self.truck.pk)}, format='json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.load.refresh_from_db()
+        self.assertEqual(self.load.assigned_truck_id, self.truck.pk)
+
+    def test_foreign_terminal_is_rejected(self):
+        response = self.client.patch(
+            f'/api/drivers/{self.driver.pk}/', {'homeTerminalId': str(self.foreign_terminal.pk)}, format='json',
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('homeTerminalId', response.data)
+
+    def test_create_forces_the_users_company(self):
+        response = self.client.post(
+            '/api/divisions/', {'company': str(self.foreign_company.pk), 'name': 'West', 'code': 'WEST'}, format='json',
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Division.objects.get(pk=response.data['id']).company_id, self.company.pk)
+
+    def test_update_cannot_move_a_row_to_another_company(self):
+        division = self.terminal.department.division
+        response = self.client.patch(
+            f'/api/divisions/{division.pk}/', {'company': str(self.foreign_company.pk)}, format='json',
+        )
+        self.assertEqual(response.status_code, 200)
+        division.refresh_from_db()
+        self.assertEqual(division.company_id, self.company.pk)
+
+    def test_rows_of_other_companies_are_not_found(self):
+        foreign_load = make_load('L9', self.foreign_terminal)
+        response = self.client.patch(f'/api/loads/{foreign_load.pk}/', {'notes': 'x'}, format='json')
+        self.assertEqual(response.status_code, 404)
+
+
+class RolePermissionTests(TestCase):
+    """``HasTMSPermission`` on the scoped viewsets"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.terminal = make_company('ACME')
+        department = cls.terminal.department
+        cls.company = department.division.company
+        cls.clerk = make_user(
+            'clerk', company=cls.company, division=department.division, department=department, terminal=cls.terminal,
+        )
+        cls.load = make_load('L1', cls.terminal)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.clerk)
+
+    def test_reads_need_only_authentication(self):
+        self.assertEqual(self.client.get('/api/drivers/').status_code, 200)
+
+    def test_writes_need_a_role_permission(self):
+        self.assertEqual(self.client.post('/api/drivers/', {}, format='json').status_code, 403)
+        self.assertEqual(self.client.delete(f'/api/loads/{self.load.pk}/').status_code, 403)
 
-# Create your tests here.
+    def test_assigned_load_updates_are_allowed(self):
+        response = self.client.patch(f'/api/loads/{self.load.pk}/', {'notes': 'Gate code 4411'}, format='json')
+        self.assertEqual(response.status_code, 200)
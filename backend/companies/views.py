@@ -6,6 +6,9 @@ from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
 from django.db.models import Count, Q
 from .models import Company, Division, Department, Terminal, CustomUser
+from .authentication import get_user_instance
+from .permissions import HasTMSPermission, write_permissions
+from .scoping import ScopedQuerysetMixin
 from .serializers import CompanySerializer, DivisionSerializer, DepartmentSerializer, TerminalSerializer, UserSerializer
 
 
@@ -25,12 +28,9 @@ def organization_hierarchy(request):
     user = request.user
     
     # Determine which companies the user can access
-    if isinstance(user, CustomUser) and user.role == 'system_admin':
-        companies = Company.objects.all()
-    elif isinstance(user, CustomUser) and user.company:
-        companies = Company.objects.filter(id=user.company.id)
-    else:
+    if getattr(user, 'role', None) != 'system_admin' and not getattr(user, 'company_id', None):
         return Response({"error": "Access denied"}, status=status.HTTP_403_FORBIDDEN)
+    companies = Company.objects.for_user(user)
     
     hierarchy_data = []
     
@@ -43,14 +43,14 @@ def organization_hierarchy(request):
         
         # Simulate vehicle and load counts (you can replace with actual queries)
         from vehicles.models import Truck, Trailer
-        from loads.models import Load
+        from loads.models import ACTIVE_LOAD_STATUSES, Load
         
         try:
             total_trucks = Truck.objects.filter(company=company).count()
             total_trailers = Trailer.objects.filter(company=company).count()
             active_loads = Load.objects.filter(
                 company=company, 
-                status__in=['assigned', 'in_transit', 'at_pickup', 'at_delivery']
+                status__in=ACTIVE_LOAD_STATUSES
             ).count()
         except:
             # Fallback if models don't exist yet
@@ -219,87 +219,50 @@ def organization_hierarchy(request):
     return Response(hierarchy_data)
 
 
-class CompanyViewSet(viewsets.ModelViewSet):
+class CompanyViewSet(ScopedQuerysetMixin, viewsets.ModelViewSet):
     """ViewSet for managing companies"""
     queryset = Company.objects.all()
     serializer_class = CompanySerializer
-    permission_classes = [permissions.IsAuthenticated]
-    
-    def get_queryset(self):
-        """Filter companies based on user's permissions"""
-        user = self.request.user
-        if isinstance(user, CustomUser) and user.role == 'system_admin':
-            return Company.objects.all()
-        elif isinstance(user, CustomUser) and user.company:
-            return Company.objects.filter(id=user.company.id)
-        return Company.objects.none()
+    permission_classes = [permissions.IsAuthenticated, HasTMSPermission]
+    required_permissions = {
+        **write_permissions('manage_companies', actions=('create', 'destroy')),
+        **write_permissions('manage_companies', 'manage_company_settings', actions=('update', 'partial_update')),
+    }
 
 
-class DivisionViewSet(viewsets.ModelViewSet):
+class DivisionViewSet(ScopedQuerysetMixin, viewsets.ModelViewSet):
     """ViewSet for managing divisions"""
     queryset = Division.objects.all()
     serializer_class = DivisionSerializer
-    permission_classes = [permissions.IsAuthenticated]
-    
-    def get_queryset(self):
-        """Filter divisions based on user's permissions"""
-        user = self.request.user
-        if isinstance(user, CustomUser) and user.role == 'system_admin':
-            return Division.objects.all()
-        elif isinstance(user, CustomUser) and user.company:
-            return Division.objects.filter(company=user.company)
-        return Division.objects.none()
+    permission_classes = [permissions.IsAuthenticated, HasTMSPermission]
+    required_permissions = write_permissions('manage_company_settings')
 
 
-class DepartmentViewSet(viewsets.ModelViewSet):
+class DepartmentViewSet(ScopedQuerysetMixin, viewsets.ModelViewSet):
     """ViewSet for managing departments"""
     queryset = Department.objects.all()
     serializer_class = DepartmentSerializer
-    permission_classes = [permissions.IsAuthenticated]
-    
-    def get_queryset(self):
-        """Filter departments based on user's permissions"""
-        user = self.request.user
-        if isinstance(user, CustomUser) and user.role == 'system_admin':
-            return Department.objects.all()
-        elif isinstance(user, CustomUser) and user.company:
-            return Department.objects.filter(division__company=user.company)
-        return Department.objects.none()
+    permission_classes = [permissions.IsAuthenticated, HasTMSPermission]
+    required_permissions = write_permissions('manage_company_settings')
 
 
-class TerminalViewSet(viewsets.ModelViewSet):
+class TerminalViewSet(ScopedQuerysetMixin, viewsets.ModelViewSet):
     """ViewSet for managing terminals"""
     queryset = Terminal.objects.all()
     serializer_class = TerminalSerializer
-    permission_classes = [permissions.IsAuthenticated]
-    
-    def get_queryset(self):
-        """Filter terminals based on user's permissions"""
-        user = self.request.user
-        if isinstance(user, CustomUser) and user.role == 'system_admin':
-            return Terminal.objects.all()
-        elif isinstance(user, CustomUser) and user.company:
-            return Terminal.objects.filter(department__division__company=user.company)
-        return Terminal.objects.none()
+    permission_classes = [permissions.IsAuthenticated, HasTMSPermission]
+    required_permissions = write_permissions('manage_company_settings')
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(ScopedQuerysetMixin, viewsets.ModelViewSet):
     """ViewSet for managing users"""
     queryset = CustomUser.objects.all()
     serializer_class = UserSerializer
-    permission_classes = [permissions.IsAuthenticated]
-    
-    def get_queryset(self):
-        """Filter users based on user's permissions"""
-        user = self.request.user
-        if isinstance(user, CustomUser) and user.role == 'system_admin':
-            return CustomUser.objects.all()
-        elif isinstance(user, CustomUser) and user.company:
-            return CustomUser.objects.filter(company=user.company)
-        return CustomUser.objects.none()
+    permission_classes = [permissions.IsAuthenticated, HasTMSPermission]
+    required_permissions = write_permissions('manage_users', 'manage_company_users')
     
     @action(detail=False, methods=['get'])
     def me(self, request):
         """Get current user's information"""
-        serializer = self.get_serializer(request.user)
+        serializer = self.get_serializer(get_user_instance(request.user))
         return Response(serializer.data)
@@ -0,0 +1,10 @@
+from django.contrib import admin
+
+from .models import GeocodeEntry
+
+
+@admin.register(GeocodeEntry)
+class GeocodeEntryAdmin(admin.ModelAdmin):
+    list_display = ['zip_code', 'city', 'state', 'lat', 'lng']
+    search_fields = ['zip_code', 'city']
+    list_filter = ['state']
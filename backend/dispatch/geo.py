@@ -0,0 +1,81 @@
+"""
+Geohash grid index and distance helpers for dispatch
+
+Positions are stored with a geohash string next to their coordinates. Points
+in the same geohash cell share a prefix, so "everything near X" becomes a
+handful of indexed ``LIKE 'prefix%'`` range scans on plain PostgreSQL,
+followed by exact haversine distances on the few candidates found.
+"""
+import math
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+STORED_PRECISION = 7  # ~150m cells
+MIN_PRECISION = 1
+EARTH_RADIUS_MILES = 3958.8
+MILES_PER_DEGREE = 69.09
+
+
+def encode(lat, lng, precision=STORED_PRECISION):
+    """Geohash of a point"""
+    lat, lng = float(lat), float(lng)
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        rng, coord = (lng_range, lng) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        value <<= 1
+        if coord >= mid:
+            value |= 1
+            rng[0] = mid
+        else:
+            rng[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits, value = 0, 0
+    return ''.join(chars)
+
+
+def cell_size_degrees(precision):
+    """(height, width) of a geohash cell in degrees"""
+    total_bits = precision * 5
+    lng_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lng_bits)
+
+
+def covering_cells(lat, lng, radius_miles):
+    """
+    Geohash prefixes whose cells cover a circle of ``radius_miles``.
+
+    Uses the finest precision whose cells are at least the radius in both
+    directions, then returns the cell containing the point and its eight
+    neighbours.
+    """
+    lat, lng = float(lat), float(lng)
+    cos_lat = max(math.cos(math.radians(lat)), 0.01)
+    precision = MIN_PRECISION
+    for candidate in range(STORED_PRECISION, MIN_PRECISION - 1, -1):
+        height, width = cell_size_degrees(candidate)
+        if min(height * MILES_PER_DEGREE, width * MILES_PER_DEGREE * cos_lat) >= radius_miles:
+            precision = candidate
+            break
+
+    height, width = cell_size_degrees(precision)
+    cells = []
+    for dlat in (-height, 0, height):
+        for dlng in (-width, 0, width):
+            neighbour_lat = min(max(lat + dlat, -89.999999), 89.999999)
+            neighbour_lng = (lng + dlng + 180.0) % 360.0 - 180.0
+            cell = encode(neighbour_lat, neighbour_lng, precision)
+            if cell not in cells:
+                cells.append(cell)
+    return cells
+
+
+def haversine_miles(lat1, lng1, lat2, lng2):
+    """Great-circle distance in miles"""
+    lat1, lng1, lat2, lng2 = map(math.radians, (float(lat1), float(lng1), float(lat2), float(lng2)))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * math.asin(math.sqrt(a))
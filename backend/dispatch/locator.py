@@ -0,0 +1,126 @@
+"""
+Nearest-capacity lookups over last-known truck positions and terminals
+"""
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from companies.models import Terminal
+from vehicles.models import Truck
+
+from .geo import covering_cells, encode, haversine_miles
+
+DEFAULT_RADIUS_MILES = 150
+MAX_RADIUS_MILES = 1000
+
+
+def _cells_filter(lat, lng, radius_miles):
+    condition = Q()
+    for cell in covering_cells(lat, lng, radius_miles):
+        condition |= Q(geohash__startswith=cell)
+    return condition
+
+
+def _rank(rows, lat, lng, lat_key, lng_key, radius_miles, k):
+    ranked = []
+    for row in rows:
+        distance = haversine_miles(lat, lng, row[lat_key], row[lng_key])
+        if distance <= radius_miles:
+            row['distance_miles'] = round(distance, 2)
+            ranked.append(row)
+    ranked.sort(key=lambda row: row['distance_miles'])
+    return ranked[:k]
+
+
+def nearest_trucks(user, lat, lng, k=10, radius_miles=DEFAULT_RADIUS_MILES, require_driver=False, max_age=None):
+    """
+    The ``k`` nearest available trucks within ``radius_miles`` of a point,
+    with their assigned driver, from one indexed query.
+    """
+    trucks = Truck.objects.for_user(user).filter(
+        _cells_filter(lat, lng, radius_miles),
+        status='available',
+        last_known_lat__isnull=False,
+    )
+    if require_driver:
+        trucks = trucks.filter(assigned_driver__status='active')
+    if max_age is not None:
+        trucks = trucks.filter(last_position_at__gte=timezone.now() - timedelta(minutes=max_age))
+
+    rows = trucks.order_by().values(
+        'id', 'license_plate', 'make', 'model', 'last_known_lat', 'last_known_lng', 'last_position_at',
+        'assigned_driver_id', 'assigned_driver__first_name', 'assigned_driver__last_name',
+        'assigned_driver__status', 'assigned_driver__phone_number',
+    )
+    results = []
+    for row in _rank(list(rows), lat, lng, 'last_known_lat', 'last_known_lng', radius_miles, k):
+        driver = None
+        if row['assigned_driver_id']:
+            driver = {
+                'id': str(row['assigned_driver_id']),
+                'name': f"{row['assigned_driver__first_name']} {row['assigned_driver__last_name']}",
+                'status': row['assigned_driver__status'],
+                'phone': row['assigned_driver__phone_number'],
+            }
+        results.append({
+            'truckId': str(row['id']),
+            'licensePlate': row['license_plate'],
+            'makeModel': f"{row['make']} {row['model']}",
+            'lat': float(row['last_known_lat']),
+            'lng': float(row['last_known_lng']),
+            'positionAt': row['last_position_at'],
+            'distanceMiles': row['distance_miles'],
+            'driver': driver,
+        })
+    return results
+
+
+def nearest_terminals(user, lat, lng, k=10, radius_miles=DEFAULT_RADIUS_MILES):
+    """The ``k`` nearest active terminals within ``radius_miles`` of a point"""
+    terminals = Terminal.objects.for_user(user).filter(
+        _cells_filter(lat, lng, radius_miles),
+        is_active=True,
+        lat__isnull=False,
+    )
+    rows = terminals.order_by().values('id', 'code', 'name', 'address_city', 'address_state', 'lat', 'lng')
+    return [
+        {
+            'terminalId': str(row['id']),
+            'code': row['code'],
+            'name': row['name'],
+            'city': row['address_city'],
+            'state': row['address_state'],
+            'lat': float(row['lat']),
+            'lng': float(row['lng']),
+            'distanceMiles': row['distance_miles'],
+        }
+        for row in _rank(list(rows), lat, lng, 'lat', 'lng', radius_miles, k)
+    ]
+
+
+def record_truck_positions(user, positions):
+    """
+    Store last-known positions for many trucks with one bulk_update.
+
+    ``positions`` maps truck ID to (lat, lng, recorded_at). Older reports
+    than the stored position are ignored. Returns the IDs that were updated.
+    """
+    with transaction.atomic():
+        trucks = Truck.objects.for_user(user).filter(id__in=list(positions)).select_for_update(of=('self',)).only(
+            'id', 'company_id', 'last_known_lat', 'last_known_lng', 'last_position_at', 'geohash',
+        )
+        changed = []
+        for truck in trucks:
+            lat, lng, recorded_at = positions[truck.pk]
+            if truck.last_position_at and recorded_at < truck.last_position_at:
+                continue
+            truck.last_known_lat, truck.last_known_lng = lat, lng
+            truck.last_position_at = recorded_at
+            truck.geohash = encode(lat, lng)
+            changed.append(truck)
+        Truck.objects.bulk_update(
+            changed, ['last_known_lat', 'last_known_lng', 'last_position_at', 'geohash'], batch_size=500,
+        )
+    return [str(truck.pk) for truck in changed]
@@ -0,0 +1 @@
+# Dispatch management commands
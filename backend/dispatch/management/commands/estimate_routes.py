@@ -0,0 +1,69 @@
+"""
+Management command to fill load distance / transit estimates and terminal coordinates
+"""
+from django.core.management.base import BaseCommand
+
+from companies.models import Terminal
+from dispatch.routing import estimate_load_routes, geocode_terminals
+from loads.models import Load
+from loads.signals import loads_bulk_updated
+
+
+class Command(BaseCommand):
+    help = 'Estimate distance and transit time for loads missing them, and geocode terminals'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=2000,
+            help='Loads processed per batch',
+        )
+        parser.add_argument(
+            '--overwrite',
+            action='store_true',
+            help='Recompute estimates for loads that already have them',
+        )
+        parser.add_argument(
+            '--company',
+            help='Only process loads of the company with this code',
+        )
+
+    def handle(self, *args, **options):
+        terminals = geocode_terminals(Terminal.objects.filter(lat__isnull=True))
+        for terminal in terminals:
+            # save() keeps the geohash in sync
+            terminal.save(update_fields=['lat', 'lng', 'geohash', 'updated_at'])
+        self.stdout.write(f"Geocoded {len(terminals)} terminals")
+
+        loads = Load.objects.order_by('pk')
+        if not options['overwrite']:
+            loads = loads.filter(distance__isnull=True) | loads.filter(estimated_transit_time__isnull=True)
+        if options['company']:
+            loads = loads.filter(company__code=options['company'])
+        loads = loads.only(
+            'id', 'distance', 'estimated_transit_time',
+            'pickup_lat', 'pickup_lng', 'pickup_zip', 'pickup_city', 'pickup_state',
+            'delivery_lat', 'delivery_lng', 'delivery_zip', 'delivery_city', 'delivery_state',
+            # Keeps the daily rollups' distance totals current (reports.signals)
+            'company', 'origin_terminal', 'pickup_date', 'status', 'weight', 'rate',
+        )
+
+        updated = unresolved = 0
+        last_pk = None
+        while True:
+            # Keyset pagination: updated rows drop out of the filter, so offsets would skip rows
+            batch_qs = loads if last_pk is None else loads.filter(pk__gt=last_pk)
+            batch = list(batch_qs[:options['batch_size']])
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+            changed = estimate_load_routes(batch, overwrite=options['overwrite'])
+            Load.objects.bulk_update(changed, ['distance', 'estimated_transit_time'])
+            loads_bulk_updated.send(sender=Load, loads=changed, fields=['distance', 'estimated_transit_time'])
+            updated += len(changed)
+            unresolved += len(batch) - len(changed)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Estimated {updated} loads ({unresolved} without usable location data)")
+        )
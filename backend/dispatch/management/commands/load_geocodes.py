@@ -0,0 +1,65 @@
+"""
+Management command to load the geocode reference table from a CSV file
+"""
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+
+from dispatch.models import GeocodeEntry
+from dispatch.routing import clear_routing_caches, zip3
+
+
+class Command(BaseCommand):
+    help = 'Load postal code coordinates from a CSV with zip, city, state, lat and lng columns'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV file with a header row')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Rows inserted per statement',
+        )
+        parser.add_argument(
+            '--replace',
+            action='store_true',
+            help='Delete existing entries before loading',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            handle = open(options['path'], newline='')
+        except OSError as e:
+            raise CommandError(f"Cannot open {options['path']}: {e}")
+
+        if options['replace']:
+            GeocodeEntry.objects.all().delete()
+
+        batch, loaded, skipped = [], 0, 0
+        with handle:
+            for row in csv.DictReader(handle):
+                try:
+                    entry = GeocodeEntry(
+                        zip_code=row['zip'].strip().zfill(5),
+                        zip3=zip3(row['zip'].strip().zfill(5)),
+                        city=row['city'].strip(),
+                        state=row['state'].strip().upper(),
+                        lat=row['lat'],
+                        lng=row['lng'],
+                    )
+                except (KeyError, AttributeError):
+                    skipped += 1
+                    continue
+                batch.append(entry)
+                if len(batch) >= options['batch_size']:
+                    GeocodeEntry.objects.bulk_create(batch, ignore_conflicts=True)
+                    loaded += len(batch)
+                    batch = []
+        if batch:
+            GeocodeEntry.objects.bulk_create(batch, ignore_conflicts=True)
+            loaded += len(batch)
+
+        clear_routing_caches()
+        self.stdout.write(
+            self.style.SUCCESS(f"Loaded {loaded} geocode rows ({skipped} skipped)")
+        )
@@ -0,0 +1,33 @@
+# Generated by Django 5.0.4 on 2026-10-19 17:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GeocodeEntry',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('zip_code', models.CharField(max_length=10)),
+                ('zip3', models.CharField(max_length=3)),
+                ('city', models.CharField(max_length=100)),
+                ('state', models.CharField(max_length=50)),
+                ('lat', models.DecimalField(decimal_places=8, max_digits=10)),
+                ('lng', models.DecimalField(decimal_places=8, max_digits=11)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['zip3'], name='geocode_zip3_idx'), models.Index(fields=['state', 'city'], name='geocode_state_city_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='geocodeentry',
+            constraint=models.UniqueConstraint(fields=('zip_code', 'state', 'city'), name='geocode_unique_place'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+"""
+Reference data for dispatch routing
+"""
+from django.db import models
+
+
+class GeocodeEntry(models.Model):
+    """
+    Coordinates for a postal code / city, loaded from a reference file with
+    ``python manage.py load_geocodes``. Shared by all companies.
+    """
+    id = models.BigAutoField(primary_key=True)
+    zip_code = models.CharField(max_length=10)
+    zip3 = models.CharField(max_length=3)
+    city = models.CharField(max_length=100)
+    state = models.CharField(max_length=50)
+    lat = models.DecimalField(max_digits=10, decimal_places=8)
+    lng = models.DecimalField(max_digits=11, decimal_places=8)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['zip3'], name='geocode_zip3_idx'),
+            models.Index(fields=['state', 'city'], name='geocode_state_city_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['zip_code', 'state', 'city'], name='geocode_unique_place'),
+        ]
+    
+    def __str__(self):
+        return f"{self.zip_code} {self.city}, {self.state}"
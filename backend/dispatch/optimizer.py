@@ -0,0 +1,164 @@
+"""
+Load-to-driver assignment proposals for a terminal
+
+Open loads originating at a terminal are matched to the terminal's available
+driver/truck units by solving a min-cost assignment (Hungarian algorithm via
+``scipy.optimize.linear_sum_assignment``) over a numpy cost matrix. The cost
+of a pair is its deadhead road miles plus a penalty per hour the unit would
+arrive after the scheduled pickup. Pairs that break a hard rule get an
+infeasible cost and are never proposed:
+
+* the driver is not active, is already on an active load, or their license
+  expires before the load's delivery date
+* the truck is in maintenance or out of service
+* the load is hazmat and the driver's tier is not in ``HAZMAT_TIERS``
+* deadhead exceeds the limit, or the unit would be later than ``MAX_LATE_HOURS``
+
+Nothing is written; proposals are applied with the bulk-assign endpoint.
+"""
+import time
+
+import numpy as np
+from django.conf import settings
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+from scipy.optimize import linear_sum_assignment
+
+from loads.models import ACTIVE_LOAD_STATUSES, Load
+from vehicles.models import Truck
+
+from .routing import AVERAGE_SPEED_MPH, resolve_centroids, road_miles, zip3
+
+_options = getattr(settings, 'DISPATCH_OPTIMIZER', {})
+MAX_DEADHEAD_MILES = _options.get('MAX_DEADHEAD_MILES', 500)
+LATE_PENALTY_PER_HOUR = _options.get('LATE_PENALTY_PER_HOUR', 50)
+MAX_LATE_HOURS = _options.get('MAX_LATE_HOURS', 4)
+HAZMAT_TIERS = frozenset(_options.get('HAZMAT_TIERS', ('tier_3', 'tier_4')))
+MAX_PROBLEM_SIZE = _options.get('MAX_PROBLEM_SIZE', 2000)
+
+OPEN_LOAD_STATUSES = ('pending', 'planned')
+UNAVAILABLE_TRUCK_STATUSES = ('maintenance', 'out_of_service')
+INFEASIBLE = 1e9
+_NO_POINT = (None, None)
+
+
+def _open_loads(user, terminal, load_ids=None):
+    loads = Load.objects.for_user(user).filter(
+        origin_terminal=terminal,
+        status__in=OPEN_LOAD_STATUSES,
+        assigned_driver__isnull=True,
+    )
+    if load_ids:
+        loads = loads.filter(id__in=load_ids)
+    return list(loads.order_by('pickup_date').values(
+        'id', 'load_number', 'hazmat', 'pickup_date', 'delivery_date',
+        'pickup_lat', 'pickup_lng', 'pickup_zip',
+    )[:MAX_PROBLEM_SIZE])
+
+
+def _available_units(user, terminal):
+    """Active drivers with a serviceable truck, based at the terminal and not on an active load"""
+    busy = Load.objects.filter(assigned_driver=OuterRef('assigned_driver'), status__in=ACTIVE_LOAD_STATUSES)
+    trucks = Truck.objects.for_user(user).filter(
+        Q(assigned_terminal=terminal) | Q(home_terminal=terminal) | Q(assigned_driver__home_terminal=terminal),
+        assigned_driver__status='active',
+    ).exclude(status__in=UNAVAILABLE_TRUCK_STATUSES).exclude(Exists(busy))
+    return list(trucks.order_by().values(
+        'id', 'license_plate', 'last_known_lat', 'last_known_lng',
+        'assigned_driver_id', 'assigned_driver__first_name', 'assigned_driver__last_name',
+        'assigned_driver__tier', 'assigned_driver__license_expiry',
+    )[:MAX_PROBLEM_SIZE])
+
+
+def _pickup_points(loads, terminal):
+    """(lat, lng) per load from its coordinates, else the terminal, else its ZIP3 centroid"""
+    fallback = (float(terminal.lat), float(terminal.lng)) if terminal.lat is not None and terminal.lng is not None else None
+    centroids = {}
+    if fallback is None:
+        centroids = resolve_centroids(zip3s=[prefix for load in loads if (prefix := zip3(load['pickup_zip']))])
+    points = []
+    for load in loads:
+        if load['pickup_lat'] is not None and load['pickup_lng'] is not None:
+            points.append((float(load['pickup_lat']), float(load['pickup_lng'])))
+        elif fallback is not None:
+            points.append(fallback)
+        else:
+            points.append(centroids.get(zip3(load['pickup_zip']), _NO_POINT))
+    return points
+
+
+def _unit_points(units, terminal):
+    fallback = (float(terminal.lat), float(terminal.lng)) if terminal.lat is not None and terminal.lng is not None else _NO_POINT
+    return [
+        (float(unit['last_known_lat']), float(unit['last_known_lng']))
+        if unit['last_known_lat'] is not None and unit['last_known_lng'] is not None else fallback
+        for unit in units
+    ]
+
+
+def build_cost_matrix(loads, units, load_points, unit_points, now):
+    """Loads × units matrix of (cost, deadhead miles, late hours); infeasible pairs cost ``INFEASIBLE``"""
+    load_xy = np.array([point if point[0] is not None else (np.nan, np.nan) for point in load_points], dtype=float)
+    unit_xy = np.array([point if point[0] is not None else (np.nan, np.nan) for point in unit_points], dtype=float)
+
+    deadhead = road_miles(load_xy[:, 0:1], load_xy[:, 1:2], unit_xy[:, 0][None, :], unit_xy[:, 1][None, :])
+    # Overdue loads only count lateness the unit adds on top
+    hours_to_pickup = np.array([max(0.0, (load['pickup_date'] - now).total_seconds() / 3600) for load in loads])
+    late = np.maximum(0.0, deadhead / AVERAGE_SPEED_MPH - hours_to_pickup[:, None])
+    cost = deadhead + late * LATE_PENALTY_PER_HOUR
+
+    hazmat = np.array([load['hazmat'] for load in loads], dtype=bool)
+    qualified = np.array([unit['assigned_driver__tier'] in HAZMAT_TIERS for unit in units], dtype=bool)
+    delivery_days = np.array([load['delivery_date'].date().toordinal() for load in loads])
+    license_days = np.array([unit['assigned_driver__license_expiry'].toordinal() for unit in units])
+
+    infeasible = (
+        np.isnan(deadhead)
+        | (deadhead > MAX_DEADHEAD_MILES)
+        | (late > MAX_LATE_HOURS)
+        | (hazmat[:, None] & ~qualified[None, :])
+        | (license_days[None, :] < delivery_days[:, None])
+    )
+    cost[infeasible] = INFEASIBLE
+    return cost, deadhead, late
+
+
+def propose_assignments(user, terminal, load_ids=None):
+    """Min-cost driver/truck proposals for the open loads of ``terminal``"""
+    started = time.perf_counter()
+    now = timezone.now()
+    loads = _open_loads(user, terminal, load_ids)
+    units = _available_units(user, terminal)
+
+    proposals, assigned = [], set()
+    if loads and units:
+        cost, deadhead, late = build_cost_matrix(
+            loads, units, _pickup_points(loads, terminal), _unit_points(units, terminal), now,
+        )
+        rows, cols = linear_sum_assignment(cost)
+        for row, col in zip(rows, cols):
+            if cost[row, col] >= INFEASIBLE:
+                continue
+            load, unit = loads[row], units[col]
+            assigned.add(row)
+            proposals.append({
+                'loadId': str(load['id']),
+                'loadNumber': load['load_number'],
+                'driverId': str(unit['assigned_driver_id']),
+                'driverName': f"{unit['assigned_driver__first_name']} {unit['assigned_driver__last_name']}",
+                'truckId': str(unit['id']),
+                'licensePlate': unit['license_plate'],
+                'deadheadMiles': round(float(deadhead[row, col]), 1),
+                'lateHours': round(float(late[row, col]), 2),
+                'cost': round(float(cost[row, col]), 2),
+            })
+
+    return {
+        'terminalId': str(terminal.pk),
+        'proposals': proposals,
+        'unassignedLoadIds': [str(load['id']) for index, load in enumerate(loads) if index not in assigned],
+        'loads': len(loads),
+        'units': len(units),
+        'totalDeadheadMiles': round(sum(proposal['deadheadMiles'] for proposal in proposals), 1),
+        'solveMs': round((time.perf_counter() - started) * 1000, 1),
+    }
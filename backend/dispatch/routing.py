@@ -0,0 +1,224 @@
+"""
+Distance and transit-time estimation without an external routing service
+
+Distances are great-circle miles scaled by a road factor, computed with
+numpy over whole batches. Each load end resolves to its own coordinates
+when present, otherwise to the centroid of its 3-digit ZIP prefix (or
+city/state) from the geocode table. Distances between ZIP3 centroids are
+memoized per lane (origin ZIP3 → destination ZIP3) in an LRU cache, so
+repeated lanes cost nothing after the first load.
+"""
+import math
+from decimal import Decimal
+
+import numpy as np
+from django.conf import settings
+from django.db.models import Avg, Q
+
+from api.cache import LocalTTLCache
+
+from .geo import EARTH_RADIUS_MILES
+from .models import GeocodeEntry
+
+_options = getattr(settings, 'ROUTING', {})
+ROAD_FACTOR = _options.get('ROAD_FACTOR', 1.18)
+AVERAGE_SPEED_MPH = _options.get('AVERAGE_SPEED_MPH', 50)
+DRIVING_HOURS_PER_SHIFT = _options.get('DRIVING_HOURS_PER_SHIFT', 11)
+REST_HOURS = _options.get('REST_HOURS', 10)
+
+# Reference data changes rarely; the TTL only bounds staleness after a reload
+_lane_cache = LocalTTLCache('routing_lane', max_size=_options.get('LANE_CACHE_SIZE', 50000), ttl=86400)
+_centroid_cache = LocalTTLCache('routing_centroid', max_size=_options.get('CENTROID_CACHE_SIZE', 20000), ttl=86400)
+_MISSING = (None, None)
+
+
+def haversine_miles(lat1, lng1, lat2, lng2):
+    """Vectorized great-circle distance in miles between paired coordinate arrays"""
+    lat1, lng1, lat2, lng2 = (np.radians(np.asarray(values, dtype=float)) for values in (lat1, lng1, lat2, lng2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(a))
+
+
+def road_miles(lat1, lng1, lat2, lng2):
+    """Estimated road distance: great-circle miles times the road factor"""
+    return haversine_miles(lat1, lng1, lat2, lng2) * ROAD_FACTOR
+
+
+def transit_hours(miles):
+    """Driving time at the average speed plus a rest period after each full shift"""
+    driving = miles / AVERAGE_SPEED_MPH
+    rests = math.floor(driving / DRIVING_HOURS_PER_SHIFT) if driving else 0
+    return int(math.ceil(driving + rests * REST_HOURS))
+
+
+def zip3(zip_code):
+    digits = ''.join(ch for ch in (zip_code or '') if ch.isdigit())
+    return digits[:3] if len(digits) >= 3 else None
+
+
+def _city_key(city, state):
+    if not city or not state:
+        return None
+    return f"{state.strip().upper()}|{city.strip().upper()}"
+
+
+def resolve_centroids(zip3s=(), places=()):
+    """
+    Centroid (lat, lng) for each ZIP3 prefix and (city, state) key.
+
+    Cached values are reused; misses are resolved with at most one grouped
+    query per kind. Unknown keys map to (None, None).
+    """
+    resolved = {}
+    missing_zip3 = set()
+    for prefix in set(zip3s):
+        cached = _centroid_cache.get(f"zip3:{prefix}")
+        if cached is None:
+            missing_zip3.add(prefix)
+        else:
+            resolved[prefix] = cached
+    if missing_zip3:
+        rows = GeocodeEntry.objects.filter(zip3__in=missing_zip3).values('zip3').annotate(
+            lat=Avg('lat'), lng=Avg('lng'),
+        )
+        found = {row['zip3']: (float(row['lat']), float(row['lng'])) for row in rows}
+        for prefix in missing_zip3:
+            resolved[prefix] = found.get(prefix, _MISSING)
+            _centroid_cache.set(f"zip3:{prefix}", resolved[prefix])
+
+    missing_places = set()
+    for key in set(places):
+        cached = _centroid_cache.get(f"place:{key}")
+        if cached is None:
+            missing_places.add(key)
+        else:
+            resolved[key] = cached
+    if missing_places:
+        condition = Q()
+        for key in missing_places:
+            state, city = key.split('|', 1)
+            condition |= Q(state__iexact=state, city__iexact=city)
+        rows = GeocodeEntry.objects.filter(condition).values('state', 'city').annotate(lat=Avg('lat'), lng=Avg('lng'))
+        found = {}
+        for row in rows:
+            found[_city_key(row['city'], row['state'])] = (float(row['lat']), float(row['lng']))
+        for key in missing_places:
+            resolved[key] = found.get(key, _MISSING)
+            _centroid_cache.set(f"place:{key}", resolved[key])
+    return resolved
+
+
+def _end_keys(load, prefix):
+    """(zip3, city key) for the pickup or delivery end of a load"""
+    return (
+        zip3(getattr(load, f'{prefix}_zip')),
+        _city_key(getattr(load, f'{prefix}_city'), getattr(load, f'{prefix}_state')),
+    )
+
+
+def _exact(load):
+    coords = (load.pickup_lat, load.pickup_lng, load.delivery_lat, load.delivery_lng)
+    return None if any(value is None for value in coords) else tuple(float(value) for value in coords)
+
+
+def _lane_distances(lanes):
+    """Road miles per lane key, from the lane cache or one batch of centroid lookups; unknown lanes are omitted"""
+    distances, uncached = {}, []
+    for key in lanes:
+        distance = _lane_cache.get(key)
+        if distance is None:
+            uncached.append(key)
+        else:
+            distances[key] = distance
+    if not uncached:
+        return distances
+
+    ends = [part for _, *parts in uncached for part in parts]
+    if uncached[0][0] == 'zip3':
+        centroids = resolve_centroids(zip3s=ends)
+    else:
+        centroids = resolve_centroids(places=ends)
+    computable = [key for key in uncached if centroids[key[1]] != _MISSING and centroids[key[2]] != _MISSING]
+    if computable:
+        pairs = np.array([centroids[key[1]] + centroids[key[2]] for key in computable])
+        for key, distance in zip(computable, road_miles(*pairs.T)):
+            distances[key] = float(distance)
+            _lane_cache.set(key, distances[key])
+    return distances
+
+
+def estimate_load_routes(loads, overwrite=False):
+    """
+    Fill ``distance`` and ``estimated_transit_time`` on Load instances in place.
+
+    Loads with both coordinate pairs get an exact estimate; the rest go
+    through the ZIP3 lane cache, then city/state centroids. Unless
+    ``overwrite`` is set only empty fields are filled, and a known distance
+    gives the transit time without estimating a route. Returns the loads
+    that were changed; the caller saves them (e.g. with bulk_update).
+    """
+    changed = []
+    pending = []
+    for load in loads:
+        if overwrite or load.distance is None:
+            pending.append(load)
+        elif load.estimated_transit_time is None:
+            load.estimated_transit_time = transit_hours(load.distance)
+            changed.append(load)
+    miles = {}
+
+    exact = [(load, coords) for load in pending if (coords := _exact(load)) is not None]
+    if exact:
+        distances = road_miles(*np.array([coords for _, coords in exact]).T)
+        for (load, _), distance in zip(exact, distances):
+            miles[id(load)] = float(distance)
+
+    # Lane estimates for the rest: ZIP3 lanes first, then city/state lanes
+    for kind, part in (('zip3', 0), ('place', 1)):
+        lanes = {}
+        for load in pending:
+            if id(load) in miles:
+                continue
+            origin, destination = _end_keys(load, 'pickup')[part], _end_keys(load, 'delivery')[part]
+            if origin and destination:
+                lanes.setdefault((kind, origin, destination), []).append(load)
+        for key, distance in _lane_distances(lanes).items():
+            for load in lanes[key]:
+                miles[id(load)] = distance
+
+    for load in pending:
+        distance = miles.get(id(load))
+        if distance is None:
+            continue
+        load.distance = int(round(distance))
+        if overwrite or load.estimated_transit_time is None:
+            load.estimated_transit_time = transit_hours(distance)
+        changed.append(load)
+    return changed
+
+
+def clear_routing_caches():
+    _lane_cache.clear()
+    _centroid_cache.clear()
+
+
+def geocode_terminals(terminals):
+    """Fill lat/lng on Terminal instances without coordinates from the geocode table; returns those changed"""
+    pending = [terminal for terminal in terminals if terminal.lat is None or terminal.lng is None]
+    keys = {terminal.pk: (zip3(terminal.address_zip), _city_key(terminal.address_city, terminal.address_state))
+            for terminal in pending}
+    centroids = resolve_centroids(
+        zip3s=[prefix for prefix, _ in keys.values() if prefix],
+        places=[place for _, place in keys.values() if place],
+    )
+    changed = []
+    for terminal in pending:
+        prefix, place = keys[terminal.pk]
+        point = centroids.get(prefix, _MISSING) if prefix else _MISSING
+        if point == _MISSING and place:
+            point = centroids.get(place, _MISSING)
+        if point == _MISSING:
+            continue
+        terminal.lat, terminal.lng = (Decimal(str(round(value, 8))) for value in point)
+        changed.append(terminal)
+    return changed
@@ -0,0 +1,39 @@
+"""
+Serializers for dispatch app
+"""
+from rest_framework import serializers
+
+from .locator import DEFAULT_RADIUS_MILES, MAX_RADIUS_MILES
+from .optimizer import MAX_PROBLEM_SIZE
+
+
+class NearestQuerySerializer(serializers.Serializer):
+    """Query parameters for the nearest capacity lookup"""
+    lat = serializers.FloatField(required=False, min_value=-90, max_value=90)
+    lng = serializers.FloatField(required=False, min_value=-180, max_value=180)
+    loadId = serializers.UUIDField(required=False)
+    kind = serializers.ChoiceField(choices=['trucks', 'terminals'], default='trucks')
+    k = serializers.IntegerField(default=10, min_value=1, max_value=100)
+    radius = serializers.FloatField(default=DEFAULT_RADIUS_MILES, min_value=0.1, max_value=MAX_RADIUS_MILES)
+    requireDriver = serializers.BooleanField(default=False)
+    maxAgeMinutes = serializers.IntegerField(required=False, min_value=1)
+    
+    def validate(self, attrs):
+        has_point = attrs.get('lat') is not None and attrs.get('lng') is not None
+        if not has_point and not attrs.get('loadId'):
+            raise serializers.ValidationError('Provide lat and lng, or loadId')
+        return attrs
+
+
+class TruckPositionSerializer(serializers.Serializer):
+    """One last-known position report"""
+    truckId = serializers.UUIDField()
+    lat = serializers.FloatField(min_value=-90, max_value=90)
+    lng = serializers.FloatField(min_value=-180, max_value=180)
+    recordedAt = serializers.DateTimeField()
+
+
+class OptimizeRequestSerializer(serializers.Serializer):
+    """Request body for assignment proposals"""
+    terminalId = serializers.UUIDField()
+    loadIds = serializers.ListField(child=serializers.UUIDField(), required=False, max_length=MAX_PROBLEM_SIZE)
@@ -0,0 +1,115 @@
+"""
+Tests for geohash nearest-capacity lookups and route estimates
+"""
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from companies.models import Terminal
+from companies.tests import make_company, make_truck, make_user
+from loads.models import Load
+from vehicles.models import Truck
+
+from .geo import covering_cells, encode, haversine_miles
+from .locator import nearest_terminals, nearest_trucks, record_truck_positions
+from .routing import estimate_load_routes, transit_hours
+
+DALLAS = (32.7767, -96.7970)
+FORT_WORTH = (32.7555, -97.3308)
+HOUSTON = (29.7604, -95.3698)
+
+
+def place(truck, lat, lng):
+    truck.last_known_lat, truck.last_known_lng = lat, lng
+    truck.last_position_at = timezone.now()
+    truck.save()
+    return truck
+
+
+class GeoTests(TestCase):
+
+    def test_encode_matches_reference_geohash(self):
+        self.assertEqual(encode(57.64911, 10.40744, precision=11), 'u4pruydqqvj')
+
+    def test_covering_cells_contain_points_within_radius(self):
+        cells = covering_cells(*DALLAS, radius_miles=50)
+        self.assertLess(haversine_miles(*DALLAS, *FORT_WORTH), 50)
+        self.assertTrue(any(encode(*FORT_WORTH).startswith(cell) for cell in cells))
+
+
+class NearestTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.terminal = make_company('ACME')
+        cls.user = make_user('admin', role='company_admin', company=cls.terminal.department.division.company)
+        cls.near = place(make_truck('NEAR', cls.terminal), *FORT_WORTH)
+        cls.nearest = place(make_truck('NEAREST', cls.terminal), DALLAS[0] + 0.01, DALLAS[1])
+        cls.far = place(make_truck('FAR', cls.terminal), *HOUSTON)
+        cls.foreign = place(make_truck('FOREIGN', make_company('OTHER')), *DALLAS)
+
+    def test_trucks_are_ranked_by_distance_within_radius_and_scope(self):
+        results = nearest_trucks(self.user, *DALLAS, radius_miles=100)
+        self.assertEqual([row['licensePlate'] for row in results], ['NEAREST', 'NEAR'])
+        self.assertLess(results[0]['distanceMiles'], results[1]['distanceMiles'])
+
+    def test_k_limits_results(self):
+        self.assertEqual(len(nearest_trucks(self.user, *DALLAS, k=1, radius_miles=100)), 1)
+
+    def test_recorded_positions_move_trucks(self):
+        updated = record_truck_positions(self.user, {self.far.pk: (*DALLAS, timezone.now())})
+        self.assertEqual(updated, [str(self.far.pk)])
+        self.assertEqual(Truck.objects.get(pk=self.far.pk).geohash, encode(*DALLAS))
+        self.assertIn('FAR', [row['licensePlate'] for row in nearest_trucks(self.user, *DALLAS, radius_miles=100)])
+
+    def test_older_positions_are_ignored(self):
+        stale = timezone.now() - timedelta(hours=1)
+        self.assertEqual(record_truck_positions(self.user, {self.far.pk: (*DALLAS, stale)}), [])
+
+    def test_saving_only_coordinates_updates_the_geohash(self):
+        self.far.last_known_lat, self.far.last_known_lng = DALLAS
+        self.far.save(update_fields=['last_known_lat', 'last_known_lng'])
+        self.assertEqual(Truck.objects.get(pk=self.far.pk).geohash, encode(*DALLAS))
+        self.terminal.lat, self.terminal.lng = HOUSTON
+        self.terminal.save(update_fields=['lat', 'lng'])
+        self.assertEqual(Terminal.objects.get(pk=self.terminal.pk).geohash, encode(*HOUSTON))
+
+    def test_terminals(self):
+        self.terminal.lat, self.terminal.lng = DALLAS
+        self.terminal.save()
+        results = nearest_terminals(self.user, *FORT_WORTH, radius_miles=100)
+        self.assertEqual([row['terminalId'] for row in results], [str(self.terminal.pk)])
+
+
+class RouteEstimateTests(TestCase):
+
+    def lane(self, **fields):
+        (pickup_lat, pickup_lng), (delivery_lat, delivery_lng) = DALLAS, HOUSTON
+        return Load(
+            pickup_lat=pickup_lat, pickup_lng=pickup_lng,
+            delivery_lat=delivery_lat, delivery_lng=delivery_lng, **fields,
+        )
+
+    def test_missing_fields_are_estimated(self):
+        load = self.lane()
+        self.assertEqual(estimate_load_routes([load]), [load])
+        self.assertGreater(load.distance, haversine_miles(*DALLAS, *HOUSTON))
+        self.assertEqual(load.estimated_transit_time, transit_hours(load.distance))
+
+    def test_given_distance_is_kept_and_sets_transit_time(self):
+        load = self.lane(distance=500)
+        self.assertEqual(estimate_load_routes([load]), [load])
+        self.assertEqual((load.distance, load.estimated_transit_time), (500, transit_hours(500)))
+
+    def test_given_transit_time_is_kept(self):
+        load = self.lane(estimated_transit_time=30)
+        estimate_load_routes([load])
+        self.assertIsNotNone(load.distance)
+        self.assertEqual(load.estimated_transit_time, 30)
+
+    def test_overwrite_replaces_both(self):
+        load = self.lane(distance=500, estimated_transit_time=30)
+        estimate_load_routes([load], overwrite=True)
+        self.assertNotEqual(load.distance, 500)
+        self.assertEqual(load.estimated_transit_time, transit_hours(load.distance))
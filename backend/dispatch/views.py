@@ -0,0 +1,94 @@
+"""
+API views for dispatch app
+"""
+from decimal import Decimal
+
+from django.conf import settings
+from rest_framework import permissions, status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+
+from companies.models import Terminal
+from loads.models import Load
+
+from .locator import nearest_terminals, nearest_trucks, record_truck_positions
+from .optimizer import propose_assignments
+from .serializers import NearestQuerySerializer, OptimizeRequestSerializer, TruckPositionSerializer
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def nearest(request):
+    """Nearest available trucks (with drivers) or terminals to a point or a load's pickup"""
+    serializer = NearestQuerySerializer(data=request.query_params)
+    if not serializer.is_valid():
+        return Response({
+            'error': 'Invalid query',
+            'details': serializer.errors
+        }, status=status.HTTP_400_BAD_REQUEST)
+    params = serializer.validated_data
+    
+    lat, lng = params.get('lat'), params.get('lng')
+    if lat is None or lng is None:
+        pickup = Load.objects.for_user(request.user).filter(id=params['loadId']).values('pickup_lat', 'pickup_lng').first()
+        if pickup is None:
+            return Response({'error': 'Load not found'}, status=status.HTTP_404_NOT_FOUND)
+        if pickup['pickup_lat'] is None or pickup['pickup_lng'] is None:
+            return Response({'error': 'Load has no pickup coordinates'}, status=status.HTTP_400_BAD_REQUEST)
+        lat, lng = float(pickup['pickup_lat']), float(pickup['pickup_lng'])
+    
+    if params['kind'] == 'terminals':
+        results = nearest_terminals(request.user, lat, lng, k=params['k'], radius_miles=params['radius'])
+    else:
+        results = nearest_trucks(
+            request.user, lat, lng, k=params['k'], radius_miles=params['radius'],
+            require_driver=params['requireDriver'], max_age=params.get('maxAgeMinutes'),
+        )
+    return Response({
+        'origin': {'lat': lat, 'lng': lng},
+        'radiusMiles': params['radius'],
+        'kind': params['kind'],
+        'results': results,
+    })
+
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def truck_positions(request):
+    """Record last-known positions for one or more trucks"""
+    max_items = getattr(settings, 'BULK_OPERATIONS', {}).get('MAX_ITEMS', 500)
+    serializer = TruckPositionSerializer(data=request.data, many=True, max_length=max_items)
+    if not serializer.is_valid():
+        return Response({
+            'error': 'Invalid positions',
+            'details': serializer.errors
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    positions = {}
+    for report in serializer.validated_data:
+        # Latest report wins when a truck appears more than once
+        current = positions.get(report['truckId'])
+        if current is None or report['recordedAt'] >= current[2]:
+            positions[report['truckId']] = (
+                Decimal(str(round(report['lat'], 8))), Decimal(str(round(report['lng'], 8))), report['recordedAt'],
+            )
+    updated = record_truck_positions(request.user, positions)
+    return Response({'updated': len(updated), 'truckIds': updated})
+
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def optimize(request):
+    """Proposed driver/truck assignments for a terminal's open loads; nothing is saved"""
+    serializer = OptimizeRequestSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response({
+            'error': 'Invalid request',
+            'details': serializer.errors
+        }, status=status.HTTP_400_BAD_REQUEST)
+    params = serializer.validated_data
+    
+    terminal = Terminal.objects.for_user(request.user).filter(id=params['terminalId']).first()
+    if terminal is None:
+        return Response({'error': 'Terminal not found'}, status=status.HTTP_404_NOT_FOUND)
+    return Response(propose_assignments(request.user, terminal, load_ids=params.get('loadIds')))
@@ -0,0 +1,24 @@
+from django.contrib import admin
+
+from .models import DocumentBlob, DocumentRendition, UploadSession
+
+
+@admin.register(DocumentBlob)
+class DocumentBlobAdmin(admin.ModelAdmin):
+    list_display = ['sha256', 'size', 'content_type', 'thumbnail_status', 'created_at']
+    search_fields = ['sha256']
+    list_filter = ['content_type', 'thumbnail_status']
+
+
+@admin.register(DocumentRendition)
+class DocumentRenditionAdmin(admin.ModelAdmin):
+    list_display = ['blob', 'format', 'width', 'height', 'quality', 'size', 'created_at']
+    search_fields = ['blob__sha256']
+    list_filter = ['format']
+
+
+@admin.register(UploadSession)
+class UploadSessionAdmin(admin.ModelAdmin):
+    list_display = ['filename', 'company', 'created_by', 'received', 'total_size', 'status', 'expires_at']
+    search_fields = ['filename']
+    list_filter = ['status']
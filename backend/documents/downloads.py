@@ -0,0 +1,161 @@
+"""
+Authorized document downloads
+
+The view checks the load or driver scope, then hands the transfer off as
+cheaply as the deployment allows:
+
+* ``DOCUMENTS['SENDFILE'] = 'nginx'``: an empty response with
+  ``X-Accel-Redirect`` to an internal nginx location (``SENDFILE_PREFIX``)
+  that serves ``SENDFILE_ROOT`` (``MEDIA_ROOT`` by default); nginx handles
+  Range.
+* ``'apache'``: ``X-Sendfile`` with the file's absolute path (mod_xsendfile,
+  or any server that understands the header).
+* Storages without local paths (S3 and other django-storages backends):
+  a redirect to the backend's URL, which is a short-lived signed URL when
+  the backend is configured for it.
+* Otherwise Django streams the file itself with single-range support
+  (``206 Partial Content``), so clients can resume and seek.
+
+Blobs are content-addressed, so their SHA-256 is a strong ETag: repeat
+requests get ``304 Not Modified`` and ``If-Range`` works for resuming.
+
+Only PDFs and raster images are shown inline. Any other type is sent as an
+``application/octet-stream`` attachment, and every file response carries
+``Content-Security-Policy: sandbox`` so an uploaded page can never run
+scripts on the API's origin.
+"""
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified, HttpResponseRedirect, StreamingHttpResponse
+from django.utils.http import content_disposition_header
+
+_options = getattr(settings, 'DOCUMENTS', {})
+SENDFILE = _options.get('SENDFILE', '')
+SENDFILE_PREFIX = _options.get('SENDFILE_PREFIX', '/protected-documents/')
+SENDFILE_ROOT = str(_options.get('SENDFILE_ROOT', settings.MEDIA_ROOT))
+DOWNLOAD_MAX_AGE = _options.get('DOWNLOAD_MAX_AGE', 3600)
+STREAM_BLOCK_SIZE = 64 * 1024
+
+RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+INLINE_CONTENT_TYPES = {'application/pdf', 'image/jpeg', 'image/png', 'image/gif', 'image/webp'}
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def parse_range(header, size):
+    """
+    (first, last) for a single ``Range: bytes=...`` header, or None to send
+    the whole file (no header, several ranges, or an unparseable value).
+    Raises RangeNotSatisfiable when the range lies outside the file.
+    """
+    match = RANGE.match((header or '').strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            raise RangeNotSatisfiable()
+        return max(0, size - length), size - 1
+    first = int(first)
+    last = min(int(last), size - 1) if last else size - 1
+    if first >= size or last < first:
+        raise RangeNotSatisfiable()
+    return first, last
+
+
+def _read_range(handle, first, last):
+    try:
+        handle.seek(first)
+        remaining = last - first + 1
+        while remaining > 0:
+            piece = handle.read(min(STREAM_BLOCK_SIZE, remaining))
+            if not piece:
+                break
+            remaining -= len(piece)
+            yield piece
+    finally:
+        handle.close()
+
+
+def _local_path(field_file):
+    try:
+        return field_file.storage.path(field_file.name)
+    except NotImplementedError:
+        return None
+
+
+def _accel_path(local_path):
+    """Internal nginx URI for a file under SENDFILE_ROOT, or None"""
+    relative = os.path.relpath(local_path, SENDFILE_ROOT)
+    if relative.startswith(os.pardir):
+        return None
+    return SENDFILE_PREFIX + quote(relative.replace(os.sep, '/'))
+
+
+def _finish(response, filename, content_type, etag, as_attachment):
+    if content_type not in INLINE_CONTENT_TYPES:
+        content_type, as_attachment = 'application/octet-stream', True
+    response['Content-Type'] = content_type
+    response['Content-Disposition'] = content_disposition_header(as_attachment, filename)
+    response['Content-Security-Policy'] = 'sandbox'
+    response['X-Content-Type-Options'] = 'nosniff'
+    response['Accept-Ranges'] = 'bytes'
+    response['Cache-Control'] = f'private, max-age={DOWNLOAD_MAX_AGE}'
+    if etag:
+        response['ETag'] = etag
+    return response
+
+
+def serve_file(request, field_file, filename, content_type, sha256=None, as_attachment=False):
+    """Response delivering ``field_file`` to an already authorized user"""
+    etag = f'"{sha256}"' if sha256 else None
+    if etag and etag in (request.headers.get('If-None-Match') or ''):
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        return response
+
+    local_path = _local_path(field_file)
+    if local_path is None:
+        # Remote storage serves the bytes (and ranges) itself
+        return HttpResponseRedirect(field_file.url)
+    accel_path = _accel_path(local_path) if SENDFILE == 'nginx' else None
+    if accel_path:
+        response = HttpResponse()
+        response['X-Accel-Redirect'] = accel_path
+        return _finish(response, filename, content_type, etag, as_attachment)
+    if SENDFILE == 'apache':
+        response = HttpResponse()
+        response['X-Sendfile'] = local_path
+        return _finish(response, filename, content_type, etag, as_attachment)
+
+    size = os.path.getsize(local_path)
+    if_range = request.headers.get('If-Range')
+    byte_range = None
+    if not if_range or (etag and if_range == etag):
+        try:
+            byte_range = parse_range(request.headers.get('Range'), size)
+        except RangeNotSatisfiable:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+    if byte_range is None or byte_range == (0, size - 1):
+        # Whole file; FileResponse can use the server's wsgi.file_wrapper
+        response = FileResponse(open(local_path, 'rb'))
+        response['Content-Length'] = size
+        return _finish(response, filename, content_type, etag, as_attachment)
+
+    first, last = byte_range
+    response = StreamingHttpResponse(_read_range(open(local_path, 'rb'), first, last), status=206)
+    response['Content-Length'] = last - first + 1
+    response['Content-Range'] = f'bytes {first}-{last}/{size}'
+    return _finish(response, filename, content_type, etag, as_attachment)
@@ -0,0 +1,173 @@
+"""
+Background image processing for image blobs
+
+Photos from drivers' phones are large (4-12 MB), so each image blob is
+decoded once by a small in-process thread pool after the upload's
+transaction commits, and turned into:
+
+* display renditions: the image scaled to fit each of
+  ``DOCUMENTS['RENDITION_SIZES']`` (never enlarged) and encoded in every
+  format of ``DOCUMENTS['RENDITION_QUALITY']`` (WebP and JPEG)
+* a small JPEG thumbnail
+
+Renditions are rotated upright and saved without EXIF (GPS position,
+device details), keeping only the ICC colour profile. JPEGs are decoded at
+reduced scale (``Image.draft``) and each size is resized from the next
+larger one, which keeps memory and CPU low. Pillow releases the GIL while
+decoding, resizing and encoding, so the threads run in parallel. Files
+are written before the database transaction and the previous ones are
+deleted only after it commits. Blobs still ``pending`` after a restart are
+picked up by ``python manage.py generate_thumbnails``.
+"""
+import io
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from .storage import delete_files
+
+_options = getattr(settings, 'DOCUMENTS', {})
+THUMBNAIL_SIZE = tuple(_options.get('THUMBNAIL_SIZE', (320, 320)))
+THUMBNAIL_QUALITY = _options.get('THUMBNAIL_QUALITY', 80)
+RENDITION_SIZES = tuple(sorted(_options.get('RENDITION_SIZES', (640, 1280, 2048)), reverse=True))
+RENDITION_QUALITY = _options.get('RENDITION_QUALITY', {'webp': 75, 'jpeg': 80})
+# Pillow format name and file extension per rendition format
+FORMATS = {'webp': ('WEBP', 'webp'), 'jpeg': ('JPEG', 'jpg')}
+
+logger = logging.getLogger(__name__)
+_executor = ThreadPoolExecutor(max_workers=_options.get('IMAGE_WORKERS', 2), thread_name_prefix='images')
+
+
+def _encode(image, format, quality):
+    """``image`` encoded as ``format``; only the ICC profile is carried over"""
+    buffer = io.BytesIO()
+    options = {'quality': quality}
+    if image.info.get('icc_profile'):
+        options['icc_profile'] = image.info['icc_profile']
+    if format == 'jpeg':
+        options.update(optimize=True, progressive=True)
+    else:
+        options['method'] = 4
+    # Drop EXIF, XMP and comments that Pillow would otherwise copy from the source
+    image.info = {}
+    image.save(buffer, FORMATS[format][0], **options)
+    return buffer.getvalue()
+
+
+def _upright(image):
+    """The decoded, upright RGB image, with only its ICC profile kept in ``info``"""
+    icc_profile = image.info.get('icc_profile')
+    image = ImageOps.exif_transpose(image)
+    if image.has_transparency_data:
+        # Flatten onto white; JPEG has no alpha and transparent areas would turn black
+        rgba = image.convert('RGBA')
+        image = Image.new('RGB', rgba.size, 'white')
+        image.paste(rgba, mask=rgba.getchannel('A'))
+    elif image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+    image.info = {'icc_profile': icc_profile} if icc_profile else {}
+    return image
+
+
+def render(handle):
+    """
+    Decode the image in ``handle`` once and encode its renditions.
+    Returns (original size, [(format, width, height, quality, bytes)], thumbnail bytes).
+    """
+    with Image.open(handle) as source:
+        original_size = source.size
+        longest = max(RENDITION_SIZES) if RENDITION_SIZES else max(THUMBNAIL_SIZE)
+        source.draft('RGB', (longest, longest))
+        image = _upright(source)
+
+    renditions = []
+    done = set()
+    # Largest first, each resized from the previous one
+    for bound in RENDITION_SIZES:
+        scaled = image.copy()
+        scaled.thumbnail((bound, bound), Image.Resampling.LANCZOS)
+        if scaled.size in done:
+            continue
+        done.add(scaled.size)
+        for format, quality in RENDITION_QUALITY.items():
+            renditions.append((format, *scaled.size, quality, _encode(scaled.copy(), format, quality)))
+        image = scaled
+
+    image.thumbnail(THUMBNAIL_SIZE, Image.Resampling.LANCZOS)
+    return original_size, renditions, _encode(image, 'jpeg', THUMBNAIL_QUALITY)
+
+
+def process_image(blob):
+    """Render and store ``blob``'s renditions and thumbnail and record its image size"""
+    from .models import DocumentRendition
+    try:
+        with blob.file.open('rb') as handle:
+            size, renditions, thumbnail = render(handle)
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError):
+        logger.warning('Could not process image blob %s', blob.sha256, exc_info=True)
+        blob.thumbnail_status = 'failed'
+        blob.save(update_fields=['thumbnail_status'])
+        return False
+
+    # New files are written first and removed again if the rows cannot be saved; the
+    # files they replace are deleted only once the new rows have committed
+    replaced = [rendition.file.name for rendition in blob.renditions.all()] + [blob.thumbnail.name]
+    written = []
+    try:
+        instances = []
+        for format, width, height, quality, data in renditions:
+            rendition = DocumentRendition(
+                blob=blob, format=format, width=width, height=height, quality=quality, size=len(data),
+            )
+            rendition.file.save(f'{blob.sha256}-{width}x{height}.{FORMATS[format][1]}', ContentFile(data), save=False)
+            written.append(rendition.file.name)
+            instances.append(rendition)
+        blob.thumbnail.save(f'{blob.sha256}.jpg', ContentFile(thumbnail), save=False)
+        written.append(blob.thumbnail.name)
+
+        with transaction.atomic(durable=True):
+            blob.renditions.all().delete()
+            DocumentRendition.objects.bulk_create(instances)
+            blob.width, blob.height = size
+            blob.thumbnail_status = 'ready'
+            blob.save(update_fields=['thumbnail', 'width', 'height', 'thumbnail_status'])
+            stale = [name for name in replaced if name not in written]
+            transaction.on_commit(lambda: delete_files(stale))
+    except Exception:
+        delete_files(written)
+        raise
+    return True
+
+
+def best_rendition(renditions, width=None, height=None):
+    """
+    The smallest rendition covering ``width`` x ``height`` (either may be
+    None), else the largest one; None when there are no renditions.
+    """
+    renditions = sorted(renditions, key=lambda rendition: rendition.width * rendition.height)
+    for rendition in renditions:
+        if rendition.width >= (width or 0) and rendition.height >= (height or 0):
+            return rendition
+    return renditions[-1] if renditions else None
+
+
+def _run(blob_id):
+    from .models import DocumentBlob
+    close_old_connections()
+    try:
+        blob = DocumentBlob.objects.filter(pk=blob_id, thumbnail_status='pending').first()
+        if blob is not None:
+            process_image(blob)
+    except Exception:
+        logger.exception('Image job for blob %s failed', blob_id)
+    finally:
+        close_old_connections()
+
+
+def schedule_image_processing(blob_id):
+    """Queue rendition and thumbnail generation once the current transaction commits"""
+    transaction.on_commit(lambda: _executor.submit(_run, blob_id))
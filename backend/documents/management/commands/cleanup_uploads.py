@@ -0,0 +1,18 @@
+"""
+Management command to expire abandoned uploads and delete unreferenced blobs
+"""
+from django.core.management.base import BaseCommand
+
+from documents.uploads import purge_expired_sessions, purge_orphan_blobs
+
+
+class Command(BaseCommand):
+    help = 'Abort expired upload sessions and delete blobs no document references'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--keep-hours', type=int, default=24, help='Keep unreferenced blobs younger than this')
+
+    def handle(self, *args, **options):
+        sessions = purge_expired_sessions()
+        blobs = purge_orphan_blobs(older_than_hours=options['keep_hours'])
+        self.stdout.write(self.style.SUCCESS(f'Aborted {sessions} upload sessions, deleted {blobs} blobs'))
@@ -0,0 +1,31 @@
+"""
+Management command to generate renditions and thumbnails for image blobs that do not have them
+"""
+from django.core.management.base import BaseCommand
+
+from documents.images import process_image
+from documents.models import DocumentBlob
+
+
+class Command(BaseCommand):
+    help = 'Generate pending (or, with --retry-failed, failed) document image renditions and thumbnails'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--retry-failed', action='store_true', help='Also retry blobs whose processing failed')
+        parser.add_argument(
+            '--missing-renditions', action='store_true',
+            help='Also reprocess ready images that have no renditions (e.g. processed before renditions existed)',
+        )
+
+    def handle(self, *args, **options):
+        statuses = ['pending', 'failed'] if options['retry_failed'] else ['pending']
+        blobs = DocumentBlob.objects.filter(thumbnail_status__in=statuses)
+        if options['missing_renditions']:
+            blobs |= DocumentBlob.objects.filter(thumbnail_status='ready', renditions__isnull=True)
+        ready = failed = 0
+        for blob in blobs.distinct().iterator(chunk_size=100):
+            if process_image(blob):
+                ready += 1
+            else:
+                failed += 1
+        self.stdout.write(self.style.SUCCESS(f'Processed {ready} images ({failed} failed)'))
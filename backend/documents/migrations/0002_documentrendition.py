@@ -0,0 +1,33 @@
+# Generated by Django 5.0.4 on 2026-10-19 18:14
+
+import django.db.models.deletion
+import documents.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentRendition',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('format', models.CharField(choices=[('webp', 'WebP'), ('jpeg', 'JPEG')], max_length=10)),
+                ('width', models.PositiveIntegerField()),
+                ('height', models.PositiveIntegerField()),
+                ('quality', models.PositiveSmallIntegerField()),
+                ('size', models.BigIntegerField()),
+                ('file', models.FileField(max_length=255, storage=documents.storage.document_storage, upload_to=documents.storage.rendition_upload_to)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('blob', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='renditions', to='documents.documentblob')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='documentrendition',
+            constraint=models.UniqueConstraint(fields=('blob', 'format', 'width'), name='rendition_blob_format_width_uniq'),
+        ),
+    ]
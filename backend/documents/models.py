@@ -0,0 +1,126 @@
+"""
+Content-addressed document storage and resumable upload sessions
+"""
+from django.conf import settings
+from django.db import models
+
+from companies.models import BaseModel, Company
+
+from .storage import blob_upload_to, document_storage, rendition_upload_to, thumbnail_upload_to
+
+THUMBNAIL_STATUS_CHOICES = [
+    ('pending', 'Pending'),
+    ('ready', 'Ready'),
+    ('failed', 'Failed'),
+    ('none', 'Not an image'),
+]
+
+RENDITION_FORMAT_CHOICES = [
+    ('webp', 'WebP'),
+    ('jpeg', 'JPEG'),
+]
+
+
+class DocumentBlob(models.Model):
+    """
+    File content stored once per SHA-256, in the ``documents`` storage.
+    Load and driver documents reference blobs, so identical uploads share one.
+    """
+    id = models.BigAutoField(primary_key=True)
+    sha256 = models.CharField(max_length=64, unique=True)
+    size = models.BigIntegerField()
+    content_type = models.CharField(max_length=100)
+    file = models.FileField(storage=document_storage, upload_to=blob_upload_to, max_length=255)
+    
+    # Image previews, generated in the background
+    width = models.PositiveIntegerField(null=True, blank=True)
+    height = models.PositiveIntegerField(null=True, blank=True)
+    thumbnail = models.FileField(storage=document_storage, upload_to=thumbnail_upload_to, max_length=255, blank=True)
+    thumbnail_status = models.CharField(max_length=10, choices=THUMBNAIL_STATUS_CHOICES, default='none')
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['thumbnail_status'], name='blob_thumbnail_status_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.sha256[:12]} ({self.size} bytes)"
+    
+    @property
+    def is_image(self):
+        return self.content_type.startswith('image/')
+
+
+class DocumentRendition(models.Model):
+    """
+    A resized, re-encoded copy of an image blob for display, with EXIF
+    removed. Each image gets one rendition per configured size and format.
+    """
+    id = models.BigAutoField(primary_key=True)
+    blob = models.ForeignKey(DocumentBlob, on_delete=models.CASCADE, related_name='renditions')
+    format = models.CharField(max_length=10, choices=RENDITION_FORMAT_CHOICES)
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+    quality = models.PositiveSmallIntegerField()
+    size = models.BigIntegerField()
+    file = models.FileField(storage=document_storage, upload_to=rendition_upload_to, max_length=255)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['blob', 'format', 'width'], name='rendition_blob_format_width_uniq'),
+        ]
+    
+    def __str__(self):
+        return f"{self.blob.sha256[:12]} {self.format} {self.width}x{self.height}"
+    
+    @property
+    def content_type(self):
+        return f'image/{self.format}'
+
+
+class UploadSession(BaseModel):
+    """
+    A chunked, resumable upload of one load or driver document. Chunks are
+    appended to a temporary file in ``DOCUMENTS['UPLOAD_DIR']``; the
+    finished file becomes (or reuses) a DocumentBlob.
+    """
+    company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name='+')
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='+')
+    
+    # Document to create when the upload completes
+    load = models.ForeignKey('loads.Load', on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    driver = models.ForeignKey('drivers.Driver', on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    document_type = models.CharField(max_length=50)
+    document_name = models.CharField(max_length=255)
+    notes = models.TextField(blank=True)
+    expiry_date = models.DateField(null=True, blank=True)
+    
+    filename = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=100)
+    total_size = models.BigIntegerField()
+    received = models.BigIntegerField(default=0)
+    status = models.CharField(max_length=10, choices=[
+        ('open', 'Open'),
+        ('complete', 'Complete'),
+        ('aborted', 'Aborted'),
+    ], default='open')
+    expires_at = models.DateTimeField()
+    
+    blob = models.ForeignKey(DocumentBlob, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    document_id = models.UUIDField(null=True, blank=True)
+    
+    SCOPE_LOOKUPS = {
+        'company': ('company',),
+    }
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'expires_at'], name='upload_status_expires_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.filename} ({self.received}/{self.total_size})"
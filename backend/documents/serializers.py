@@ -0,0 +1,82 @@
+"""
+Serializers for documents app
+"""
+from rest_framework import serializers
+
+from drivers.models import DriverDocument
+from loads.models import LoadDocument
+
+from .models import RENDITION_FORMAT_CHOICES, DocumentBlob, DocumentRendition, UploadSession
+from .uploads import MAX_CHUNK_SIZE, MAX_UPLOAD_SIZE
+
+
+class UploadSessionCreateSerializer(serializers.Serializer):
+    """Start a chunked upload of a load or driver document"""
+    loadId = serializers.UUIDField(required=False)
+    driverId = serializers.UUIDField(required=False)
+    documentType = serializers.CharField(max_length=50)
+    documentName = serializers.CharField(max_length=255, required=False, allow_blank=True)
+    filename = serializers.CharField(max_length=255)
+    contentType = serializers.CharField(max_length=100, required=False, allow_blank=True)
+    size = serializers.IntegerField(min_value=1, max_value=MAX_UPLOAD_SIZE)
+    notes = serializers.CharField(required=False, allow_blank=True)
+    expiryDate = serializers.DateField(required=False, allow_null=True)
+    
+    def validate(self, attrs):
+        if bool(attrs.get('loadId')) == bool(attrs.get('driverId')):
+            raise serializers.ValidationError('Provide exactly one of loadId or driverId')
+        model = LoadDocument if attrs.get('loadId') else DriverDocument
+        choices = dict(model._meta.get_field('document_type').choices)
+        if attrs['documentType'] not in choices:
+            raise serializers.ValidationError({
+                'documentType': [f"Must be one of: {', '.join(choices)}"],
+            })
+        return attrs
+
+
+class DocumentRenditionSerializer(serializers.ModelSerializer):
+    """A resized display copy of an image"""
+    
+    class Meta:
+        model = DocumentRendition
+        fields = ['format', 'width', 'height', 'quality', 'size']
+
+
+class DocumentBlobSerializer(serializers.ModelSerializer):
+    """Stored content of a document"""
+    contentType = serializers.CharField(source='content_type')
+    thumbnailStatus = serializers.CharField(source='thumbnail_status')
+    renditions = DocumentRenditionSerializer(many=True, read_only=True)
+    
+    class Meta:
+        model = DocumentBlob
+        fields = ['sha256', 'size', 'contentType', 'width', 'height', 'thumbnailStatus', 'renditions']
+
+
+class ImageQuerySerializer(serializers.Serializer):
+    """Display size wanted for an image document; ``type`` defaults to WebP when the client accepts it"""
+    width = serializers.IntegerField(min_value=1, max_value=10000, required=False)
+    height = serializers.IntegerField(min_value=1, max_value=10000, required=False)
+    type = serializers.ChoiceField(choices=RENDITION_FORMAT_CHOICES, required=False)
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    """Upload progress; ``received`` is the offset to resume from"""
+    loadId = serializers.UUIDField(source='load_id', read_only=True)
+    driverId = serializers.UUIDField(source='driver_id', read_only=True)
+    contentType = serializers.CharField(source='content_type', read_only=True)
+    size = serializers.IntegerField(source='total_size', read_only=True)
+    expiresAt = serializers.DateTimeField(source='expires_at', read_only=True)
+    maxChunkSize = serializers.SerializerMethodField()
+    documentId = serializers.UUIDField(source='document_id', read_only=True)
+    blob = DocumentBlobSerializer(read_only=True)
+    
+    def get_maxChunkSize(self, obj):
+        return MAX_CHUNK_SIZE
+    
+    class Meta:
+        model = UploadSession
+        fields = [
+            'id', 'loadId', 'driverId', 'filename', 'contentType', 'size', 'received', 'status',
+            'expiresAt', 'maxChunkSize', 'documentId', 'blob',
+        ]
@@ -0,0 +1,48 @@
+"""
+Storage backend and object naming for document blobs
+
+Blobs live in the storage alias ``DOCUMENTS['STORAGE']`` (``documents`` in
+``STORAGES``): the local filesystem by default, or any django-storages
+backend such as S3. Names are derived from the content hash, so the same
+content always maps to the same object.
+"""
+import os
+
+from django.conf import settings
+from django.core.files.storage import storages
+
+_options = getattr(settings, 'DOCUMENTS', {})
+
+
+def document_storage():
+    return storages[_options.get('STORAGE', 'documents')]
+
+
+def delete_files(names):
+    """Delete stored files by name, skipping empty names"""
+    storage = document_storage()
+    for name in names:
+        if name:
+            storage.delete(name)
+
+
+def _sharded(prefix, sha256, filename):
+    return f'{prefix}/{sha256[:2]}/{sha256[2:4]}/{filename}'
+
+
+def blob_upload_to(instance, filename):
+    return _sharded('blobs', instance.sha256, filename)
+
+
+def thumbnail_upload_to(instance, filename):
+    return _sharded('thumbnails', instance.sha256, filename)
+
+
+def rendition_upload_to(instance, filename):
+    return _sharded('renditions', instance.blob.sha256, filename)
+
+
+def blob_filename(sha256, original_name):
+    """Object file name for content ``sha256``, keeping the original extension"""
+    extension = os.path.splitext(original_name)[1].lower()[:10]
+    return f'{sha256}{extension}'
@@ -0,0 +1,161 @@
+"""
+Tests for chunked uploads, deduplication and downloads
+"""
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from companies.tests import make_company, make_load, make_user
+
+from . import uploads
+from .models import DocumentBlob, UploadSession
+from .storage import document_storage
+
+PDF = b'%PDF-1.4\n' + bytes(range(256)) * 40
+
+
+class UploadTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.terminal = make_company('ACME')
+        cls.user = make_user('admin', role='company_admin', company=cls.terminal.department.division.company)
+        cls.load = make_load('L1', cls.terminal)
+
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+        storages = override_settings(STORAGES={
+            'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+            'documents': {
+                'BACKEND': 'django.core.files.storage.FileSystemStorage',
+                'OPTIONS': {'location': os.path.join(self.media, 'documents')},
+            },
+        })
+        storages.enable()
+        self.addCleanup(storages.disable)
+        upload_dir = os.path.join(self.media, 'uploads')
+        os.makedirs(upload_dir)
+        patcher = mock.patch.object(uploads, 'UPLOAD_DIR', upload_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def open_session(self, data, filename='bol.pdf', content_type='application/pdf'):
+        response = self.client.post('/api/documents/uploads/', {
+            'loadId': str(self.load.pk), 'filename': filename, 'contentType': content_type,
+            'size': len(data), 'documentType': 'bol',
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        return response.data['id']
+
+    def put(self, session_id, data, first, last, total):
+        return self.client.put(
+            f'/api/documents/uploads/{session_id}/', data, content_type='application/octet-stream',
+            HTTP_CONTENT_RANGE=f'bytes {first}-{last}/{total}',
+        )
+
+    def upload(self, data, **kwargs):
+        session_id = self.open_session(data, **kwargs)
+        half = len(data) // 2
+        self.assertEqual(self.put(session_id, data[:half], 0, half - 1, len(data)).status_code, 200)
+        response = self.put(session_id, data[half:], half, len(data) - 1, len(data))
+        self.assertEqual(response.status_code, 201)
+        return response.data
+
+    def test_chunks_are_assembled_into_a_document(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            result = self.upload(PDF)
+        self.assertIsNotNone(result['documentId'])
+        blob = DocumentBlob.objects.get()
+        self.assertEqual((blob.size, blob.content_type), (len(PDF), 'application/pdf'))
+        with blob.file.open('rb') as handle:
+            self.assertEqual(handle.read(), PDF)
+        self.assertFalse(os.listdir(uploads.UPLOAD_DIR))
+
+    def test_identical_content_is_stored_once(self):
+        self.upload(PDF)
+        self.upload(PDF, filename='copy.pdf')
+        self.assertEqual(DocumentBlob.objects.count(), 1)
+        self.assertEqual(self.load.documents.count(), 2)
+
+    def test_chunk_must_start_at_received_offset(self):
+        session_id = self.open_session(PDF)
+        response = self.put(session_id, PDF[100:200], 100, 199, len(PDF))
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['received'], 0)
+
+    def test_cut_off_chunk_keeps_received_bytes_for_resume(self):
+        session_id = self.open_session(PDF)
+        response = self.put(session_id, PDF[:1000], 0, 1999, len(PDF))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['received'], 1000)
+        response = self.put(session_id, PDF[1000:], 1000, len(PDF) - 1, len(PDF))
+        self.assertEqual(response.status_code, 201)
+        with DocumentBlob.objects.get().file.open('rb') as handle:
+            self.assertEqual(handle.read(), PDF)
+
+    def test_repeating_the_last_chunk_finishes_a_failed_finalize(self):
+        session_id = self.open_session(PDF)
+        with mock.patch.object(uploads, '_create_document', side_effect=OSError('storage down')):
+            with self.assertRaises(OSError), self.assertLogs('django.request', 'ERROR'):
+                self.put(session_id, PDF, 0, len(PDF) - 1, len(PDF))
+        session = UploadSession.objects.get(pk=session_id)
+        self.assertEqual((session.status, session.received), ('open', len(PDF)))
+        response = self.put(session_id, PDF, 0, len(PDF) - 1, len(PDF))
+        self.assertEqual(response.status_code, 201)
+
+    def test_declared_content_type_is_not_trusted(self):
+        page = b'<html><script>alert(1)</script></html>'
+        result = self.upload(page, filename='bol.pdf', content_type='application/pdf')
+        self.assertEqual(DocumentBlob.objects.get().content_type, 'application/octet-stream')
+        response = self.client.get(f'/api/documents/load/{result["documentId"]}/download/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/octet-stream')
+        self.assertTrue(response['Content-Disposition'].startswith('attachment'))
+        self.assertEqual(response['Content-Security-Policy'], 'sandbox')
+
+    def test_pdf_is_served_inline(self):
+        result = self.upload(PDF)
+        response = self.client.get(f'/api/documents/load/{result["documentId"]}/download/')
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertTrue(response['Content-Disposition'].startswith('inline'))
+        self.assertEqual(b''.join(response.streaming_content), PDF)
+
+    def test_purge_deletes_only_unreferenced_blobs(self):
+        result = self.upload(PDF)
+        self.upload(PDF[:-1], filename='draft.pdf')
+        self.load.documents.exclude(pk=result['documentId']).delete()
+        DocumentBlob.objects.update(created_at=timezone.now() - timedelta(days=2))
+        orphan = DocumentBlob.objects.get(size=len(PDF) - 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(uploads.purge_orphan_blobs(), 1)
+        self.assertEqual(DocumentBlob.objects.get().size, len(PDF))
+        self.assertFalse(document_storage().exists(orphan.file.name))
+
+    def test_purged_content_is_stored_again_when_reused(self):
+        session_id = self.open_session(PDF)
+        stored = uploads.store_blob
+        # The blob is purged between being found and being locked by finalize
+        purged = []
+
+        def store_then_purge(path, filename):
+            blob, created = stored(path, filename)
+            if not purged:
+                purged.append(blob.pk)
+                DocumentBlob.objects.filter(pk=blob.pk).delete()
+            return blob, created
+
+        with mock.patch.object(uploads, 'store_blob', side_effect=store_then_purge):
+            response = self.put(session_id, PDF, 0, len(PDF) - 1, len(PDF))
+        self.assertEqual(response.status_code, 201)
+        blob = DocumentBlob.objects.get()
+        self.assertNotEqual(blob.pk, purged[0])
+        self.assertEqual(self.load.documents.get().blob_id, blob.pk)
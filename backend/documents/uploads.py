@@ -0,0 +1,343 @@
+"""
+Chunked, resumable document uploads with content-hash deduplication
+
+A client opens an ``UploadSession`` with the file's size, then PUTs the
+bytes in one or more chunks with ``Content-Range: bytes <first>-<last>/<total>``.
+Each chunk is copied from the request stream to a temporary file in fixed
+size pieces, so no upload is ever held in memory. After an interrupted
+transfer the client reads the session's ``received`` offset and continues
+from there. Chunks of one session are written one at a time under a lock
+on the temporary file; no database transaction is open while a chunk
+streams in.
+
+When the last byte arrives the file is hashed (again streaming) and stored
+in the documents storage under its SHA-256, unless a blob with that hash
+already exists, in which case the temporary file is dropped and the
+existing blob is reused. The load or driver document is then created
+pointing at the blob, and new images are queued for rendition, in a short
+transaction after the blob is stored. If that step fails, repeating the
+last chunk finishes the upload.
+"""
+import hashlib
+import mimetypes
+import os
+import re
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from drivers.models import DriverDocument
+from loads.models import LoadDocument
+
+from .models import DocumentBlob, UploadSession
+from .storage import blob_filename, delete_files
+from .images import schedule_image_processing
+
+_options = getattr(settings, 'DOCUMENTS', {})
+UPLOAD_DIR = _options.get('UPLOAD_DIR', 'uploads_tmp')
+MAX_UPLOAD_SIZE = _options.get('MAX_UPLOAD_SIZE', 200 * 1024 * 1024)
+MAX_CHUNK_SIZE = _options.get('MAX_CHUNK_SIZE', 16 * 1024 * 1024)
+SESSION_TTL_HOURS = _options.get('SESSION_TTL_HOURS', 24)
+COPY_BUFFER_SIZE = 1024 * 1024
+
+CONTENT_RANGE = re.compile(r'^bytes (\d+)-(\d+)/(\d+)$')
+# Leading bytes of the types documents are stored as; anything else is application/octet-stream
+SIGNATURES = (
+    (b'%PDF-', 'application/pdf'),
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (b'GIF87a', 'image/gif'),
+    (b'GIF89a', 'image/gif'),
+)
+
+
+class UploadError(Exception):
+    """A chunk that cannot be accepted; ``status`` is the HTTP status to answer with"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def temp_path(session):
+    return os.path.join(UPLOAD_DIR, f'{session.pk}.part')
+
+
+def parse_content_range(header):
+    """(first, last, total) from a ``Content-Range: bytes first-last/total`` header"""
+    match = CONTENT_RANGE.match(header or '')
+    if not match:
+        raise UploadError('Content-Range header must be "bytes <first>-<last>/<total>"')
+    first, last, total = (int(group) for group in match.groups())
+    if last < first:
+        raise UploadError('Content-Range end is before its start')
+    return first, last, total
+
+
+def open_session(user, company_id, filename, size, document_type, document_name, load=None, driver=None,
+                 content_type='', notes='', expiry_date=None):
+    """Start an upload and create its empty temporary file"""
+    session = UploadSession.objects.create(
+        company_id=company_id,
+        created_by=user,
+        load=load,
+        driver=driver,
+        document_type=document_type,
+        document_name=document_name or filename,
+        notes=notes,
+        expiry_date=expiry_date,
+        filename=filename,
+        content_type=content_type or mimetypes.guess_type(filename)[0] or 'application/octet-stream',
+        total_size=size,
+        expires_at=timezone.now() + timedelta(hours=SESSION_TTL_HOURS),
+    )
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    open(temp_path(session), 'wb').close()
+    return session
+
+
+def _copy(stream, handle, length):
+    """Copy exactly ``length`` bytes from ``stream``; returns the number copied"""
+    copied = 0
+    if stream is None:
+        # Empty request body
+        return copied
+    while copied < length:
+        piece = stream.read(min(COPY_BUFFER_SIZE, length - copied))
+        if not piece:
+            break
+        handle.write(piece)
+        copied += len(piece)
+    return copied
+
+
+def _lock(handle):
+    """Exclusive lock on the session's temporary file, so one chunk is written at a time"""
+    try:
+        import fcntl
+    except ImportError:
+        # Windows: lock the first byte instead; released when the handle closes
+        import msvcrt
+        try:
+            msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            raise UploadError('Another chunk of this upload is being written', status=409)
+        return
+    try:
+        fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        raise UploadError('Another chunk of this upload is being written', status=409)
+
+
+def _check_open(session, total, last):
+    if session.status != 'open' or session.expires_at <= timezone.now():
+        raise UploadError('Upload session is no longer open', status=409)
+    if total != session.total_size or last >= total:
+        raise UploadError(f'Content-Range total must be {session.total_size}', status=416)
+
+
+def write_chunk(session_id, stream, content_range):
+    """
+    Append one chunk to the session's file. Returns the session, finalized
+    (with ``document_id`` set) when the chunk completed the upload.
+
+    No database transaction or row lock is held while the body streams in:
+    a file lock serializes chunks of one session, and ``received`` only
+    advances through an UPDATE conditional on the offset the chunk started at.
+    """
+    first, last, total = parse_content_range(content_range)
+    length = last - first + 1
+    if length > MAX_CHUNK_SIZE:
+        raise UploadError(f'Chunks are limited to {MAX_CHUNK_SIZE} bytes', status=413)
+
+    session = UploadSession.objects.get(pk=session_id)
+    _check_open(session, total, last)
+    try:
+        handle = open(temp_path(session), 'r+b')
+    except FileNotFoundError:
+        raise UploadError('Upload session is no longer open', status=409)
+    with handle:
+        _lock(handle)
+        session.refresh_from_db()
+        _check_open(session, total, last)
+        if session.received == session.total_size:
+            # Every byte arrived earlier but storing the file failed; finish it now
+            finalize(session)
+            return session
+        if first != session.received:
+            # Resume from the offset the server has, not the one the client assumed
+            raise UploadError(f'Expected a chunk starting at byte {session.received}', status=409)
+
+        handle.seek(first)
+        copied = _copy(stream, handle, length)
+        handle.truncate(first + copied)
+        handle.flush()
+
+        # Keep what arrived of a cut-off chunk so the client can resume from there
+        advanced = UploadSession.objects.filter(pk=session.pk, status='open', received=first).update(
+            received=first + copied, updated_at=timezone.now(),
+        )
+        if not advanced:
+            raise UploadError('Upload session is no longer open', status=409)
+        session.received = first + copied
+        if session.received == session.total_size:
+            finalize(session)
+    if copied != length:
+        raise UploadError(f'Chunk ended after {copied} of {length} bytes; resume at byte {session.received}')
+    return session
+
+
+def _hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for piece in iter(lambda: handle.read(COPY_BUFFER_SIZE), b''):
+            digest.update(piece)
+    return digest.hexdigest()
+
+
+def detect_content_type(path):
+    """
+    Content type from the file's leading bytes. The type the client declared
+    is never trusted, since it decides how browsers render the download.
+    """
+    with open(path, 'rb') as handle:
+        head = handle.read(16)
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'image/webp'
+    for signature, content_type in SIGNATURES:
+        if head.startswith(signature):
+            return content_type
+    return 'application/octet-stream'
+
+
+def store_blob(path, filename):
+    """The DocumentBlob for the file at ``path``, storing it only if its content is new"""
+    sha256 = _hash_file(path)
+    blob = DocumentBlob.objects.filter(sha256=sha256).first()
+    if blob is not None:
+        return blob, False
+
+    blob = DocumentBlob(sha256=sha256, size=os.path.getsize(path), content_type=detect_content_type(path))
+    if blob.is_image:
+        blob.thumbnail_status = 'pending'
+    with open(path, 'rb') as handle:
+        content = File(handle)
+        # Object storages record this instead of guessing from the file name
+        content.content_type = blob.content_type
+        # Storage backends copy from the handle in chunks
+        blob.file.save(blob_filename(sha256, filename), content, save=False)
+    try:
+        with transaction.atomic():
+            blob.save()
+    except IntegrityError:
+        # The same content was stored concurrently; keep that copy
+        blob.file.delete(save=False)
+        return DocumentBlob.objects.get(sha256=sha256), False
+    return blob, True
+
+
+def _create_document(session, blob):
+    if session.load_id:
+        document = LoadDocument.objects.create(
+            load_id=session.load_id,
+            document_type=session.document_type,
+            document_name=session.document_name,
+            blob=blob,
+            uploaded_by=session.created_by.email or str(session.created_by_id),
+            notes=session.notes,
+        )
+    else:
+        document = DriverDocument.objects.create(
+            driver_id=session.driver_id,
+            document_type=session.document_type,
+            document_name=session.document_name,
+            blob=blob,
+            expiry_date=session.expiry_date,
+        )
+    return document
+
+
+def finalize(session):
+    """Turn a fully received session into a blob and a load or driver document"""
+    path = temp_path(session)
+    while True:
+        # Hashing and copying to storage happen before any transaction is opened
+        blob, created = store_blob(path, session.filename)
+        with transaction.atomic():
+            # Locked so purge_orphan_blobs cannot delete a reused blob before the document points at it
+            if not DocumentBlob.objects.select_for_update().filter(pk=blob.pk).exists():
+                # Purged since store_blob found it; store the content again
+                continue
+            status = UploadSession.objects.select_for_update().values_list('status', flat=True).get(pk=session.pk)
+            if status != 'open':
+                raise UploadError('Upload session is no longer open', status=409)
+            document = _create_document(session, blob)
+            session.blob = blob
+            session.document_id = document.pk
+            session.status = 'complete'
+            session.save(update_fields=['blob', 'document_id', 'status', 'updated_at'])
+            if created and blob.thumbnail_status == 'pending':
+                schedule_image_processing(blob.pk)
+            transaction.on_commit(lambda: _remove(path))
+            return document
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def abort_session(session):
+    session.status = 'aborted'
+    session.save(update_fields=['status', 'updated_at'])
+    _remove(temp_path(session))
+
+
+def purge_expired_sessions(now=None):
+    """Abort open sessions past their expiry and delete their temporary files; returns the count"""
+    now = now or timezone.now()
+    expired = list(UploadSession.objects.filter(status='open', expires_at__lte=now))
+    for session in expired:
+        abort_session(session)
+    return len(expired)
+
+
+def _referenced(blob_id):
+    return (
+        LoadDocument.objects.filter(blob_id=blob_id).exists()
+        or DriverDocument.objects.filter(blob_id=blob_id).exists()
+    )
+
+
+def purge_orphan_blobs(older_than_hours=24):
+    """
+    Delete blobs no document references any more; returns the count.
+
+    Each candidate is locked and checked again before it is deleted, and
+    ``finalize`` locks a blob before pointing a document at it, so an upload
+    reusing the same content either keeps the blob or stores it anew. Files
+    are removed once the deletion has committed.
+    """
+    cutoff = timezone.now() - timedelta(hours=older_than_hours)
+    referenced_by_loads = LoadDocument.objects.filter(blob__isnull=False).values('blob_id')
+    referenced_by_drivers = DriverDocument.objects.filter(blob__isnull=False).values('blob_id')
+    candidates = list(DocumentBlob.objects.filter(created_at__lt=cutoff).exclude(
+        id__in=referenced_by_loads,
+    ).exclude(id__in=referenced_by_drivers).values_list('id', flat=True))
+    count = 0
+    for blob_id in candidates:
+        with transaction.atomic():
+            blob = DocumentBlob.objects.select_for_update().filter(pk=blob_id).first()
+            if blob is None or _referenced(blob_id):
+                continue
+            names = [rendition.file.name for rendition in blob.renditions.all()]
+            names += [blob.thumbnail.name, blob.file.name]
+            blob.delete()
+            transaction.on_commit(lambda names=names: delete_files(names))
+        count += 1
+    return count
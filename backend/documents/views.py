@@ -0,0 +1,205 @@
+"""
+API views for documents app
+"""
+import mimetypes
+import os
+
+from django.http import Http404
+from rest_framework import permissions, status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import NotAcceptable
+from rest_framework.negotiation import DefaultContentNegotiation
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from drivers.models import Driver, DriverDocument
+from loads.models import Load, LoadDocument
+
+from .downloads import serve_file
+from .images import FORMATS, best_rendition
+from .models import UploadSession
+from .serializers import ImageQuerySerializer, UploadSessionCreateSerializer, UploadSessionSerializer
+from .uploads import UploadError, abort_session, open_session, write_chunk
+
+
+DOCUMENT_MODELS = {'load': LoadDocument, 'driver': DriverDocument}
+
+
+def _user_document(user, kind, pk):
+    """The load or driver document ``pk`` if it is in the user's scope"""
+    model = DOCUMENT_MODELS.get(kind)
+    if model is None:
+        return None
+    return model.objects.for_user(user).select_related('blob').filter(pk=pk).first()
+
+
+def _download_name(document, stored_name):
+    extension = os.path.splitext(stored_name)[1]
+    name = document.document_name
+    return name if name.lower().endswith(extension.lower()) else f'{name}{extension}'
+
+
+def _user_sessions(user):
+    return UploadSession.objects.for_user(user).filter(created_by=user)
+
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def upload_sessions(request):
+    """Start a chunked upload for a load or driver document"""
+    serializer = UploadSessionCreateSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response({
+            'error': 'Invalid upload',
+            'details': serializer.errors
+        }, status=status.HTTP_400_BAD_REQUEST)
+    data = serializer.validated_data
+    
+    load = driver = None
+    if data.get('loadId'):
+        load = Load.objects.for_user(request.user).filter(id=data['loadId']).first()
+        if load is None:
+            return Response({'error': 'Load not found'}, status=status.HTTP_404_NOT_FOUND)
+        company_id = load.company_id
+    else:
+        driver = Driver.objects.for_user(request.user).filter(id=data['driverId']).first()
+        if driver is None:
+            return Response({'error': 'Driver not found'}, status=status.HTTP_404_NOT_FOUND)
+        company_id = driver.company_id
+    
+    session = open_session(
+        request.user, company_id, data['filename'], data['size'], data['documentType'], data.get('documentName'),
+        load=load, driver=driver, content_type=data.get('contentType', ''), notes=data.get('notes', ''),
+        expiry_date=data.get('expiryDate'),
+    )
+    return Response(UploadSessionSerializer(session).data, status=status.HTTP_201_CREATED)
+
+
+@api_view(['GET', 'PUT', 'DELETE'])
+@permission_classes([permissions.IsAuthenticated])
+def upload_session(request, pk):
+    """
+    GET: progress (``received`` is the offset to resume from).
+    PUT: the next chunk as the raw body with a Content-Range header.
+    DELETE: abandon the upload.
+    """
+    session = _user_sessions(request.user).filter(pk=pk).first()
+    if session is None:
+        return Response({'error': 'Upload not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    if request.method == 'GET':
+        return Response(UploadSessionSerializer(session).data)
+    
+    if request.method == 'DELETE':
+        if session.status == 'open':
+            abort_session(session)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+    
+    try:
+        # The body is read from the stream in pieces; request.data is never parsed
+        session = write_chunk(session.pk, request.stream, request.headers.get('Content-Range'))
+    except UploadError as e:
+        session.refresh_from_db()
+        return Response({
+            'error': str(e),
+            'received': session.received,
+        }, status=e.status)
+    
+    response_status = status.HTTP_201_CREATED if session.status == 'complete' else status.HTTP_200_OK
+    return Response(UploadSessionSerializer(session).data, status=response_status)
+
+
+class FileContentNegotiation(DefaultContentNegotiation):
+    """
+    File views answer whatever the client accepts (image tags send
+    ``Accept: image/*``); their JSON errors fall back to the first renderer
+    instead of a 406.
+    """
+    
+    def select_renderer(self, request, renderers, format_suffix=None):
+        try:
+            return super().select_renderer(request, renderers, format_suffix)
+        except (NotAcceptable, Http404):
+            return renderers[0], renderers[0].media_type
+
+
+class DocumentFileView(APIView):
+    """Base for views that send a load or driver document's bytes"""
+    permission_classes = [permissions.IsAuthenticated]
+    content_negotiation_class = FileContentNegotiation
+    
+    def get(self, request, kind, pk):
+        document = _user_document(request.user, kind, pk)
+        if document is None:
+            return Response({'error': 'Document not found'}, status=status.HTTP_404_NOT_FOUND)
+        return self.serve(request, document)
+
+
+class DocumentDownloadView(DocumentFileView):
+    """Download a load or driver document; supports Range and conditional requests"""
+    
+    def serve(self, request, document):
+        as_attachment = request.query_params.get('download') in ('1', 'true')
+        blob = document.blob
+        if blob is not None:
+            return serve_file(
+                request, blob.file, _download_name(document, blob.file.name), blob.content_type,
+                sha256=blob.sha256, as_attachment=as_attachment,
+            )
+        if not document.file_path:
+            return Response({'error': 'Document has no file'}, status=status.HTTP_404_NOT_FOUND)
+        # Files uploaded before content-addressed storage
+        content_type = mimetypes.guess_type(document.file_path.name)[0] or 'application/octet-stream'
+        return serve_file(
+            request, document.file_path, _download_name(document, document.file_path.name), content_type,
+            as_attachment=as_attachment,
+        )
+
+
+class DocumentThumbnailView(DocumentFileView):
+    """JPEG thumbnail of an image document"""
+    
+    def serve(self, request, document):
+        blob = document.blob
+        if blob is None or blob.thumbnail_status != 'ready':
+            return Response({'error': 'Thumbnail not available'}, status=status.HTTP_404_NOT_FOUND)
+        return serve_file(
+            request, blob.thumbnail, f'{document.document_name}-thumbnail.jpg', 'image/jpeg',
+            sha256=f'{blob.sha256}-thumbnail',
+        )
+
+
+class DocumentImageView(DocumentFileView):
+    """Smallest rendition of an image document covering ``width`` x ``height``"""
+    
+    def serve(self, request, document):
+        serializer = ImageQuerySerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return Response({
+                'error': 'Invalid query',
+                'details': serializer.errors
+            }, status=status.HTTP_400_BAD_REQUEST)
+        params = serializer.validated_data
+        blob = document.blob
+        if blob is None or not blob.is_image:
+            return Response({'error': 'Document is not an image'}, status=status.HTTP_404_NOT_FOUND)
+        
+        accepts_webp = 'image/webp' in request.headers.get('Accept', '')
+        image_type = params.get('type') or ('webp' if accepts_webp else 'jpeg')
+        renditions = list(blob.renditions.all())
+        size = params.get('width'), params.get('height')
+        rendition = (
+            best_rendition([rendition for rendition in renditions if rendition.format == image_type], *size)
+            or best_rendition(renditions, *size)
+        )
+        if rendition is None:
+            # Not processed yet (or the image could not be decoded): send the original
+            return serve_file(
+                request, blob.file, _download_name(document, blob.file.name), blob.content_type,
+                sha256=blob.sha256,
+            )
+        name = f'{os.path.splitext(document.document_name)[0]}-{rendition.width}x{rendition.height}'
+        return serve_file(
+            request, rendition.file, f'{name}.{FORMATS[rendition.format][1]}', rendition.content_type,
+            sha256=f'{blob.sha256}-{rendition.format}-{rendition.width}',
+        )
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.4 on 2026-10-19 17:35
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0003_alter_customuser_managers'),
+        ('drivers', '0005_add_driver_tier'),
+        ('vehicles', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='driver',
+            index=models.Index(fields=['company', 'last_name', 'first_name'], name='driver_company_name_idx'),
+        ),
+    ]
@@ -75,9 +75,19 @@ class Driver(BaseModel):
         ('division', 'Division'),
         ('company', 'Company'),    ], default='read_only')
     
+    SCOPE_LOOKUPS = {
+        'company': ('company',),
+        'division': ('division',),
+        'department': ('department',),
+        'terminal': ('home_terminal',),
+    }
+    
     class Meta:
         unique_together = ['company', 'license_number']
         ordering = ['last_name', 'first_name']
+        indexes = [
+            models.Index(fields=['company', 'last_name', 'first_name'], name='driver_company_name_idx'),
+        ]
     
     def __str__(self):
         return f"{self.first_name} {self.last_name} ({self.license_number})"
@@ -142,9 +152,18 @@ class DriverDocument(BaseModel):
         ('other', 'Other'),
     ])
     document_name = models.CharField(max_length=255)
-    file_path = models.FileField(upload_to='driver_documents/')
+    file_path = models.FileField(upload_to='driver_documents/', blank=True)
+    # Content-addressed file from the documents upload pipeline (replaces file_path)
+    blob = models.ForeignKey('documents.DocumentBlob', on_delete=models.PROTECT, null=True, blank=True, related_name='+')
     expiry_date = models.DateField(null=True, blank=True)
     is_active = models.BooleanField(default=True)
     
+    SCOPE_LOOKUPS = {
+        'company': ('driver__company',),
+        'division': ('driver__division',),
+        'department': ('driver__department',),
+        'terminal': ('driver__home_terminal',),
+    }
+    
     def __str__(self):
         return f"{self.driver.full_name} - {self.document_name}"
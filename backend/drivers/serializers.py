@@ -1,6 +1,7 @@
 """
 Serializers for drivers app
 """
+from django.urls import reverse
 from rest_framework import serializers
 from .models import Driver, DriverDocument
 
@@ -75,11 +76,16 @@ class DriverSerializer(serializers.ModelSerializer):
 class DriverDocumentSerializer(serializers.ModelSerializer):
     """Serializer for DriverDocument model"""
     
+    downloadUrl = serializers.SerializerMethodField()
+    
     class Meta:
         model = DriverDocument
         fields = [
             'id', 'driver', 'document_type', 'document_name',
             'file_path', 'expiry_date', 'is_active',
-            'created_at', 'updated_at'
+            'created_at', 'updated_at', 'downloadUrl'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
+    
+    def get_downloadUrl(self, obj):
+        return reverse('document_download', kwargs={'kind': 'driver', 'pk': obj.pk})
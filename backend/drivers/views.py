@@ -2,20 +2,15 @@
 API views for drivers app
 """
 from rest_framework import viewsets, permissions
+from companies.permissions import HasTMSPermission, write_permissions
+from companies.scoping import ScopedQuerysetMixin
 from .models import Driver
 from .serializers import DriverSerializer
 
 
-class DriverViewSet(viewsets.ModelViewSet):
+class DriverViewSet(ScopedQuerysetMixin, viewsets.ModelViewSet):
     """ViewSet for managing drivers"""
     queryset = Driver.objects.all()
     serializer_class = DriverSerializer
-    permission_classes = [permissions.AllowAny]  # Temporarily allow unauthenticated access for testing
-    
-    def get_queryset(self):
-        """Return all drivers for now (no company filtering during testing)"""
-        return Driver.objects.all()
-    
-    def perform_create(self, serializer):
-        """Save driver without company requirement for now"""
-        serializer.save()
+    permission_classes = [permissions.IsAuthenticated, HasTMSPermission]
+    required_permissions = write_permissions('manage_drivers', 'manage_department_drivers')
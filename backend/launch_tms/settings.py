@@ -38,6 +38,7 @@ DJANGO_APPS = [
 THIRD_PARTY_APPS = [
     'rest_framework',
     'rest_framework_simplejwt',
+    'rest_framework_simplejwt.token_blacklist',
     'corsheaders',
     'drf_spectacular',
 ]
@@ -47,6 +48,9 @@ LOCAL_APPS = [
     'drivers', 
     'vehicles',
     'loads',
+    'dispatch',
+    'reports',
+    'documents',
     'api',
 ]
 
@@ -54,6 +58,8 @@ INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
+    'api.middleware.MetricsMiddleware',
+    'api.middleware.RequestProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware', 
     'django.middleware.common.CommonMiddleware',
@@ -90,6 +96,23 @@ DATABASES = {
     )
 }
 
+# Cache (local memory by default, Redis when REDIS_URL is set; requires the redis package)
+REDIS_URL = config('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'launch-tms',
+        }
+    }
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -107,6 +130,21 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Password hashing
+# Existing hashes are re-encoded at the configured cost on the next successful login
+PASSWORD_HASHING = {
+    'PBKDF2_ITERATIONS': config('PASSWORD_PBKDF2_ITERATIONS', default=720000, cast=int),
+}
+
+PASSWORD_HASHERS = [
+    'companies.hashers.TunedPBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.0/topics/i18n/
 
@@ -129,6 +167,20 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = 'media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# File storages. Document blobs use the "documents" alias: local disk by default, or a
+# django-storages backend (e.g. storages.backends.s3.S3Storage, configured via its AWS_* settings).
+DOCUMENTS_STORAGE_BACKEND = config('DOCUMENTS_STORAGE_BACKEND', default='')
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    'documents': (
+        {'BACKEND': DOCUMENTS_STORAGE_BACKEND} if DOCUMENTS_STORAGE_BACKEND else {
+            'BACKEND': 'django.core.files.storage.FileSystemStorage',
+            'OPTIONS': {'location': str(MEDIA_ROOT / 'documents')},
+        }
+    ),
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
@@ -137,7 +189,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Django REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'companies.authentication.ClaimsJWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
@@ -146,6 +198,109 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 50,
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_THROTTLE_CLASSES': [
+        'api.throttling.CompanyRateThrottle',
+        'api.throttling.UserRateThrottle',
+        'api.throttling.IPRateThrottle',
+    ],
+}
+
+# Token-bucket throttling (see api/throttling.py). Rates are per budget and key:
+# 'company' is shared by all of a company's users, 'user' per user, 'ip' per anonymous client.
+# A bucket refills at its rate and holds up to its burst size (a whole period's allowance if unset).
+THROTTLING = {
+    'ENABLED': config('THROTTLING_ENABLED', default=True, cast=bool),
+    'CACHE': 'default',
+    'RATES': {
+        'read': {'company': '6000/min', 'user': '600/min', 'ip': '300/min'},
+        'write': {'company': '2400/min', 'user': '240/min', 'ip': '300/min'},
+        'export': {'company': '30/hour', 'user': '10/hour', 'ip': None},
+        'bulk': {'company': '120/min', 'user': '30/min', 'ip': None},
+        # Credential endpoints (login, password reset), per client IP and per submitted email
+        'login': {'ip': config('THROTTLE_LOGIN_IP_RATE', default='20/min'), 'account': '5/min'},
+    },
+    'BURSTS': {
+        'read': {'company': 1000, 'user': 100, 'ip': 50},
+        'write': {'company': 400, 'user': 40, 'ip': 50},
+        'export': {'company': 10, 'user': 5},
+        'bulk': {'company': 20, 'user': 5},
+        'login': {'ip': 10, 'account': 5},
+    },
+}
+
+# Batch mutation endpoints (loads bulk-assign/bulk-status, load-events bulk-resolve)
+BULK_OPERATIONS = {
+    'MAX_ITEMS': config('BULK_MAX_ITEMS', default=500, cast=int),
+}
+
+# Distance / transit-time estimation (dispatch.routing). No external routing service:
+# road miles = great-circle miles x ROAD_FACTOR; transit adds REST_HOURS per full driving shift.
+ROUTING = {
+    'ROAD_FACTOR': config('ROUTING_ROAD_FACTOR', default=1.18, cast=float),
+    'AVERAGE_SPEED_MPH': config('ROUTING_AVERAGE_SPEED_MPH', default=50, cast=int),
+    'DRIVING_HOURS_PER_SHIFT': 11,
+    'REST_HOURS': 10,
+    'LANE_CACHE_SIZE': config('ROUTING_LANE_CACHE_SIZE', default=50000, cast=int),
+    'CENTROID_CACHE_SIZE': 20000,
+}
+
+# Assignment proposals (dispatch.optimizer). Costs are in deadhead miles; each hour a unit would
+# arrive after the scheduled pickup adds LATE_PENALTY_PER_HOUR.
+DISPATCH_OPTIMIZER = {
+    'MAX_DEADHEAD_MILES': config('OPTIMIZER_MAX_DEADHEAD_MILES', default=500, cast=int),
+    'LATE_PENALTY_PER_HOUR': 50,
+    'MAX_LATE_HOURS': 4,
+    'HAZMAT_TIERS': ('tier_3', 'tier_4'),
+    'MAX_PROBLEM_SIZE': 2000,
+}
+
+# Aggregated reports (reports app). Today's reports are cached briefly, past days longer.
+REPORTS = {
+    'CACHE': 'default',
+    'TODAY_TTL': config('REPORTS_TODAY_TTL', default=60, cast=int),
+    'PAST_TTL': config('REPORTS_PAST_TTL', default=3600, cast=int),
+    'EXPIRY_WINDOW_DAYS': 30,
+    # Resolution SLA per incident severity
+    'INCIDENT_SLA_HOURS': {'critical': 4, 'high': 24, 'medium': 72, 'low': 168},
+}
+
+# Columnar analytics export (`python manage.py export_analytics`, GET /api/reports/export/<table>/)
+ANALYTICS_EXPORT = {
+    'DIRECTORY': config('ANALYTICS_EXPORT_DIR', default=str(BASE_DIR / 'analytics_export')),
+    'CHUNK_SIZE': config('ANALYTICS_EXPORT_CHUNK_SIZE', default=5000, cast=int),
+    'COMPRESSION': 'zstd',
+    'WATERMARK_OVERLAP_SECONDS': 300,
+}
+
+# Predicted maintenance (`python manage.py predict_maintenance`, run nightly)
+MAINTENANCE_PREDICTION = {
+    'DEFAULT_INTERVAL_MILES': config('MAINTENANCE_INTERVAL_MILES', default=25000, cast=int),
+    'DEFAULT_INTERVAL_DAYS': config('MAINTENANCE_INTERVAL_DAYS', default=180, cast=int),
+    'ACCRUAL_WINDOW_DAYS': 90,
+    'BATCH_SIZE': 500,
+}
+
+# Document uploads (documents app). Chunks are written to UPLOAD_DIR, which must be local disk
+# shared by all workers; finished files are hashed and stored once per content in STORAGE.
+DOCUMENTS = {
+    'STORAGE': 'documents',
+    'UPLOAD_DIR': config('DOCUMENTS_UPLOAD_DIR', default=str(BASE_DIR / 'uploads_tmp')),
+    'MAX_UPLOAD_SIZE': config('DOCUMENTS_MAX_UPLOAD_SIZE', default=200 * 1024 * 1024, cast=int),
+    'MAX_CHUNK_SIZE': 16 * 1024 * 1024,
+    'SESSION_TTL_HOURS': 24,
+    'THUMBNAIL_SIZE': (320, 320),
+    # Image renditions: longest edge in pixels, and encoder quality per format
+    'RENDITION_SIZES': (640, 1280, 2048),
+    'RENDITION_QUALITY': {
+        'webp': config('DOCUMENTS_WEBP_QUALITY', default=75, cast=int),
+        'jpeg': config('DOCUMENTS_JPEG_QUALITY', default=80, cast=int),
+    },
+    'IMAGE_WORKERS': config('DOCUMENTS_IMAGE_WORKERS', default=2, cast=int),
+    # '' streams through Django; 'nginx' (X-Accel-Redirect) or 'apache' (X-Sendfile) hand off to the web server
+    'SENDFILE': config('DOCUMENTS_SENDFILE', default=''),
+    'SENDFILE_PREFIX': config('DOCUMENTS_SENDFILE_PREFIX', default='/protected-documents/'),
+    'SENDFILE_ROOT': config('DOCUMENTS_SENDFILE_ROOT', default=str(MEDIA_ROOT)),
+    'DOWNLOAD_MAX_AGE': 3600,
 }
 
 # JWT Settings
@@ -155,6 +310,25 @@ SIMPLE_JWT = {
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
     'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': True,
+    'TOKEN_REFRESH_SERIALIZER': 'companies.revocation.CachedRevocationTokenRefreshSerializer',
+}
+
+# Revoked refresh token JTIs are mirrored into this cache so refresh rarely needs a blacklist query.
+# The cache must be shared by all processes (REDIS_URL); cache misses fall back to the blacklist.
+# Prune expired tokens on a schedule with `python manage.py prune_tokens`.
+TOKEN_REVOCATION = {
+    'CACHE': 'default',
+    'KEY_PREFIX': 'revoked-jti',
+    'WARM_TTL': 3600,
+    # How long a token checked as not revoked is trusted without asking the blacklist
+    'NOT_REVOKED_TTL': 300,
+}
+
+# Per-process cache of user role/organization scope used by JWT authentication.
+# Entries are dropped when the user is saved; TTL bounds staleness across processes.
+USER_SCOPE_CACHE = {
+    'MAX_SIZE': config('USER_SCOPE_CACHE_SIZE', default=10000, cast=int),
+    'TTL_SECONDS': config('USER_SCOPE_CACHE_TTL', default=60, cast=int),
 }
 
 # CORS settings
@@ -173,6 +347,40 @@ SPECTACULAR_SETTINGS = {
     'SERVE_INCLUDE_SCHEMA': False,
 }
 
+# Request profiling (off by default)
+# Profiled requests get a Server-Timing header and a structured log line on
+# the 'api.profiling' logger. A request is profiled when it sends the header
+# (with HEADER_TOKEN as its value, if set) or is picked by SAMPLE_RATE.
+REQUEST_PROFILING = {
+    'ENABLED': config('REQUEST_PROFILING_ENABLED', default=False, cast=bool),
+    'HEADER': 'X-Profile-Request',
+    'HEADER_TOKEN': config('REQUEST_PROFILING_TOKEN', default=''),
+    'SAMPLE_RATE': config('REQUEST_PROFILING_SAMPLE_RATE', default=0.0, cast=float),
+    'SLOW_REQUEST_MS': config('REQUEST_PROFILING_SLOW_MS', default=500, cast=int),
+    'PROFILE_DIR': config('REQUEST_PROFILING_DIR', default=''),
+    'PROFILER': config('REQUEST_PROFILING_PROFILER', default='cprofile'),  # or 'pyinstrument'
+}
+
+# Metrics endpoint (/api/metrics)
+METRICS = {
+    # Scrapers must send "Authorization: Bearer <token>"; when unset only staff sessions can read metrics
+    'TOKEN': config('METRICS_TOKEN', default=''),
+    # How long domain gauges and connection stats are cached between scrapes
+    'GAUGE_CACHE_SECONDS': config('METRICS_GAUGE_CACHE_SECONDS', default=30, cast=int),
+}
+
+# Readiness checks (/api/health/ready/)
+HEALTH_CHECKS = {
+    # Probe results are reused for this long
+    'CACHE_SECONDS': config('HEALTH_CHECK_CACHE_SECONDS', default=5, cast=int),
+    'DATABASE_TIMEOUT_MS': config('HEALTH_CHECK_DATABASE_TIMEOUT_MS', default=500, cast=int),
+    'CACHE_TIMEOUT_MS': config('HEALTH_CHECK_CACHE_TIMEOUT_MS', default=200, cast=int),
+    # A passing migration check is reused for this long
+    'MIGRATIONS_CACHE_SECONDS': config('HEALTH_CHECK_MIGRATIONS_CACHE_SECONDS', default=300, cast=int),
+    # Fraction of the server's max_connections in use before the pod reports not ready
+    'MAX_CONNECTION_USAGE': config('HEALTH_CHECK_MAX_CONNECTION_USAGE', default=0.9, cast=float),
+}
+
 # Logging
 LOGGING = {
     'version': 1,
@@ -192,6 +400,11 @@ LOGGING = {
             'level': 'INFO',
             'propagate': False,
         },
+        'api.profiling': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
     },
 }
 
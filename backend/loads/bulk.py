@@ -0,0 +1,159 @@
+"""
+Batch mutations for dispatch operations
+
+Each operation loads every referenced row in one scoped query, validates the
+batch with set-based lookups, applies the valid changes with a single
+``bulk_update`` inside one transaction and reports a result per requested ID.
+Invalid items are skipped with an error; they never roll back valid ones.
+"""
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+
+from drivers.models import Driver
+from vehicles.models import Truck
+
+from .models import ACTIVE_LOAD_STATUSES, CLOSED_LOAD_STATUSES, Load, LoadEvent, LoadStatusTransition
+from .signals import loads_bulk_updated
+
+UNAVAILABLE_TRUCK_STATUSES = {'maintenance', 'out_of_service'}
+
+
+class BulkResult:
+    """Per-item outcome of a batch operation, in request order"""
+
+    def __init__(self, ids):
+        # Preserve order, drop duplicates
+        self.ids = list(dict.fromkeys(str(pk) for pk in ids))
+        self.errors = {}
+
+    def fail(self, pk, message):
+        self.errors[str(pk)] = message
+
+    def fail_all(self, message):
+        for pk in self.ids:
+            self.errors.setdefault(pk, message)
+
+    def as_dict(self):
+        results = []
+        for pk in self.ids:
+            if pk in self.errors:
+                results.append({'id': pk, 'success': False, 'error': self.errors[pk]})
+            else:
+                results.append({'id': pk, 'success': True})
+        failed = len(self.errors)
+        return {'updated': len(self.ids) - failed, 'failed': failed, 'results': results}
+
+
+def _actor(user):
+    return getattr(user, 'email', '') or str(user.pk)
+
+
+def _locked(queryset, ids, result):
+    """Fetch and lock the requested rows, marking IDs that are missing or out of scope"""
+    rows = {str(row.pk): row for row in queryset.filter(id__in=result.ids).select_for_update(of=('self',))}
+    for pk in result.ids:
+        if pk not in rows:
+            result.fail(pk, 'Not found')
+    return rows
+
+
+def bulk_assign(user, load_ids, driver_id=None, truck_id=None):
+    """Assign a driver and/or truck to many loads"""
+    result = BulkResult(load_ids)
+
+    driver = truck = None
+    if driver_id is not None:
+        driver = Driver.objects.for_user(user).filter(id=driver_id).only('id', 'company_id', 'status').first()
+        if driver is None:
+            result.fail_all('Driver not found')
+        elif driver.status != 'active':
+            result.fail_all(f'Driver is {driver.status}')
+    if truck_id is not None:
+        truck = Truck.objects.for_user(user).filter(id=truck_id).only('id', 'company_id', 'status').first()
+        if truck is None:
+            result.fail_all('Truck not found')
+        elif truck.status in UNAVAILABLE_TRUCK_STATUSES:
+            result.fail_all(f'Truck is {truck.get_status_display().lower()}')
+    if result.errors:
+        return result.as_dict()
+
+    now = timezone.now()
+    actor = _actor(user)
+    with transaction.atomic():
+        loads = _locked(Load.objects.for_user(user), load_ids, result)
+        changed, transitions = [], []
+        for pk, load in loads.items():
+            if load.status in CLOSED_LOAD_STATUSES:
+                result.fail(pk, f'Load is {load.status}')
+                continue
+            if any(resource is not None and resource.company_id != load.company_id for resource in (driver, truck)):
+                result.fail(pk, 'Driver or truck belongs to another company')
+                continue
+            if driver is not None:
+                load.assigned_driver_id = driver.pk
+            if truck is not None:
+                load.assigned_truck_id = truck.pk
+            if load.status in ('pending', 'planned'):
+                transitions.append(load.apply_status('assigned', changed_by=user, at=now))
+            load.dispatched_by = actor
+            load.updated_at = now
+            changed.append(load)
+        fields = ['assigned_driver', 'assigned_truck', 'status', 'dispatched_by', 'updated_at']
+        Load.objects.bulk_update(changed, fields, batch_size=500)
+        LoadStatusTransition.objects.bulk_create(transitions, batch_size=500)
+        loads_bulk_updated.send(sender=Load, loads=changed, fields=fields)
+    return result.as_dict()
+
+
+def bulk_set_status(user, load_ids, status):
+    """Move many loads to ``status`` where the state machine allows it"""
+    result = BulkResult(load_ids)
+    now = timezone.now()
+    with transaction.atomic():
+        loads = _locked(Load.objects.for_user(user), load_ids, result)
+        changed, transitions = [], []
+        for pk, load in loads.items():
+            if status in ACTIVE_LOAD_STATUSES and load.assigned_driver_id is None and load.status != status:
+                result.fail(pk, 'Load has no assigned driver')
+                continue
+            try:
+                transition = load.apply_status(status, changed_by=user, at=now)
+            except ValidationError as e:
+                result.fail(pk, e.messages[0])
+                continue
+            if transition is None:
+                continue
+            load.updated_at = now
+            changed.append(load)
+            transitions.append(transition)
+        fields = ['status', 'picked_up_at', 'delivered_at', 'updated_at']
+        Load.objects.bulk_update(changed, fields, batch_size=500)
+        LoadStatusTransition.objects.bulk_create(transitions, batch_size=500)
+        loads_bulk_updated.send(sender=Load, loads=changed, fields=fields)
+    return result.as_dict()
+
+
+def bulk_resolve_events(user, event_ids, resolution_notes=''):
+    """Mark many load events resolved"""
+    result = BulkResult(event_ids)
+    now = timezone.now()
+    actor = _actor(user)
+    with transaction.atomic():
+        events = _locked(LoadEvent.objects.for_user(user), event_ids, result)
+        changed = []
+        for pk, event in events.items():
+            if event.resolved:
+                result.fail(pk, 'Already resolved')
+                continue
+            event.resolved = True
+            event.resolved_at = now
+            event.resolved_by = actor
+            if resolution_notes:
+                event.resolution_notes = resolution_notes
+            event.updated_at = now
+            changed.append(event)
+        LoadEvent.objects.bulk_update(
+            changed, ['resolved', 'resolved_at', 'resolved_by', 'resolution_notes', 'updated_at'], batch_size=500,
+        )
+    return result.as_dict()
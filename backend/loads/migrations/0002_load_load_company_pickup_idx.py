@@ -0,0 +1,20 @@
+# Generated by Django 5.0.4 on 2026-10-19 17:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0003_alter_customuser_managers'),
+        ('drivers', '0006_driver_driver_company_name_idx'),
+        ('loads', '0001_initial'),
+        ('vehicles', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='load',
+            index=models.Index(fields=['company', '-pickup_date'], name='load_company_pickup_idx'),
+        ),
+    ]
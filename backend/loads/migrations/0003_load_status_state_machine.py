@@ -0,0 +1,78 @@
+# Generated by Django 5.0.4 on 2026-10-19 17:43
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0004_customuser_email_lower_idx'),
+        ('drivers', '0006_driver_driver_company_name_idx'),
+        ('loads', '0002_load_load_company_pickup_idx'),
+        ('vehicles', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LoadStatusTransition',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('from_status', models.CharField(blank=True, choices=[('pending', 'Pending'), ('planned', 'Planned'), ('assigned', 'Assigned'), ('at_pickup', 'At Pickup'), ('picked_up', 'Picked Up'), ('in_transit', 'In Transit'), ('at_delivery', 'At Delivery'), ('delivered', 'Delivered'), ('cancelled', 'Cancelled')], max_length=20)),
+                ('to_status', models.CharField(choices=[('pending', 'Pending'), ('planned', 'Planned'), ('assigned', 'Assigned'), ('at_pickup', 'At Pickup'), ('picked_up', 'Picked Up'), ('in_transit', 'In Transit'), ('at_delivery', 'At Delivery'), ('delivered', 'Delivered'), ('cancelled', 'Cancelled')], max_length=20)),
+                ('transitioned_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['transitioned_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='load',
+            name='delivered_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='load',
+            name='picked_up_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='load',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('planned', 'Planned'), ('assigned', 'Assigned'), ('at_pickup', 'At Pickup'), ('picked_up', 'Picked Up'), ('in_transit', 'In Transit'), ('at_delivery', 'At Delivery'), ('delivered', 'Delivered'), ('cancelled', 'Cancelled')], default='pending', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='load',
+            index=models.Index(fields=['company', 'picked_up_at'], name='load_company_picked_up_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='load',
+            index=models.Index(fields=['company', 'delivered_at'], name='load_company_delivered_idx'),
+        ),
+        migrations.AddField(
+            model_name='loadstatustransition',
+            name='changed_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='loadstatustransition',
+            name='company',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='companies.company'),
+        ),
+        migrations.AddField(
+            model_name='loadstatustransition',
+            name='load',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_transitions', to='loads.load'),
+        ),
+        migrations.AddIndex(
+            model_name='loadstatustransition',
+            index=models.Index(fields=['load', 'transitioned_at'], name='load_transition_load_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='loadstatustransition',
+            index=models.Index(fields=['company', 'to_status', 'transitioned_at'], name='load_transition_status_idx'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+from django.db import migrations
+from django.db.models import F, Min, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+PICKED_UP_STATUSES = ['picked_up', 'in_transit', 'at_delivery', 'delivered']
+
+
+def backfill_milestones(apps, schema_editor):
+    """
+    Derive picked_up_at / delivered_at for existing loads from their pickup and
+    delivery events, falling back to the scheduled dates.
+    """
+    Load = apps.get_model('loads', 'Load')
+    LoadEvent = apps.get_model('loads', 'LoadEvent')
+
+    def first_event(event_type):
+        return Subquery(
+            LoadEvent.objects.filter(load=OuterRef('pk'), event_type=event_type)
+            .values('load').annotate(first=Min('timestamp')).values('first')[:1]
+        )
+
+    Load.objects.filter(status__in=PICKED_UP_STATUSES, picked_up_at__isnull=True).update(
+        picked_up_at=Coalesce(first_event('pickup'), F('pickup_date')),
+    )
+    Load.objects.filter(status='delivered', delivered_at__isnull=True).update(
+        delivered_at=Coalesce(first_event('delivery'), F('delivery_date')),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('loads', '0003_load_status_state_machine'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_milestones, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.0.4 on 2026-10-19 18:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0005_terminal_location'),
+        ('drivers', '0006_driver_driver_company_name_idx'),
+        ('loads', '0004_backfill_load_milestones'),
+        ('vehicles', '0003_predicted_maintenance'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='load',
+            index=models.Index(fields=['assigned_driver', 'pickup_date'], name='load_driver_pickup_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='load',
+            index=models.Index(fields=['assigned_truck', 'pickup_date'], name='load_truck_pickup_idx'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_company(apps, schema_editor):
+    """Copy each event's company from its load"""
+    Load = apps.get_model('loads', 'Load')
+    LoadEvent = apps.get_model('loads', 'LoadEvent')
+    LoadEvent.objects.filter(company__isnull=True).update(
+        company=Subquery(Load.objects.filter(pk=OuterRef('load_id')).values('company_id')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0005_terminal_location'),
+        ('loads', '0005_load_assignment_pickup_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='loadevent',
+            name='company',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='companies.company'),
+        ),
+        migrations.RunPython(backfill_company, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='loadevent',
+            name='company',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='companies.company'),
+        ),
+        migrations.AddIndex(
+            model_name='loadevent',
+            index=models.Index(fields=['company', 'event_type', 'timestamp'], name='load_event_company_type_idx'),
+        ),
+    ]
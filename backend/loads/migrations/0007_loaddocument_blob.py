@@ -0,0 +1,25 @@
+# Generated by Django 5.0.4 on 2026-10-19 18:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0001_initial'),
+        ('loads', '0006_loadevent_company'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='loaddocument',
+            name='blob',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='documents.documentblob'),
+        ),
+        migrations.AlterField(
+            model_name='loaddocument',
+            name='file_path',
+            field=models.FileField(blank=True, upload_to='load_documents/'),
+        ),
+    ]
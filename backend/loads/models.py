@@ -1,12 +1,90 @@
 """
 Load and shipment models for Launch TMS
 """
+from django.conf import settings
+from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models import Avg, Count, DurationField, ExpressionWrapper, F, Q
+from django.utils import timezone
 from companies.models import BaseModel, Company, Division, Department, Terminal
+from companies.scoping import ScopedManager, ScopedQuerySet
 from decimal import Decimal
 import uuid
 
 
+LOAD_STATUS_CHOICES = [
+    ('pending', 'Pending'),
+    ('planned', 'Planned'),
+    ('assigned', 'Assigned'),
+    ('at_pickup', 'At Pickup'),
+    ('picked_up', 'Picked Up'),
+    ('in_transit', 'In Transit'),
+    ('at_delivery', 'At Delivery'),
+    ('delivered', 'Delivered'),
+    ('cancelled', 'Cancelled'),
+]
+
+# Allowed status changes; delivered is final, cancelled loads can be reopened
+LOAD_STATUS_TRANSITIONS = {
+    'pending': {'planned', 'assigned', 'cancelled'},
+    'planned': {'pending', 'assigned', 'cancelled'},
+    'assigned': {'pending', 'planned', 'at_pickup', 'picked_up', 'in_transit', 'cancelled'},
+    'at_pickup': {'assigned', 'picked_up', 'cancelled'},
+    'picked_up': {'in_transit', 'at_delivery', 'delivered'},
+    'in_transit': {'at_delivery', 'delivered'},
+    'at_delivery': {'in_transit', 'delivered'},
+    'delivered': set(),
+    'cancelled': {'pending'},
+}
+
+# Statuses at or after pickup; entering one stamps picked_up_at
+PICKED_UP_STATUSES = {'picked_up', 'in_transit', 'at_delivery', 'delivered'}
+# Assigned and moving, used for "active loads" counts; bulk moves into these need a driver
+ACTIVE_LOAD_STATUSES = ['assigned', 'at_pickup', 'picked_up', 'in_transit', 'at_delivery']
+CLOSED_LOAD_STATUSES = {'delivered', 'cancelled'}
+# Statuses a load can be created in; later ones are reached through transitions so milestones get stamped
+INITIAL_LOAD_STATUSES = {'pending', 'planned', 'assigned'}
+
+
+def _hours(duration):
+    return round(duration.total_seconds() / 3600, 2) if duration is not None else None
+
+
+class LoadQuerySet(ScopedQuerySet):
+    """Load queries including delivery performance aggregates"""
+    
+    def delivery_performance(self):
+        """
+        On-time and dwell statistics for delivered loads in one aggregate query.
+        
+        Transit is picked_up_at → delivered_at; pickup dwell is the time from
+        the scheduled pickup to the actual pickup.
+        """
+        delivered = Q(status='delivered', delivered_at__isnull=False)
+        stats = self.aggregate(
+            delivered=Count('id', filter=delivered),
+            on_time=Count('id', filter=delivered & Q(delivered_at__lte=F('delivery_date'))),
+            avg_transit=Avg(
+                ExpressionWrapper(F('delivered_at') - F('picked_up_at'), output_field=DurationField()),
+                filter=delivered & Q(picked_up_at__isnull=False),
+            ),
+            avg_pickup_dwell=Avg(
+                ExpressionWrapper(F('picked_up_at') - F('pickup_date'), output_field=DurationField()),
+                filter=Q(picked_up_at__isnull=False),
+            ),
+        )
+        return {
+            'delivered': stats['delivered'],
+            'on_time': stats['on_time'],
+            'on_time_rate': round(stats['on_time'] / stats['delivered'], 4) if stats['delivered'] else None,
+            'avg_transit_hours': _hours(stats['avg_transit']),
+            'avg_pickup_dwell_hours': _hours(stats['avg_pickup_dwell']),
+        }
+
+
+LoadManager = models.Manager.from_queryset(LoadQuerySet)
+
+
 class Load(BaseModel):
     """Load/Shipment model"""
     
@@ -38,13 +116,11 @@ class Load(BaseModel):
     assigned_truck = models.ForeignKey('vehicles.Truck', on_delete=models.SET_NULL, null=True, blank=True, related_name='loads')
     
     # Status
-    status = models.CharField(max_length=20, choices=[
-        ('pending', 'Pending'),
-        ('assigned', 'Assigned'),
-        ('in_transit', 'In Transit'),
-        ('delivered', 'Delivered'),
-        ('cancelled', 'Cancelled'),
-    ], default='pending')
+    status = models.CharField(max_length=20, choices=LOAD_STATUS_CHOICES, default='pending')
+    
+    # Actual milestone times, maintained by apply_status()
+    picked_up_at = models.DateTimeField(null=True, blank=True)
+    delivered_at = models.DateTimeField(null=True, blank=True)
     
     # Cargo information
     cargo_description = models.TextField()
@@ -75,13 +151,75 @@ class Load(BaseModel):
     customer_id = models.CharField(max_length=100, blank=True)
     dispatched_by = models.CharField(max_length=255, blank=True)
     
+    objects = LoadManager()
+    
+    SCOPE_LOOKUPS = {
+        'company': ('company',),
+        'division': ('division',),
+        'department': ('department',),
+        'terminal': ('origin_terminal', 'destination_terminal'),
+    }
+    
     class Meta:
         unique_together = ['company', 'load_number']
         ordering = ['-pickup_date']
+        indexes = [
+            models.Index(fields=['company', '-pickup_date'], name='load_company_pickup_idx'),
+            models.Index(fields=['company', 'picked_up_at'], name='load_company_picked_up_idx'),
+            models.Index(fields=['company', 'delivered_at'], name='load_company_delivered_idx'),
+            models.Index(fields=['assigned_driver', 'pickup_date'], name='load_driver_pickup_idx'),
+            models.Index(fields=['assigned_truck', 'pickup_date'], name='load_truck_pickup_idx'),
+        ]
     
     def __str__(self):
         return f"Load {self.load_number} - {self.shipper} to {self.receiver}"
     
+    def can_transition_to(self, status):
+        return status in LOAD_STATUS_TRANSITIONS.get(self.status, set())
+    
+    def apply_status(self, status, changed_by=None, at=None):
+        """
+        Move to ``status`` and stamp milestone times without saving.
+        
+        Returns the unsaved LoadStatusTransition, or None when the status is
+        unchanged. Raises ValidationError for a transition the state machine
+        does not allow.
+        """
+        if status == self.status:
+            return None
+        if not self.can_transition_to(status):
+            raise ValidationError(f"Cannot change status from {self.status} to {status}")
+        
+        at = at or timezone.now()
+        if status in PICKED_UP_STATUSES and self.picked_up_at is None:
+            self.picked_up_at = at
+        if status == 'delivered':
+            self.delivered_at = at
+        elif status not in PICKED_UP_STATUSES:
+            # Reverting before pickup clears milestones that no longer hold
+            self.picked_up_at = None
+            self.delivered_at = None
+        
+        transition = LoadStatusTransition(
+            load=self,
+            company_id=self.company_id,
+            from_status=self.status,
+            to_status=status,
+            changed_by_id=getattr(changed_by, 'pk', None),
+            transitioned_at=at,
+        )
+        self.status = status
+        return transition
+    
+    def transition_to(self, status, changed_by=None, at=None):
+        """Apply a status change, save it and log the transition"""
+        transition = self.apply_status(status, changed_by=changed_by, at=at)
+        if transition is None:
+            return None
+        self.save(update_fields=['status', 'picked_up_at', 'delivered_at', 'updated_at'])
+        transition.save()
+        return transition
+    
     @property
     def pickup_location_full(self):
         return f"{self.pickup_address}, {self.pickup_city}, {self.pickup_state} {self.pickup_zip}"
@@ -91,9 +229,41 @@ class Load(BaseModel):
         return f"{self.delivery_address}, {self.delivery_city}, {self.delivery_state} {self.delivery_zip}"
 
 
+class LoadStatusTransition(models.Model):
+    """Append-only log of load status changes"""
+    id = models.BigAutoField(primary_key=True)
+    load = models.ForeignKey(Load, on_delete=models.CASCADE, related_name='status_transitions')
+    company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name='+')
+    from_status = models.CharField(max_length=20, choices=LOAD_STATUS_CHOICES, blank=True)
+    to_status = models.CharField(max_length=20, choices=LOAD_STATUS_CHOICES)
+    transitioned_at = models.DateTimeField(default=timezone.now)
+    changed_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    
+    objects = ScopedManager()
+    
+    SCOPE_LOOKUPS = {
+        'company': ('company',),
+        'division': ('load__division',),
+        'department': ('load__department',),
+        'terminal': ('load__origin_terminal', 'load__destination_terminal'),
+    }
+    
+    class Meta:
+        ordering = ['transitioned_at']
+        indexes = [
+            models.Index(fields=['load', 'transitioned_at'], name='load_transition_load_idx'),
+            models.Index(fields=['company', 'to_status', 'transitioned_at'], name='load_transition_status_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.load_id}: {self.from_status or '-'} -> {self.to_status}"
+
+
 class LoadEvent(BaseModel):
     """Load event/tracking model"""
     load = models.ForeignKey(Load, on_delete=models.CASCADE, related_name='events')
+    # Denormalized from the load so incident queries can use a (company, event_type, timestamp) index
+    company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name='+')
     
     event_type = models.CharField(max_length=20, choices=[
         ('pickup', 'Pickup'),
@@ -131,12 +301,27 @@ class LoadEvent(BaseModel):
     resolved_at = models.DateTimeField(null=True, blank=True)
     resolved_by = models.CharField(max_length=255, blank=True)
     
+    SCOPE_LOOKUPS = {
+        'company': ('company',),
+        'division': ('load__division',),
+        'department': ('load__department',),
+        'terminal': ('load__origin_terminal', 'load__destination_terminal'),
+    }
+    
     class Meta:
         ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['company', 'event_type', 'timestamp'], name='load_event_company_type_idx'),
+        ]
     
     def __str__(self):
         return f"{self.load.load_number} - {self.event_type} at {self.timestamp}"
     
+    def save(self, *args, **kwargs):
+        if self._state.adding or self.company_id is None:
+            self.company_id = self.load.company_id
+        super().save(*args, **kwargs)
+    
     @property
     def location_full(self):
         if self.location_address:
@@ -155,9 +340,18 @@ class LoadDocument(BaseModel):
         ('other', 'Other'),
     ])
     document_name = models.CharField(max_length=255)
-    file_path = models.FileField(upload_to='load_documents/')
+    file_path = models.FileField(upload_to='load_documents/', blank=True)
+    # Content-addressed file from the documents upload pipeline (replaces file_path)
+    blob = models.ForeignKey('documents.DocumentBlob', on_delete=models.PROTECT, null=True, blank=True, related_name='+')
     uploaded_by = models.CharField(max_length=255)
     notes = models.TextField(blank=True)
     
+    SCOPE_LOOKUPS = {
+        'company': ('load__company',),
+        'division': ('load__division',),
+        'department': ('load__department',),
+        'terminal': ('load__origin_terminal', 'load__destination_terminal'),
+    }
+    
     def __str__(self):
         return f"{self.load.load_number} - {self.document_name}"
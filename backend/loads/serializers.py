@@ -1,8 +1,16 @@
 """
 Serializers for loads app
 """
+from django.conf import settings
+from django.db import transaction
+from django.urls import reverse
 from rest_framework import serializers
-from .models import Load, LoadEvent, LoadDocument
+
+from dispatch.routing import estimate_load_routes
+
+from .models import INITIAL_LOAD_STATUSES, LOAD_STATUS_CHOICES, Load, LoadEvent, LoadDocument, LoadStatusTransition
+
+BULK_MAX_ITEMS = getattr(settings, 'BULK_OPERATIONS', {}).get('MAX_ITEMS', 500)
 
 
 class LoadEventSerializer(serializers.ModelSerializer):
@@ -46,9 +54,46 @@ class LoadSerializer(serializers.ModelSerializer):
     pickupDate = serializers.DateTimeField(source='pickup_date')
     deliveryDate = serializers.DateTimeField(source='delivery_date')
     specialInstructions = serializers.CharField(source='special_instructions', required=False, allow_blank=True)
+    pickedUpAt = serializers.DateTimeField(source='picked_up_at', read_only=True)
+    deliveredAt = serializers.DateTimeField(source='delivered_at', read_only=True)
     createdAt = serializers.DateTimeField(source='created_at')
     updatedAt = serializers.DateTimeField(source='updated_at')
     
+    def validate_status(self, value):
+        """New loads start before pickup; status changes must follow the load state machine"""
+        if self.instance is None and value not in INITIAL_LOAD_STATUSES:
+            raise serializers.ValidationError(
+                f"New loads must start as one of {', '.join(sorted(INITIAL_LOAD_STATUSES))}, not {value}"
+            )
+        if self.instance is not None and value != self.instance.status and not self.instance.can_transition_to(value):
+            raise serializers.ValidationError(f"Cannot change status from {self.instance.status} to {value}")
+        return value
+    
+    def create(self, validated_data):
+        request = self.context.get('request')
+        with transaction.atomic():
+            instance = super().create(validated_data)
+            # Fill only the distance / transit estimates the client left empty
+            if estimate_load_routes([instance]):
+                instance.save(update_fields=['distance', 'estimated_transit_time'])
+            LoadStatusTransition.objects.create(
+                load=instance,
+                company_id=instance.company_id,
+                to_status=instance.status,
+                changed_by_id=getattr(getattr(request, 'user', None), 'pk', None),
+            )
+        return instance
+    
+    def update(self, instance, validated_data):
+        request = self.context.get('request')
+        status = validated_data.pop('status', instance.status)
+        with transaction.atomic():
+            transition = instance.apply_status(status, changed_by=getattr(request, 'user', None))
+            instance = super().update(instance, validated_data)
+            if transition is not None:
+                transition.save()
+        return instance
+    
     def get_pickupLocation(self, obj):
         """Return pickup location as nested object"""
         return {
@@ -88,7 +133,7 @@ class LoadSerializer(serializers.ModelSerializer):
             'assignedDriverId', 'assignedTruckId', 'status', 'cargoDescription',
             'weight', 'distance', 'estimatedTransitTime', 'pickupDate',
             'deliveryDate', 'rate', 'notes', 'specialInstructions', 'hazmat',
-            'events', 'createdAt', 'updatedAt'
+            'pickedUpAt', 'deliveredAt', 'events', 'createdAt', 'updatedAt'
         ]
         read_only_fields = ['id', 'createdAt', 'updatedAt']
 
@@ -96,11 +141,54 @@ class LoadSerializer(serializers.ModelSerializer):
 class LoadDocumentSerializer(serializers.ModelSerializer):
     """Serializer for LoadDocument model"""
     
+    downloadUrl = serializers.SerializerMethodField()
+    
     class Meta:
         model = LoadDocument
         fields = [
             'id', 'load', 'document_type', 'document_name',
             'file_path', 'uploaded_by', 'notes',
-            'created_at', 'updated_at'
+            'created_at', 'updated_at', 'downloadUrl'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
+    
+    def get_downloadUrl(self, obj):
+        return reverse('document_download', kwargs={'kind': 'load', 'pk': obj.pk})
+
+
+class LoadStatusTransitionSerializer(serializers.ModelSerializer):
+    """Serializer for LoadStatusTransition model"""
+    
+    loadId = serializers.CharField(source='load_id', read_only=True)
+    fromStatus = serializers.CharField(source='from_status', read_only=True)
+    toStatus = serializers.CharField(source='to_status', read_only=True)
+    transitionedAt = serializers.DateTimeField(source='transitioned_at', read_only=True)
+    changedBy = serializers.CharField(source='changed_by_id', read_only=True, allow_null=True)
+    
+    class Meta:
+        model = LoadStatusTransition
+        fields = ['id', 'loadId', 'fromStatus', 'toStatus', 'transitionedAt', 'changedBy']
+
+
+class BulkAssignSerializer(serializers.Serializer):
+    """Request body for assigning one driver and/or truck to many loads"""
+    loadIds = serializers.ListField(child=serializers.UUIDField(), allow_empty=False, max_length=BULK_MAX_ITEMS)
+    driverId = serializers.UUIDField(required=False, allow_null=True)
+    truckId = serializers.UUIDField(required=False, allow_null=True)
+    
+    def validate(self, attrs):
+        if attrs.get('driverId') is None and attrs.get('truckId') is None:
+            raise serializers.ValidationError('driverId or truckId is required')
+        return attrs
+
+
+class BulkStatusSerializer(serializers.Serializer):
+    """Request body for moving many loads to one status"""
+    loadIds = serializers.ListField(child=serializers.UUIDField(), allow_empty=False, max_length=BULK_MAX_ITEMS)
+    status = serializers.ChoiceField(choices=LOAD_STATUS_CHOICES)
+
+
+class BulkResolveEventsSerializer(serializers.Serializer):
+    """Request body for resolving many load events"""
+    eventIds = serializers.ListField(child=serializers.UUIDField(), allow_empty=False, max_length=BULK_MAX_ITEMS)
+    resolutionNotes = serializers.CharField(required=False, allow_blank=True, default='')
@@ -0,0 +1,8 @@
+"""
+Signals sent by the loads app
+"""
+from django.dispatch import Signal
+
+# Sent after Load rows are changed with bulk_update, which skips post_save.
+# Receivers get ``loads`` (the saved instances) and ``fields`` (the updated field names).
+loads_bulk_updated = Signal()
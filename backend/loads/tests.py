@@ -1,3 +1,99 @@
+"""
+Tests for the load status state machine
+"""
+from django.core.exceptions import ValidationError
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from companies.tests import make_company, make_driver, make_load, make_user
+
+from .models import Load
+
+
+class LoadStatusTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.terminal = make_company('ACME')
+        cls.admin = make_user('admin', role='company_admin', company=cls.terminal.department.division.company)
+        cls.driver = make_driver('D1', cls.terminal)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def create(self, **fields):
+        payload = {
+            'loadNumber': 'N1', 'bolNumber': 'B1', 'shipper': 'Shipper', 'cargoDescription': 'Freight',
+            'weight': 10000, 'rate': '1500.00', 'pickupDate': '2024-06-21T08:00:00Z',
+            'deliveryDate': '2024-06-21T14:00:00Z', 'createdAt': '2024-06-20T08:00:00Z',
+            'updatedAt': '2024-06-20T08:00:00Z',
+        }
+        payload.update(fields)
+        return self.client.post('/api/loads/', payload, format='json')
+
+    def patch_status(self, load, status):
+        return self.client.patch(f'/api/loads/{load.pk}/', {'status': status}, format='json')
+
+    def test_new_loads_cannot_start_past_assignment(self):
+        response = self.create(status='delivered')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('status', response.data)
+        self.assertFalse(Load.objects.exists())
+
+    def test_new_load_logs_its_initial_status(self):
+        response = self.create(status='planned', assignedDriverId=str(self.driver.pk))
+        self.assertEqual(response.status_code, 201)
+        load = Load.objects.get(pk=response.data['id'])
+        self.assertEqual(list(load.status_transitions.values_list('from_status', 'to_status')), [('', 'planned')])
+
+    def test_skipping_ahead_is_rejected(self):
+        load = make_load('L1', self.terminal)
+        response = self.patch_status(load, 'delivered')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('status', response.data)
+        load.refresh_from_db()
+        self.assertEqual(load.status, 'pending')
+        self.assertFalse(load.status_transitions.exists())
+
+    def test_delivered_is_final(self):
+        load = make_load('L1', self.terminal, status='delivered')
+        self.assertEqual(self.patch_status(load, 'in_transit').status_code, 400)
+
+    def test_allowed_transition_stamps_milestones_and_logs_it(self):
+        load = make_load('L1', self.terminal, status='assigned', assigned_driver=self.driver)
+        self.assertEqual(self.patch_status(load, 'in_transit').status_code, 200)
+        load.refresh_from_db()
+        self.assertIsNotNone(load.picked_up_at)
+        self.assertEqual(
+            list(load.status_transitions.values_list('from_status', 'to_status')), [('assigned', 'in_transit')],
+        )
+        self.assertEqual(self.patch_status(load, 'delivered').status_code, 200)
+        load.refresh_from_db()
+        self.assertIsNotNone(load.delivered_at)
+
+    def test_reverting_before_pickup_clears_milestones(self):
+        load = make_load('L1', self.terminal, status='at_pickup')
+        load.picked_up_at = load.pickup_date
+        load.save()
+        self.assertEqual(self.patch_status(load, 'assigned').status_code, 200)
+        load.refresh_from_db()
+        self.assertIsNone(load.picked_up_at)
+
+    def test_apply_status_raises_for_invalid_transition(self):
+        load = make_load('L1', self.terminal)
+        with self.assertRaises(ValidationError):
+            load.apply_status('picked_up')
+        self.assertEqual(load.status, 'pending')
+
+    def test_bulk_status_needs_a_driver_for_active_statuses(self):
+        without = make_load('L1', self.terminal, status='assigned')
+        with_driver = make_load('L2', self.terminal, status='assigned', assigned_driver=self.driver)
+        response = self.client.post(
+            '/api/loads/bulk-status/', {'loadIds': [str(without.pk), str(with_driver.pk)], 'status': 'at_pickup'},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['updated'], response.data['failed']), (1, 1))
+        self.assertEqual(Load.objects.get(pk=without.pk).status, 'assigned')
+        self.assertEqual(Load.objects.get(pk=with_driver.pk).status, 'at_pickup')
@@ -1,43 +1,106 @@
 """
 API views for loads app
 """
-from rest_framework import viewsets, permissions
+from rest_framework import viewsets, permissions, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from django.utils.dateparse import parse_datetime
+from companies.permissions import HasTMSPermission, write_permissions
+from companies.scoping import ScopedQuerysetMixin
+from .bulk import bulk_assign, bulk_resolve_events, bulk_set_status
 from .models import Load, LoadEvent, LoadDocument
-from .serializers import LoadSerializer, LoadEventSerializer, LoadDocumentSerializer
+from .serializers import (
+    LoadSerializer, LoadEventSerializer, LoadDocumentSerializer, LoadStatusTransitionSerializer,
+    BulkAssignSerializer, BulkStatusSerializer, BulkResolveEventsSerializer,
+)
 
 
-class LoadViewSet(viewsets.ModelViewSet):
+# Dispatchers manage loads; drivers and terminal staff may also update the loads they can see
+MANAGE_LOADS = ('manage_loads', 'manage_department_loads')
+UPDATE_LOADS = MANAGE_LOADS + ('update_assigned_loads',)
+
+
+def _invalid(serializer):
+    return Response({
+        'error': 'Invalid bulk request',
+        'details': serializer.errors
+    }, status=status.HTTP_400_BAD_REQUEST)
+
+
+class LoadViewSet(ScopedQuerysetMixin, viewsets.ModelViewSet):
     """ViewSet for managing loads"""
     queryset = Load.objects.all()
     serializer_class = LoadSerializer
-    permission_classes = [permissions.AllowAny]  # Temporarily allow unauthenticated access for testing
+    permission_classes = [permissions.IsAuthenticated, HasTMSPermission]
+    required_permissions = {
+        **write_permissions(*MANAGE_LOADS, actions=('create', 'destroy', 'bulk_assign')),
+        **write_permissions(*UPDATE_LOADS, actions=('update', 'partial_update', 'bulk_status')),
+    }
+    throttle_budgets = {'bulk_assign': 'bulk', 'bulk_status': 'bulk'}
     
-    def get_queryset(self):
-        """Return all loads for now (no company filtering during testing)"""
-        return Load.objects.all()
+    @action(detail=True, methods=['get'])
+    def transitions(self, request, pk=None):
+        """Status history of a load"""
+        load = self.get_object()
+        serializer = LoadStatusTransitionSerializer(load.status_transitions.all(), many=True)
+        return Response(serializer.data)
     
-    def perform_create(self, serializer):
-        """Save load without company requirement for now"""
-        serializer.save()
+    @action(detail=False, methods=['get'], url_path='delivery-performance')
+    def delivery_performance(self, request):
+        """On-time delivery and dwell statistics, optionally limited to loads delivered in [start, end)"""
+        queryset = Load.objects.for_user(request.user)
+        for param, lookup in (('start', 'delivered_at__gte'), ('end', 'delivered_at__lt')):
+            value = request.query_params.get(param)
+            if value:
+                parsed = parse_datetime(value)
+                if parsed is None:
+                    return Response({'error': f'Invalid {param} datetime'}, status=status.HTTP_400_BAD_REQUEST)
+                queryset = queryset.filter(**{lookup: parsed})
+        return Response(queryset.delivery_performance())
+    
+    @action(detail=False, methods=['post'], url_path='bulk-assign')
+    def bulk_assign(self, request):
+        """Assign a driver and/or truck to many loads in one transaction"""
+        serializer = BulkAssignSerializer(data=request.data)
+        if not serializer.is_valid():
+            return _invalid(serializer)
+        data = serializer.validated_data
+        return Response(bulk_assign(request.user, data['loadIds'], data.get('driverId'), data.get('truckId')))
+    
+    @action(detail=False, methods=['post'], url_path='bulk-status')
+    def bulk_status(self, request):
+        """Advance many loads to a new status in one transaction"""
+        serializer = BulkStatusSerializer(data=request.data)
+        if not serializer.is_valid():
+            return _invalid(serializer)
+        data = serializer.validated_data
+        return Response(bulk_set_status(request.user, data['loadIds'], data['status']))
 
 
-class LoadEventViewSet(viewsets.ModelViewSet):
+class LoadEventViewSet(ScopedQuerysetMixin, viewsets.ModelViewSet):
     """ViewSet for managing load events"""
     queryset = LoadEvent.objects.all()
     serializer_class = LoadEventSerializer
-    permission_classes = [permissions.AllowAny]  # Temporarily allow unauthenticated access for testing
+    permission_classes = [permissions.IsAuthenticated, HasTMSPermission]
+    required_permissions = {
+        **write_permissions(*UPDATE_LOADS),
+        **write_permissions(*MANAGE_LOADS, actions=('bulk_resolve',)),
+    }
+    throttle_budgets = {'bulk_resolve': 'bulk'}
     
-    def get_queryset(self):
-        """Return all load events for now"""
-        return LoadEvent.objects.all()
+    @action(detail=False, methods=['post'], url_path='bulk-resolve')
+    def bulk_resolve(self, request):
+        """Resolve many load events in one transaction"""
+        serializer = BulkResolveEventsSerializer(data=request.data)
+        if not serializer.is_valid():
+            return _invalid(serializer)
+        data = serializer.validated_data
+        return Response(bulk_resolve_events(request.user, data['eventIds'], data['resolutionNotes']))
 
 
-class LoadDocumentViewSet(viewsets.ModelViewSet):
+class LoadDocumentViewSet(ScopedQuerysetMixin, viewsets.ModelViewSet):
     """ViewSet for managing load documents"""
     queryset = LoadDocument.objects.all()
     serializer_class = LoadDocumentSerializer
-    permission_classes = [permissions.AllowAny]  # Temporarily allow unauthenticated access for testing
-    
-    def get_queryset(self):
-        """Return all load documents for now"""
-        return LoadDocument.objects.all()
+    permission_classes = [permissions.IsAuthenticated, HasTMSPermission]
+    required_permissions = write_permissions(*UPDATE_LOADS)
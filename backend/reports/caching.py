@@ -0,0 +1,34 @@
+"""
+Cache helpers shared by the reports
+
+Report results depend only on the requesting user's scope, so users with
+the same scope share cache entries. Reports of past periods change rarely
+and are kept longer than reports that include today.
+"""
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+
+from companies.scoping import resolve_user_scope, scope_level
+
+_options = getattr(settings, 'REPORTS', {})
+
+
+def report_cache():
+    return caches[_options.get('CACHE', 'default')]
+
+
+def scope_key(user):
+    """Cache key fragment identifying the user's data scope"""
+    scope = resolve_user_scope(user)
+    parts = (
+        scope_level(scope) or 'all', scope.company_id, scope.division_id, scope.department_id, scope.terminal_id,
+    )
+    return ':'.join(str(part) for part in parts)
+
+
+def report_ttl(last_day):
+    """Cache lifetime for a report whose period ends on ``last_day``"""
+    if last_day >= timezone.localdate():
+        return _options.get('TODAY_TTL', 60)
+    return _options.get('PAST_TTL', 3600)
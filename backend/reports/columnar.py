@@ -0,0 +1,184 @@
+"""
+Columnar (Arrow / Parquet) export of operational tables for the data warehouse
+
+Each table is read with a server-side cursor (``iterator(chunk_size=...)``)
+and converted chunk by chunk into Arrow record batches with typed columns:
+decimals stay ``decimal128``, datetimes are UTC timestamps, dates are
+``date32`` and UUIDs are strings. Memory stays bounded by the chunk size.
+
+Files are partitioned Hive-style by company and the month a row was created
+(``<table>/company_id=<id>/month=YYYY-MM/part-<run>.parquet``), so a row
+never moves between partitions. Incremental runs export rows whose
+``updated_at`` is newer than the last run's watermark into new part files;
+consumers keep the latest ``updated_at`` per ``id``.
+"""
+import io
+import json
+import os
+from datetime import timezone as dt_timezone
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from django.conf import settings
+from django.db import models
+from django.db.models import F
+from django.db.models.functions import Coalesce
+
+from drivers.models import Driver
+from loads.models import Load, LoadEvent
+from vehicles.models import MaintenanceRecord, Trailer, Truck
+
+_options = getattr(settings, 'ANALYTICS_EXPORT', {})
+CHUNK_SIZE = _options.get('CHUNK_SIZE', 5000)
+DEFAULT_DIRECTORY = _options.get('DIRECTORY', 'analytics_export')
+# Re-read rows updated shortly before the watermark, for transactions that committed late
+WATERMARK_OVERLAP_SECONDS = _options.get('WATERMARK_OVERLAP_SECONDS', 300)
+WATERMARK_FILE = '_watermarks.json'
+
+# Table name → (model, expression for the owning company)
+EXPORT_TABLES = {
+    'loads': (Load, F('company_id')),
+    'load_events': (LoadEvent, F('company_id')),
+    'drivers': (Driver, F('company_id')),
+    'trucks': (Truck, F('company_id')),
+    'trailers': (Trailer, F('company_id')),
+    'maintenance_records': (MaintenanceRecord, Coalesce('truck__company_id', 'trailer__company_id')),
+}
+
+
+def _arrow_type(field):
+    if isinstance(field, models.ForeignKey):
+        return _arrow_type(field.target_field)
+    if isinstance(field, models.UUIDField):
+        return pa.string()
+    if isinstance(field, models.DecimalField):
+        return pa.decimal128(field.max_digits, field.decimal_places)
+    if isinstance(field, models.DateTimeField):
+        return pa.timestamp('us', tz='UTC')
+    if isinstance(field, models.DateField):
+        return pa.date32()
+    if isinstance(field, models.BooleanField):
+        return pa.bool_()
+    if isinstance(field, (models.IntegerField, models.BigAutoField, models.AutoField)):
+        return pa.int64()
+    if isinstance(field, models.FloatField):
+        return pa.float64()
+    return pa.string()
+
+
+def table_schema(model):
+    """Arrow schema and column attnames for every concrete field of ``model``"""
+    fields = model._meta.concrete_fields
+    schema = pa.schema([pa.field(field.attname, _arrow_type(field), nullable=True) for field in fields])
+    return schema, [field.attname for field in fields]
+
+
+def _convert(values, arrow_type):
+    if pa.types.is_string(arrow_type):
+        return [None if value is None else str(value) for value in values]
+    if pa.types.is_timestamp(arrow_type):
+        return [None if value is None else value.astimezone(dt_timezone.utc) for value in values]
+    return values
+
+
+def export_queryset(table, queryset=None, since=None):
+    """
+    The table's rows as (schema, queryset of value tuples) ready for
+    ``iter_record_batches``. Each tuple ends with the owning company ID.
+    """
+    model, company = EXPORT_TABLES[table]
+    schema, columns = table_schema(model)
+    if queryset is None:
+        queryset = model.objects.all()
+    if since is not None:
+        queryset = queryset.filter(updated_at__gt=since)
+    rows = queryset.annotate(export_company_id=company).order_by('export_company_id', 'created_at', 'pk')
+    return schema, rows.values_list(*columns, 'export_company_id')
+
+
+def iter_record_batches(schema, rows, chunk_size=CHUNK_SIZE, partitioned=False):
+    """
+    Yield Arrow record batches from a values_list queryset, reading it with
+    a server-side cursor. With ``partitioned`` yields ((company_id, month),
+    batch) and starts a new batch whenever the partition changes.
+    """
+    width = len(schema)
+    buffer, partition = [], None
+
+    def flush():
+        columns = list(zip(*buffer))
+        arrays = [pa.array(_convert(columns[i], schema.field(i).type), type=schema.field(i).type) for i in range(width)]
+        return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+    created_index = schema.get_field_index('created_at')
+    for row in rows.iterator(chunk_size=chunk_size):
+        if partitioned:
+            key = (str(row[width]), row[created_index].strftime('%Y-%m'))
+            if buffer and key != partition:
+                yield partition, flush()
+                buffer = []
+            partition = key
+        buffer.append(row[:width])
+        if len(buffer) >= chunk_size:
+            yield (partition, flush()) if partitioned else flush()
+            buffer = []
+    if buffer:
+        yield (partition, flush()) if partitioned else flush()
+
+
+def write_partitioned_parquet(table, directory, run_id, since=None, queryset=None):
+    """Write the table to Hive-partitioned Parquet files; returns (rows, files, max updated_at)"""
+    schema, rows = export_queryset(table, queryset=queryset, since=since)
+    writer = current = None
+    row_count, files, watermark = 0, [], None
+    updated_index = schema.get_field_index('updated_at')
+    try:
+        for (company_id, month), batch in iter_record_batches(schema, rows, partitioned=True):
+            if (company_id, month) != current:
+                if writer is not None:
+                    writer.close()
+                path = os.path.join(directory, table, f'company_id={company_id}', f'month={month}')
+                os.makedirs(path, exist_ok=True)
+                filename = os.path.join(path, f'part-{run_id}.parquet')
+                writer = pq.ParquetWriter(filename, schema, compression=_options.get('COMPRESSION', 'zstd'))
+                files.append(filename)
+                current = (company_id, month)
+            writer.write_batch(batch)
+            row_count += batch.num_rows
+            batch_max = pc.max(batch.column(updated_index)).as_py()
+            if batch_max is not None and (watermark is None or batch_max > watermark):
+                watermark = batch_max
+    finally:
+        if writer is not None:
+            writer.close()
+    return row_count, files, watermark
+
+
+def read_watermarks(directory):
+    path = os.path.join(directory, WATERMARK_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as handle:
+        return json.load(handle)
+
+
+def write_watermarks(directory, watermarks):
+    path = os.path.join(directory, WATERMARK_FILE)
+    with open(f'{path}.tmp', 'w') as handle:
+        json.dump(watermarks, handle, indent=2, sort_keys=True)
+    os.replace(f'{path}.tmp', path)
+
+
+def arrow_stream(table, queryset, since=None):
+    """Yield an Arrow IPC stream of the table as byte chunks, one per record batch"""
+    schema, rows = export_queryset(table, queryset=queryset, since=since)
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        for batch in iter_record_batches(schema, rows):
+            writer.write_batch(batch)
+            yield sink.getvalue()
+            sink.seek(0)
+            sink.truncate()
+    # End-of-stream marker written on close
+    yield sink.getvalue()
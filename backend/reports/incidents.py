@@ -0,0 +1,237 @@
+"""
+Incident (safety event) analytics
+
+Counts by type, severity, terminal and period, time to resolution
+(``resolved_at - timestamp``) and open-incident aging are all aggregated in
+SQL over ``LoadEvent``, whose denormalized ``company`` lets the
+``(company, event_type, timestamp)`` index serve every query. Each severity
+has a resolution SLA (``REPORTS['INCIDENT_SLA_HOURS']``); resolved incidents
+are checked against it and open ones report whether they are past it.
+
+Percentiles use ``PERCENTILE_CONT`` on PostgreSQL; other databases read the
+resolution durations and compute them with numpy.
+"""
+from datetime import datetime, time, timedelta
+
+import numpy as np
+from django.conf import settings
+from django.db import connection
+from django.db.models import Aggregate, Avg, Count, DurationField, ExpressionWrapper, F, Q
+from django.db.models.functions import TruncDate, TruncMonth, TruncWeek
+from django.utils import timezone
+
+from loads.models import LoadEvent
+
+from .caching import report_cache, report_ttl, scope_key
+from .lsw import SAFETY_EVENT_TYPES
+
+_options = getattr(settings, 'REPORTS', {})
+SLA_HOURS = _options.get('INCIDENT_SLA_HOURS', {'critical': 4, 'high': 24, 'medium': 72, 'low': 168})
+SEVERITIES = ('low', 'medium', 'high', 'critical')
+RESOLUTION_PERCENTILES = (50, 90)
+GRANULARITIES = {'day': TruncDate, 'week': TruncWeek, 'month': TruncMonth}
+# Open incident age buckets as (key, minimum age, maximum age)
+AGING_BUCKETS = (
+    ('under1d', timedelta(0), timedelta(days=1)),
+    ('1to3d', timedelta(days=1), timedelta(days=3)),
+    ('3to7d', timedelta(days=3), timedelta(days=7)),
+    ('7to30d', timedelta(days=7), timedelta(days=30)),
+    ('over30d', timedelta(days=30), None),
+)
+
+
+class PercentileCont(Aggregate):
+    """PostgreSQL ordered-set ``PERCENTILE_CONT``; ``percentile`` is a fraction between 0 and 1"""
+    function = 'PERCENTILE_CONT'
+    template = '%(function)s(%(percentile)s) WITHIN GROUP (ORDER BY %(expressions)s)'
+
+    def __init__(self, expression, percentile, **extra):
+        super().__init__(expression, percentile=float(percentile), **extra)
+
+
+def _resolution_time():
+    return ExpressionWrapper(F('resolved_at') - F('timestamp'), output_field=DurationField())
+
+
+def _within_sla():
+    """Resolved no later than the severity's SLA after the incident"""
+    condition = Q()
+    for severity, hours in SLA_HOURS.items():
+        condition |= Q(severity=severity, resolved_at__lte=F('timestamp') + timedelta(hours=hours))
+    return condition
+
+
+def _breaching_sla(now):
+    condition = Q()
+    for severity, hours in SLA_HOURS.items():
+        condition |= Q(severity=severity, timestamp__lt=now - timedelta(hours=hours))
+    return condition
+
+
+def _hours(duration):
+    return round(duration.total_seconds() / 3600, 2) if duration is not None else None
+
+
+def _incidents(user, types, terminal):
+    events = LoadEvent.objects.for_user(user).filter(event_type__in=types)
+    if terminal is not None:
+        events = events.filter(Q(load__origin_terminal=terminal) | Q(load__destination_terminal=terminal))
+    return events
+
+
+def _counts(events, granularity):
+    """Totals by type and severity plus the per-period series, from one grouped query"""
+    rows = events.annotate(period=GRANULARITIES[granularity]('timestamp')).values(
+        'period', 'event_type', 'severity',
+    ).annotate(count=Count('id'), open=Count('id', filter=Q(resolved=False))).order_by('period')
+
+    by_type, by_severity, series = {}, dict.fromkeys(SEVERITIES, 0), {}
+    total = open_count = 0
+    for row in rows:
+        count = row['count']
+        total += count
+        open_count += row['open']
+        type_counts = by_type.setdefault(row['event_type'], {'total': 0, **dict.fromkeys(SEVERITIES, 0)})
+        type_counts['total'] += count
+        type_counts[row['severity']] = type_counts.get(row['severity'], 0) + count
+        by_severity[row['severity']] = by_severity.get(row['severity'], 0) + count
+
+        day = row['period'].date() if hasattr(row['period'], 'date') else row['period']
+        bucket = series.setdefault(day, {'period': day.isoformat(), 'total': 0, 'byType': {}, 'bySeverity': {}})
+        bucket['total'] += count
+        bucket['byType'][row['event_type']] = bucket['byType'].get(row['event_type'], 0) + count
+        bucket['bySeverity'][row['severity']] = bucket['bySeverity'].get(row['severity'], 0) + count
+    return {'incidents': total, 'open': open_count}, by_type, by_severity, list(series.values())
+
+
+def _by_terminal(events):
+    rows = events.values('load__origin_terminal', 'load__origin_terminal__name').annotate(
+        count=Count('id'),
+        open=Count('id', filter=Q(resolved=False)),
+        high_severity=Count('id', filter=Q(severity__in=('high', 'critical'))),
+    ).order_by('-count')
+    return [
+        {
+            'terminalId': str(row['load__origin_terminal']) if row['load__origin_terminal'] else None,
+            'name': row['load__origin_terminal__name'] or 'Unassigned',
+            'incidents': row['count'],
+            'open': row['open'],
+            'highSeverity': row['high_severity'],
+        }
+        for row in rows
+    ]
+
+
+def _resolution_stats(resolved):
+    """Resolution count, mean and percentiles (in hours) and SLA compliance per severity and overall"""
+    measures = {
+        'resolved': Count('id'),
+        'mean': Avg(_resolution_time()),
+        'within_sla': Count('id', filter=_within_sla()),
+    }
+    use_sql_percentiles = connection.vendor == 'postgresql'
+    if use_sql_percentiles:
+        for p in RESOLUTION_PERCENTILES:
+            measures[f'p{p}'] = PercentileCont(_resolution_time(), p / 100, output_field=DurationField())
+
+    rows = {row['severity']: row for row in resolved.values('severity').annotate(**measures).order_by()}
+    overall = resolved.aggregate(**measures)
+    if not use_sql_percentiles:
+        durations = resolved.annotate(duration=_resolution_time()).values_list('severity', 'duration')
+        by_severity = {}
+        for severity, duration in durations:
+            by_severity.setdefault(severity, []).append(duration.total_seconds())
+        everything = [value for values in by_severity.values() for value in values]
+        for severity, seconds in [(None, everything)] + list(by_severity.items()):
+            target = overall if severity is None else rows[severity]
+            values = np.percentile(seconds, RESOLUTION_PERCENTILES) if seconds else [None] * len(RESOLUTION_PERCENTILES)
+            for p, value in zip(RESOLUTION_PERCENTILES, values):
+                target[f'p{p}'] = timedelta(seconds=float(value)) if value is not None else None
+
+    def summary(row, sla_hours=None):
+        resolved_count = row['resolved']
+        stats = {
+            'resolved': resolved_count,
+            'meanHours': _hours(row['mean']),
+            **{f'p{p}Hours': _hours(row[f'p{p}']) for p in RESOLUTION_PERCENTILES},
+            'withinSla': row['within_sla'],
+            'slaRate': round(row['within_sla'] / resolved_count, 4) if resolved_count else None,
+        }
+        if sla_hours is not None:
+            stats['slaHours'] = sla_hours
+        return stats
+
+    return {
+        'overall': summary(overall),
+        'bySeverity': {
+            severity: summary(rows[severity], SLA_HOURS.get(severity))
+            for severity in SEVERITIES if severity in rows
+        },
+    }
+
+
+def _open_aging(events, now):
+    buckets = {}
+    for key, youngest, oldest in AGING_BUCKETS:
+        condition = Q(timestamp__lte=now - youngest)
+        if oldest is not None:
+            condition &= Q(timestamp__gt=now - oldest)
+        buckets[key] = Count('id', filter=condition)
+    row = events.filter(resolved=False).aggregate(
+        total=Count('id'),
+        breachingSla=Count('id', filter=_breaching_sla(now)),
+        highSeverity=Count('id', filter=Q(severity__in=('high', 'critical'))),
+        **buckets,
+    )
+    return {
+        'total': row.pop('total'),
+        'breachingSla': row.pop('breachingSla'),
+        'highSeverity': row.pop('highSeverity'),
+        'aging': row,
+    }
+
+
+def build_incident_analytics(user, start, end, types=SAFETY_EVENT_TYPES, terminal=None, granularity='week'):
+    """Incident counts, resolution times and SLA compliance between ``start`` and ``end`` (inclusive dates)"""
+    now = timezone.now()
+    incidents = _incidents(user, types, terminal)
+    window_start = timezone.make_aware(datetime.combine(start, time.min))
+    window_end = timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min))
+    in_window = incidents.filter(timestamp__gte=window_start, timestamp__lt=window_end)
+
+    totals, by_type, by_severity, series = _counts(in_window, granularity)
+    return {
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'granularity': granularity,
+        'types': list(types),
+        'totals': totals,
+        'byType': by_type,
+        'bySeverity': by_severity,
+        'byTerminal': _by_terminal(in_window),
+        'series': series,
+        'resolution': _resolution_stats(in_window.filter(resolved=True, resolved_at__isnull=False)),
+        # Open incidents are aged regardless of the window
+        'openIncidents': _open_aging(incidents, now),
+        'generatedAt': now.isoformat(),
+    }
+
+
+def get_incident_analytics(user, start, end, types=SAFETY_EVENT_TYPES, terminal=None, granularity='week',
+                           refresh=False):
+    """Cached ``build_incident_analytics``; users with the same scope share entries"""
+    terminal_part = terminal.pk if terminal is not None else 'all'
+    key = (
+        f"incidents:{scope_key(user)}:{terminal_part}:{start.isoformat()}:{end.isoformat()}:"
+        f"{granularity}:{','.join(sorted(types))}"
+    )
+    cache = report_cache()
+    if not refresh:
+        report = cache.get(key)
+        if report is not None:
+            return report
+
+    report = build_incident_analytics(user, start, end, types=types, terminal=terminal, granularity=granularity)
+    # Open-incident aging is always as of now
+    cache.set(key, report, report_ttl(max(end, timezone.localdate())))
+    return report
@@ -0,0 +1,188 @@
+"""
+Leader Standard Work (LSW) daily report aggregation
+
+Every bucket of the daily report is a conditional aggregate
+(``Count(filter=Q(...))`` / ``Sum(filter=Q(...))``), so the whole report is
+one query per model instead of shipping the fleet to the browser. Results
+are cached per user scope, terminal and day: briefly for today, longer for
+past days that no longer change much.
+"""
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db.models import Count, DecimalField, Q, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from drivers.models import Driver
+from loads.models import Load, LoadEvent
+from vehicles.models import Trailer, Truck
+
+from .caching import report_cache, report_ttl, scope_key
+
+_options = getattr(settings, 'REPORTS', {})
+EXPIRY_WINDOW_DAYS = _options.get('EXPIRY_WINDOW_DAYS', 30)
+SAFETY_EVENT_TYPES = ('spill', 'contamination', 'ncr')
+
+
+def _day_bounds(day):
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    return start, start + timedelta(days=1)
+
+
+def _money(field, condition):
+    return Coalesce(Sum(field, filter=condition), Value(0), output_field=DecimalField(max_digits=14, decimal_places=2))
+
+
+def _driver_summary(user, terminal, day):
+    drivers = Driver.objects.for_user(user)
+    if terminal is not None:
+        drivers = drivers.filter(home_terminal=terminal)
+    return drivers.aggregate(
+        total=Count('id'),
+        present=Count('id', filter=Q(status='active')),
+        onLeave=Count('id', filter=Q(status='on_leave')),
+        inactive=Count('id', filter=Q(status='inactive')),
+        terminated=Count('id', filter=Q(status='terminated')),
+        training=Count('id', filter=Q(status='in_training')),
+        licenseExpirations=Count(
+            'id', filter=Q(license_expiry__lte=day + timedelta(days=EXPIRY_WINDOW_DAYS)) & ~Q(status='terminated'),
+        ),
+    )
+
+
+def _truck_summary(user, terminal, day):
+    trucks = Truck.objects.for_user(user)
+    if terminal is not None:
+        trucks = trucks.filter(Q(home_terminal=terminal) | Q(assigned_terminal=terminal))
+    expiring = day + timedelta(days=EXPIRY_WINDOW_DAYS)
+    return trucks.aggregate(
+        total=Count('id'),
+        assigned=Count('id', filter=Q(status='assigned')),
+        unseated=Count('id', filter=Q(status='available')),
+        maintenance=Count('id', filter=Q(status='maintenance')),
+        outOfService=Count('id', filter=Q(status='out_of_service')),
+        maintenanceOverdue=Count(
+            'id', filter=Q(next_maintenance_due__lte=day) | Q(predicted_maintenance_due__lte=day),
+        ),
+        registrationExpirations=Count('id', filter=Q(registration_expiry__lte=expiring)),
+        insuranceExpirations=Count('id', filter=Q(insurance_expiry__lte=expiring)),
+    )
+
+
+def _trailer_summary(user, terminal):
+    trailers = Trailer.objects.for_user(user)
+    if terminal is not None:
+        trailers = trailers.filter(home_terminal=terminal)
+    return trailers.aggregate(
+        total=Count('id'),
+        atTerminal=Count('id', filter=Q(status='available')),
+        inTransit=Count('id', filter=Q(status='assigned')),
+        outOfService=Count('id', filter=Q(status__in=('maintenance', 'out_of_service'))),
+    )
+
+
+def _load_summary(user, terminal, day):
+    loads = Load.objects.for_user(user)
+    if terminal is not None:
+        loads = loads.filter(Q(origin_terminal=terminal) | Q(destination_terminal=terminal))
+
+    buckets = {
+        'pending': Count('id', filter=Q(status__in=('pending', 'planned', 'assigned'))),
+        'atPickup': Count('id', filter=Q(status='at_pickup')),
+        'pickedUp': Count('id', filter=Q(status='picked_up')),
+        'inTransit': Count('id', filter=Q(status__in=('in_transit', 'at_delivery'))),
+    }
+    start, end = _day_bounds(day)
+    buckets['delivered'] = Count('id', filter=Q(delivered_at__gte=start, delivered_at__lt=end))
+    buckets['revenue'] = _money('rate', Q(delivered_at__gte=start, delivered_at__lt=end))
+
+    # Outlook for yesterday, today and tomorrow in the same query
+    outlook_days = {'yesterday': day - timedelta(days=1), 'today': day, 'tomorrow': day + timedelta(days=1)}
+    for key, outlook_day in outlook_days.items():
+        start, end = _day_bounds(outlook_day)
+        scheduled_delivery = Q(delivery_date__gte=start, delivery_date__lt=end) & ~Q(status='cancelled')
+        buckets[f'{key}Pickups'] = Count(
+            'id', filter=Q(pickup_date__gte=start, pickup_date__lt=end) & ~Q(status='cancelled'),
+        )
+        buckets[f'{key}Deliveries'] = Count('id', filter=scheduled_delivery)
+        buckets[f'{key}Revenue'] = _money('rate', scheduled_delivery)
+
+    row = loads.aggregate(**buckets)
+    outlook = {
+        key: {
+            'date': outlook_day.isoformat(),
+            'expectedPickups': row.pop(f'{key}Pickups'),
+            'expectedDeliveries': row.pop(f'{key}Deliveries'),
+            'estimatedRevenue': float(row.pop(f'{key}Revenue')),
+        }
+        for key, outlook_day in outlook_days.items()
+    }
+    row['revenue'] = float(row['revenue'])
+    return row, outlook
+
+
+def _event_summary(user, terminal, day):
+    events = LoadEvent.objects.for_user(user)
+    if terminal is not None:
+        events = events.filter(Q(load__origin_terminal=terminal) | Q(load__destination_terminal=terminal))
+    start, end = _day_bounds(day)
+    events = events.filter(timestamp__gte=start, timestamp__lt=end)
+
+    buckets = {
+        'total': Count('id'),
+        'unresolved': Count('id', filter=Q(resolved=False)),
+        'highSeverity': Count('id', filter=Q(severity__in=('high', 'critical'))),
+    }
+    for event_type in ('delay', 'issue') + SAFETY_EVENT_TYPES:
+        buckets[event_type] = Count('id', filter=Q(event_type=event_type))
+    return events.aggregate(**buckets)
+
+
+def build_lsw_daily_report(user, terminal=None, day=None):
+    """Counts and revenue for the LSW daily report of ``terminal`` (or the whole scope) on ``day``"""
+    day = day or timezone.localdate()
+    loads, outlook = _load_summary(user, terminal, day)
+    trucks = _truck_summary(user, terminal, day)
+    drivers = _driver_summary(user, terminal, day)
+    events = _event_summary(user, terminal, day)
+
+    compliance = {
+        'licenseExpirations': drivers.pop('licenseExpirations'),
+        'maintenanceOverdue': trucks.pop('maintenanceOverdue'),
+        'registrationExpirations': trucks.pop('registrationExpirations'),
+        'insuranceExpirations': trucks.pop('insuranceExpirations'),
+        'safetyIncidents': sum(events[event_type] for event_type in SAFETY_EVENT_TYPES),
+    }
+    return {
+        'date': day.isoformat(),
+        'terminal': None if terminal is None else {'id': str(terminal.pk), 'name': terminal.name, 'code': terminal.code},
+        'drivers': drivers,
+        'trucks': trucks,
+        'trailers': _trailer_summary(user, terminal),
+        'loads': loads,
+        'events': events,
+        'outlook': outlook,
+        'compliance': compliance,
+        'generatedAt': timezone.now().isoformat(),
+    }
+
+
+def _cache_key(user, terminal, day):
+    terminal_part = terminal.pk if terminal is not None else 'all'
+    return f"lsw-daily:{scope_key(user)}:{terminal_part}:{day.isoformat()}"
+
+
+def get_lsw_daily_report(user, terminal=None, day=None, refresh=False):
+    """Cached ``build_lsw_daily_report``; users with the same scope share entries"""
+    day = day or timezone.localdate()
+    key = _cache_key(user, terminal, day)
+    cache = report_cache()
+    if not refresh:
+        report = cache.get(key)
+        if report is not None:
+            return report
+
+    report = build_lsw_daily_report(user, terminal, day)
+    cache.set(key, report, report_ttl(day))
+    return report
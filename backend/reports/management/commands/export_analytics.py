@@ -0,0 +1,70 @@
+"""
+Management command to export operational tables as partitioned Parquet
+"""
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from reports.columnar import (
+    DEFAULT_DIRECTORY,
+    EXPORT_TABLES,
+    WATERMARK_OVERLAP_SECONDS,
+    read_watermarks,
+    write_partitioned_parquet,
+    write_watermarks,
+)
+
+
+class Command(BaseCommand):
+    help = 'Export loads, events, drivers, trucks, trailers and maintenance records to Parquet partitioned by company/month'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            default=DEFAULT_DIRECTORY,
+            help='Directory for the partitioned Parquet files',
+        )
+        parser.add_argument(
+            '--tables',
+            nargs='+',
+            choices=sorted(EXPORT_TABLES),
+            default=sorted(EXPORT_TABLES),
+            help='Tables to export (default: all)',
+        )
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Ignore the stored watermarks and export every row',
+        )
+        parser.add_argument(
+            '--since',
+            help='Export rows updated after this ISO timestamp instead of the stored watermark',
+        )
+
+    def handle(self, *args, **options):
+        directory = options['output']
+        since_override = None
+        if options['since']:
+            try:
+                since_override = datetime.fromisoformat(options['since'])
+            except ValueError:
+                raise CommandError(f"Invalid --since timestamp: {options['since']}")
+            if timezone.is_naive(since_override):
+                since_override = timezone.make_aware(since_override)
+
+        watermarks = read_watermarks(directory)
+        run_id = timezone.now().strftime('%Y%m%dT%H%M%S')
+        for table in options['tables']:
+            since = since_override
+            if since is None and not options['full'] and watermarks.get(table):
+                since = datetime.fromisoformat(watermarks[table]) - timedelta(seconds=WATERMARK_OVERLAP_SECONDS)
+
+            rows, files, watermark = write_partitioned_parquet(table, directory, run_id, since=since)
+            if watermark is not None:
+                watermarks[table] = watermark.isoformat()
+                write_watermarks(directory, watermarks)
+            mode = f"since {since.isoformat()}" if since else 'full'
+            self.stdout.write(f"{table}: {rows} rows in {len(files)} files ({mode})")
+
+        self.stdout.write(self.style.SUCCESS(f"Export written to {directory}"))
@@ -0,0 +1,57 @@
+"""
+Management command to rebuild daily load rollups from loads
+"""
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from companies.models import Company
+from loads.models import Load
+from reports.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = 'Rebuild LoadDailyRollup rows; by default the days touched by loads changed in the last --hours'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=26, help='Look back this many hours for changed loads')
+        parser.add_argument('--start', type=date.fromisoformat, help='Rebuild every day from this date (YYYY-MM-DD)')
+        parser.add_argument('--end', type=date.fromisoformat, help='Last day to rebuild (default today)')
+        parser.add_argument('--all', action='store_true', help='Rebuild every day that has loads')
+        parser.add_argument('--company', help='Only rebuild the company with this code')
+        parser.add_argument('--chunk-days', type=int, default=31, help='Days rebuilt per transaction')
+
+    def handle(self, *args, **options):
+        company_ids = None
+        loads = Load.objects.all()
+        if options['company']:
+            company = Company.objects.filter(code=options['company']).first()
+            if company is None:
+                raise CommandError(f"Company {options['company']} not found")
+            company_ids = [company.pk]
+            loads = loads.filter(company=company)
+
+        if options['all'] or options['start']:
+            if options['all']:
+                bounds = loads.order_by().values_list('pickup_date', flat=True)
+                first, last = bounds.order_by('pickup_date').first(), bounds.order_by('-pickup_date').first()
+                if first is None:
+                    self.stdout.write('No loads to roll up')
+                    return
+                start, end = timezone.localdate(first), timezone.localdate(last)
+            else:
+                start, end = options['start'], options['end'] or timezone.localdate()
+            days = [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+        else:
+            since = timezone.now() - timedelta(hours=options['hours'])
+            days = sorted(set(
+                loads.filter(updated_at__gte=since).annotate(day=TruncDate('pickup_date'))
+                .order_by().values_list('day', flat=True).distinct()
+            ))
+
+        written = 0
+        for index in range(0, len(days), options['chunk_days']):
+            written += rebuild_rollups(days[index:index + options['chunk_days']], company_ids=company_ids)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {len(days)} days ({written} rollup rows)"))
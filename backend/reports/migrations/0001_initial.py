@@ -0,0 +1,38 @@
+# Generated by Django 5.0.4 on 2026-10-19 17:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('companies', '0005_terminal_location'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LoadDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('date', models.DateField()),
+                ('status', models.CharField(max_length=20)),
+                ('load_count', models.IntegerField(default=0)),
+                ('total_weight', models.BigIntegerField(default=0)),
+                ('total_distance', models.BigIntegerField(default=0)),
+                ('total_rate', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='companies.company')),
+                ('terminal', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='companies.terminal')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['company', 'date'], name='load_rollup_company_date_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='loaddailyrollup',
+            constraint=models.UniqueConstraint(fields=('company', 'terminal', 'date', 'status'), name='load_rollup_unique_key'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.0.4 on 2026-10-19 18:26
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def merge_duplicate_rows(apps, schema_editor):
+    """Fold rows without a terminal that share company, date and status into one"""
+    LoadDailyRollup = apps.get_model('reports', 'LoadDailyRollup')
+    rows = LoadDailyRollup.objects.filter(terminal__isnull=True)
+    duplicates = rows.values('company_id', 'date', 'status').annotate(rows=Count('id')).filter(rows__gt=1)
+    for key in duplicates:
+        group = rows.filter(company_id=key['company_id'], date=key['date'], status=key['status']).order_by('id')
+        totals = group.aggregate(
+            load_count=Sum('load_count'), total_weight=Sum('total_weight'),
+            total_distance=Sum('total_distance'), total_rate=Sum('total_rate'),
+        )
+        keep = group.first()
+        group.exclude(pk=keep.pk).delete()
+        LoadDailyRollup.objects.filter(pk=keep.pk).update(**totals)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0005_terminal_location'),
+        ('reports', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='loaddailyrollup',
+            name='load_rollup_unique_key',
+        ),
+        migrations.AddConstraint(
+            model_name='loaddailyrollup',
+            constraint=models.UniqueConstraint(condition=models.Q(('terminal__isnull', False)), fields=('company', 'terminal', 'date', 'status'), name='load_rollup_unique_key'),
+        ),
+        migrations.RunPython(merge_duplicate_rows, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='loaddailyrollup',
+            constraint=models.UniqueConstraint(condition=models.Q(('terminal__isnull', True)), fields=('company', 'date', 'status'), name='load_rollup_unique_no_terminal'),
+        ),
+    ]
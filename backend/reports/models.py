@@ -0,0 +1,55 @@
+"""
+Analytics rollup models for Launch TMS
+"""
+from django.db import models
+
+from companies.models import Company, Terminal
+from companies.scoping import ScopedManager
+
+
+class LoadDailyRollup(models.Model):
+    """
+    Load count, weight, distance and rate per company, origin terminal,
+    pickup day and status. Maintained incrementally by ``reports.signals``
+    and rebuilt by ``python manage.py rebuild_load_rollups``.
+    """
+    id = models.BigAutoField(primary_key=True)
+    company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name='+')
+    terminal = models.ForeignKey(Terminal, on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    date = models.DateField()
+    status = models.CharField(max_length=20)
+    
+    load_count = models.IntegerField(default=0)
+    total_weight = models.BigIntegerField(default=0)
+    total_distance = models.BigIntegerField(default=0)
+    total_rate = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    objects = ScopedManager()
+    
+    SCOPE_LOOKUPS = {
+        'company': ('company',),
+        'division': ('terminal__department__division',),
+        'department': ('terminal__department',),
+        # Origin terminal only; Load.objects.for_user also matches loads delivered to the terminal
+        'terminal': ('terminal',),
+    }
+    
+    class Meta:
+        # NULLs are distinct in a plain unique constraint, so rows without a terminal get their own
+        constraints = [
+            models.UniqueConstraint(
+                fields=['company', 'terminal', 'date', 'status'], condition=models.Q(terminal__isnull=False),
+                name='load_rollup_unique_key',
+            ),
+            models.UniqueConstraint(
+                fields=['company', 'date', 'status'], condition=models.Q(terminal__isnull=True),
+                name='load_rollup_unique_no_terminal',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['company', 'date'], name='load_rollup_company_date_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.company_id} {self.terminal_id or '-'} {self.date} {self.status}: {self.load_count}"
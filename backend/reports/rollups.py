@@ -0,0 +1,192 @@
+"""
+Daily load rollups for volume and revenue analytics
+
+``LoadDailyRollup`` holds one row per (company, origin terminal, pickup day,
+status) with summed count, weight, distance and rate. Rows are additive, so
+every load change is applied as a delta: the load's previous contribution
+is subtracted from its old key and the new one added to its new key. The
+previous contribution comes from a snapshot taken when the instance was
+loaded (see ``reports.signals``). A rebuild recomputes whole days from
+``loads_load`` and repairs any drift from writes that bypass the ORM.
+
+Range queries then read O(days × terminals × statuses) rollup rows instead
+of scanning loads.
+"""
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import Coalesce, TruncDate, TruncMonth, TruncWeek
+from django.utils import timezone
+
+from loads.models import Load
+
+from .models import LoadDailyRollup
+
+# Load attributes a rollup row depends on
+ROLLUP_FIELDS = ('company_id', 'origin_terminal_id', 'pickup_date', 'status', 'weight', 'distance', 'rate')
+SNAPSHOT_ATTR = '_rollup_snapshot'
+GRANULARITIES = {'day': None, 'week': TruncWeek, 'month': TruncMonth}
+
+
+def snapshot(load):
+    """The load's current rollup contribution, or None if a field is not loaded"""
+    values = load.__dict__
+    if any(field not in values for field in ROLLUP_FIELDS) or values['pickup_date'] is None:
+        return None
+    return tuple(values[field] for field in ROLLUP_FIELDS)
+
+
+def _contribution(values, sign):
+    company_id, terminal_id, pickup_date, status, weight, distance, rate = values
+    key = (company_id, terminal_id, timezone.localdate(pickup_date), status)
+    return key, (sign, sign * (weight or 0), sign * (distance or 0), sign * Decimal(rate or 0))
+
+
+class RollupDelta:
+    """Accumulates per-key changes and writes them with one UPDATE (or INSERT) per key"""
+
+    def __init__(self):
+        self.changes = defaultdict(lambda: [0, 0, 0, Decimal(0)])
+        self.rebuild = set()
+
+    def add(self, values, sign):
+        key, amounts = _contribution(values, sign)
+        totals = self.changes[key]
+        for index, amount in enumerate(amounts):
+            totals[index] += amount
+
+    def replace(self, before, after):
+        if before == after:
+            return
+        if before is not None:
+            self.add(before, -1)
+        if after is not None:
+            self.add(after, 1)
+
+    def rebuild_day(self, company_id, day):
+        self.rebuild.add((company_id, day))
+
+    def apply(self):
+        with transaction.atomic():
+            for key, (count, weight, distance, rate) in self.changes.items():
+                if count or weight or distance or rate:
+                    _apply_change(key, count, weight, distance, rate)
+            by_company = defaultdict(set)
+            for company_id, day in self.rebuild:
+                by_company[company_id].add(day)
+            for company_id, days in by_company.items():
+                rebuild_rollups(days, company_ids=[company_id])
+
+
+def _apply_change(key, count, weight, distance, rate):
+    company_id, terminal_id, day, status = key
+    rows = LoadDailyRollup.objects.filter(company_id=company_id, terminal_id=terminal_id, date=day, status=status)
+    changes = {
+        'load_count': F('load_count') + count,
+        'total_weight': F('total_weight') + weight,
+        'total_distance': F('total_distance') + distance,
+        'total_rate': F('total_rate') + rate,
+        'updated_at': timezone.now(),
+    }
+    if rows.update(**changes):
+        return
+    try:
+        with transaction.atomic():
+            LoadDailyRollup.objects.create(
+                company_id=company_id, terminal_id=terminal_id, date=day, status=status,
+                load_count=count, total_weight=weight, total_distance=distance, total_rate=rate,
+            )
+    except IntegrityError:
+        # Created concurrently; the row exists now
+        rows.update(**changes)
+
+
+def rebuild_rollups(days, company_ids=None):
+    """Recompute the rollup rows of ``days`` (dates) from loads; returns the number of rows written"""
+    days = sorted(set(days))
+    if not days:
+        return 0
+    start = timezone.make_aware(datetime.combine(days[0], time.min))
+    end = timezone.make_aware(datetime.combine(days[-1] + timedelta(days=1), time.min))
+
+    loads = Load.objects.filter(pickup_date__gte=start, pickup_date__lt=end)
+    existing = LoadDailyRollup.objects.filter(date__in=days)
+    if company_ids is not None:
+        loads = loads.filter(company_id__in=company_ids)
+        existing = existing.filter(company_id__in=company_ids)
+
+    rows = loads.annotate(day=TruncDate('pickup_date')).filter(day__in=days).values(
+        'company_id', 'origin_terminal_id', 'day', 'status',
+    ).annotate(
+        count=Count('id'),
+        weight=Coalesce(Sum('weight'), 0),
+        distance=Coalesce(Sum('distance'), 0),
+        rate=Coalesce(Sum('rate'), Decimal(0)),
+    ).order_by()
+
+    rollups = [
+        LoadDailyRollup(
+            company_id=row['company_id'], terminal_id=row['origin_terminal_id'], date=row['day'],
+            status=row['status'], load_count=row['count'], total_weight=row['weight'],
+            total_distance=row['distance'], total_rate=row['rate'],
+        )
+        for row in rows
+    ]
+    with transaction.atomic():
+        existing.delete()
+        LoadDailyRollup.objects.bulk_create(rollups, batch_size=1000)
+    return len(rollups)
+
+
+def load_volume(user, start, end, terminal=None, granularity='day'):
+    """
+    Load count, weight, distance and revenue per period between ``start``
+    and ``end`` (inclusive dates), with a count per status, from rollups.
+    Revenue excludes cancelled loads. Loads count toward their origin
+    terminal only, for both ``terminal`` and a terminal-scoped user: loads
+    delivered to the terminal are not included.
+    """
+    rollups = LoadDailyRollup.objects.for_user(user).filter(date__gte=start, date__lte=end)
+    if terminal is not None:
+        rollups = rollups.filter(terminal=terminal)
+    trunc = GRANULARITIES[granularity]
+    period = F('date') if trunc is None else trunc('date')
+
+    rows = rollups.annotate(period=period).values('period', 'status').annotate(
+        loads=Sum('load_count'),
+        weight=Sum('total_weight'),
+        distance=Sum('total_distance'),
+        rate=Sum('total_rate'),
+    ).order_by('period')
+
+    series = {}
+    for row in rows:
+        day = row['period'].date() if hasattr(row['period'], 'date') else row['period']
+        bucket = series.setdefault(day, {
+            'period': day.isoformat(), 'loads': 0, 'weight': 0, 'distance': 0, 'revenue': 0.0, 'byStatus': {},
+        })
+        if not row['loads']:
+            continue
+        bucket['loads'] += row['loads']
+        bucket['weight'] += row['weight']
+        bucket['distance'] += row['distance']
+        if row['status'] != 'cancelled':
+            bucket['revenue'] = round(bucket['revenue'] + float(row['rate']), 2)
+        bucket['byStatus'][row['status']] = row['loads']
+
+    series = [bucket for bucket in series.values() if bucket['loads']]
+    totals = {
+        key: sum(bucket[key] for bucket in series) for key in ('loads', 'weight', 'distance')
+    }
+    totals['revenue'] = round(sum(bucket['revenue'] for bucket in series), 2)
+    return {
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'granularity': granularity,
+        'terminalBasis': 'origin',
+        'totals': totals,
+        'series': series,
+    }
@@ -0,0 +1,76 @@
+"""
+Serializers for reports app
+"""
+from rest_framework import serializers
+
+from loads.models import LoadEvent
+
+from .incidents import GRANULARITIES as INCIDENT_GRANULARITIES
+from .lsw import SAFETY_EVENT_TYPES
+from .utilization import SUBJECTS
+
+MAX_RANGE_DAYS = 3660
+MAX_UTILIZATION_DAYS = 366
+
+
+class LSWDailyQuerySerializer(serializers.Serializer):
+    """Query parameters for the LSW daily report"""
+    terminal = serializers.UUIDField(required=False)
+    date = serializers.DateField(required=False)
+    refresh = serializers.BooleanField(default=False)
+
+
+class LoadVolumeQuerySerializer(serializers.Serializer):
+    """Query parameters for load volume analytics"""
+    start = serializers.DateField()
+    end = serializers.DateField()
+    terminal = serializers.UUIDField(required=False)
+    granularity = serializers.ChoiceField(choices=['day', 'week', 'month'], default='day')
+    
+    def validate(self, attrs):
+        if attrs['end'] < attrs['start']:
+            raise serializers.ValidationError('end must not be before start')
+        if (attrs['end'] - attrs['start']).days > MAX_RANGE_DAYS:
+            raise serializers.ValidationError(f'Date range is limited to {MAX_RANGE_DAYS} days')
+        return attrs
+
+
+class UtilizationQuerySerializer(serializers.Serializer):
+    """Query parameters for driver and truck utilization"""
+    start = serializers.DateField()
+    end = serializers.DateField()
+    by = serializers.ChoiceField(choices=SUBJECTS, default='driver')
+    terminal = serializers.UUIDField(required=False)
+    refresh = serializers.BooleanField(default=False)
+    
+    def validate(self, attrs):
+        if attrs['end'] < attrs['start']:
+            raise serializers.ValidationError('end must not be before start')
+        if (attrs['end'] - attrs['start']).days >= MAX_UTILIZATION_DAYS:
+            raise serializers.ValidationError(f'Date range is limited to {MAX_UTILIZATION_DAYS} days')
+        return attrs
+
+
+class IncidentAnalyticsQuerySerializer(serializers.Serializer):
+    """Query parameters for incident analytics"""
+    start = serializers.DateField()
+    end = serializers.DateField()
+    types = serializers.MultipleChoiceField(
+        choices=LoadEvent._meta.get_field('event_type').choices, required=False,
+    )
+    terminal = serializers.UUIDField(required=False)
+    granularity = serializers.ChoiceField(choices=list(INCIDENT_GRANULARITIES), default='week')
+    refresh = serializers.BooleanField(default=False)
+    
+    def validate(self, attrs):
+        if attrs['end'] < attrs['start']:
+            raise serializers.ValidationError('end must not be before start')
+        if (attrs['end'] - attrs['start']).days > MAX_RANGE_DAYS:
+            raise serializers.ValidationError(f'Date range is limited to {MAX_RANGE_DAYS} days')
+        attrs['types'] = tuple(sorted(attrs.get('types') or SAFETY_EVENT_TYPES))
+        return attrs
+
+
+class ExportQuerySerializer(serializers.Serializer):
+    """Query parameters for columnar exports"""
+    since = serializers.DateTimeField(required=False)
@@ -0,0 +1,56 @@
+"""
+Signal handlers keeping load rollups current
+"""
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from loads.models import Load
+from loads.signals import loads_bulk_updated
+
+from .rollups import SNAPSHOT_ATTR, RollupDelta, snapshot
+
+
+@receiver(post_init, sender=Load)
+def remember_rollup_values(sender, instance, **kwargs):
+    """Keep the values the row was loaded with, to subtract them on change"""
+    setattr(instance, SNAPSHOT_ATTR, snapshot(instance))
+
+
+def _record(delta, load, created=False):
+    before = None if created else getattr(load, SNAPSHOT_ATTR, None)
+    after = snapshot(load)
+    if not created and before is None:
+        # Loaded with deferred fields: the old contribution is unknown, recompute the day instead
+        # (attribute access loads any deferred value)
+        delta.rebuild_day(load.company_id, timezone.localdate(load.pickup_date))
+        return
+    delta.replace(before, after)
+    setattr(load, SNAPSHOT_ATTR, after)
+
+
+@receiver(post_save, sender=Load)
+def update_rollups_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    delta = RollupDelta()
+    _record(delta, instance, created=created)
+    delta.apply()
+
+
+@receiver(post_delete, sender=Load)
+def update_rollups_on_delete(sender, instance, **kwargs):
+    before = getattr(instance, SNAPSHOT_ATTR, None) or snapshot(instance)
+    if before is None:
+        return
+    delta = RollupDelta()
+    delta.add(before, -1)
+    delta.apply()
+
+
+@receiver(loads_bulk_updated, sender=Load)
+def update_rollups_on_bulk_update(sender, loads, fields=None, **kwargs):
+    delta = RollupDelta()
+    for load in loads:
+        _record(delta, load)
+    delta.apply()
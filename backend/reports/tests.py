@@ -0,0 +1,101 @@
+"""
+Tests for incrementally maintained load rollups
+"""
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from companies.tests import make_company, make_driver, make_load, make_terminal, make_user
+from loads.bulk import bulk_set_status
+from loads.models import Load
+
+from .models import LoadDailyRollup
+from .rollups import load_volume, rebuild_rollups
+
+ROW_FIELDS = ('company_id', 'terminal_id', 'date', 'status', 'load_count', 'total_weight', 'total_distance', 'total_rate')
+
+
+def rollup_rows():
+    """Non-empty rollup rows; deltas leave zeroed rows behind that a rebuild drops"""
+    return sorted(
+        LoadDailyRollup.objects.exclude(load_count=0).values_list(*ROW_FIELDS),
+        key=lambda row: tuple(str(value) for value in row),
+    )
+
+
+class RollupMaintenanceTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.terminal = make_company('ACME')
+        cls.other_terminal = make_terminal(cls.terminal.department, 'T2')
+        cls.company = cls.terminal.department.division.company
+        cls.admin = make_user('admin', role='company_admin', company=cls.company)
+        cls.driver = make_driver('D1', cls.terminal)
+        cls.today = timezone.now()
+
+    def assert_matches_rebuild(self):
+        maintained = rollup_rows()
+        self.assertTrue(maintained)
+        days = {timezone.localdate(pickup) for pickup in Load.objects.values_list('pickup_date', flat=True)}
+        days |= set(LoadDailyRollup.objects.values_list('date', flat=True))
+        rebuild_rollups(days)
+        self.assertEqual(maintained, rollup_rows())
+
+    def test_creates(self):
+        make_load('L1', self.terminal)
+        make_load('L2', self.terminal, weight=2500)
+        make_load('L3', self.other_terminal, status='assigned', assigned_driver=self.driver)
+        make_load('L4', self.terminal, pickup_date=self.today - timedelta(days=3))
+        self.assert_matches_rebuild()
+
+    def test_loads_without_a_terminal(self):
+        make_load('L1', self.terminal, origin_terminal=None)
+        make_load('L2', self.terminal, origin_terminal=None)
+        self.assertEqual(LoadDailyRollup.objects.filter(terminal__isnull=True).count(), 1)
+        self.assert_matches_rebuild()
+
+    def test_updates(self):
+        moved = make_load('L1', self.terminal)
+        make_load('L2', self.terminal)
+        reweighed = make_load('L3', self.other_terminal, status='assigned', assigned_driver=self.driver)
+
+        moved.pickup_date = self.today - timedelta(days=2)
+        moved.origin_terminal = self.other_terminal
+        moved.save()
+        reweighed.weight = 44000
+        reweighed.rate = 2750
+        reweighed.save()
+        reweighed.transition_to('in_transit')
+        # A partially loaded instance falls back to rebuilding its day
+        partial = Load.objects.only('id', 'company_id', 'pickup_date').get(load_number='L2')
+        partial.distance = 900
+        partial.save()
+        self.assert_matches_rebuild()
+
+    def test_bulk_status(self):
+        loads = [make_load(f'L{i}', self.terminal, status='assigned', assigned_driver=self.driver) for i in range(3)]
+        result = bulk_set_status(self.admin, [str(load.pk) for load in loads], 'at_pickup')
+        self.assertEqual(result['updated'], 3)
+        self.assert_matches_rebuild()
+
+    def test_deletes(self):
+        make_load('L1', self.terminal)
+        make_load('L2', self.terminal).delete()
+        make_load('L3', self.other_terminal).delete()
+        self.assertFalse(LoadDailyRollup.objects.filter(terminal=self.other_terminal).exclude(load_count=0).exists())
+        self.assert_matches_rebuild()
+
+    def test_terminal_scope_counts_origin_loads_only(self):
+        department = self.terminal.department
+        clerk = make_user(
+            'clerk', company=self.company, division=department.division, department=department, terminal=self.terminal,
+        )
+        make_load('L1', self.terminal)
+        make_load('L2', self.other_terminal, destination=self.terminal)
+        day = timezone.localdate(self.today)
+        volume = load_volume(clerk, day, day)
+        self.assertEqual((volume['terminalBasis'], volume['totals']['loads']), ('origin', 1))
+        self.assertEqual(load_volume(self.admin, day, day, terminal=self.terminal)['totals']['loads'], 1)
+        self.assertEqual(load_volume(self.admin, day, day)['totals']['loads'], 2)
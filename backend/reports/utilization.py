@@ -0,0 +1,127 @@
+"""
+Driver and truck utilization over a date window
+
+Loads picked up in the window are grouped by ``assigned_driver`` (or
+``assigned_truck``) in one aggregate query that the
+``(assigned_driver, pickup_date)`` / ``(assigned_truck, pickup_date)``
+indexes serve. A second query lists the drivers or trucks in scope so idle
+ones appear on the scorecard with zeros. Results are cached per user scope
+and window.
+"""
+from datetime import datetime, time, timedelta
+
+from django.db.models import Count, DecimalField, DurationField, ExpressionWrapper, F, Q, Sum, Value
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from drivers.models import Driver
+from loads.models import Load
+from vehicles.models import Truck
+
+from .caching import report_cache, report_ttl, scope_key
+
+SUBJECTS = ('driver', 'truck')
+
+
+def _window(start, end):
+    first = timezone.make_aware(datetime.combine(start, time.min))
+    return first, timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min))
+
+
+def _subjects(user, by, terminal):
+    """Drivers or trucks in scope as {id: label fields}"""
+    if by == 'driver':
+        subjects = Driver.objects.for_user(user).exclude(status='terminated')
+        if terminal is not None:
+            subjects = subjects.filter(home_terminal=terminal)
+        rows = subjects.order_by().values('id', 'first_name', 'last_name', 'status')
+        return {row['id']: {'name': f"{row['first_name']} {row['last_name']}", 'status': row['status']} for row in rows}
+    subjects = Truck.objects.for_user(user)
+    if terminal is not None:
+        subjects = subjects.filter(Q(home_terminal=terminal) | Q(assigned_terminal=terminal))
+    rows = subjects.order_by().values('id', 'license_plate', 'status')
+    return {row['id']: {'name': row['license_plate'], 'status': row['status']} for row in rows}
+
+
+def _load_totals(user, by, start, end, terminal):
+    field = f'assigned_{by}'
+    first, last = _window(start, end)
+    loads = Load.objects.for_user(user).filter(
+        **{f'{field}__isnull': False}, pickup_date__gte=first, pickup_date__lt=last,
+    ).exclude(status='cancelled')
+    if terminal is not None:
+        loads = loads.filter(origin_terminal=terminal)
+    delivered = Q(status='delivered')
+    return loads.values(field).annotate(
+        loads=Count('id'),
+        delivered=Count('id', filter=delivered),
+        loaded_miles=Coalesce(Sum('distance'), 0),
+        revenue=Coalesce(Sum('rate'), Value(0), output_field=DecimalField(max_digits=14, decimal_places=2)),
+        on_duty_days=Count(TruncDate('pickup_date'), distinct=True),
+        transit=Sum(
+            ExpressionWrapper(F('delivered_at') - F('picked_up_at'), output_field=DurationField()),
+            filter=delivered & Q(picked_up_at__isnull=False, delivered_at__isnull=False),
+        ),
+    ).order_by()
+
+
+def build_utilization(user, start, end, by='driver', terminal=None):
+    """Loaded miles, revenue, load count and on-duty days per driver or truck between ``start`` and ``end``"""
+    field = f'assigned_{by}'
+    window_days = (end - start).days + 1
+    subjects = _subjects(user, by, terminal)
+    totals = {row[field]: row for row in _load_totals(user, by, start, end, terminal)}
+
+    rows = []
+    # Subjects outside the current filter that still hauled loads in scope are kept
+    for subject_id in subjects.keys() | totals.keys():
+        subject = subjects.get(subject_id, {'name': None, 'status': None})
+        row = totals.get(subject_id)
+        transit = row['transit'] if row else None
+        on_duty_days = row['on_duty_days'] if row else 0
+        rows.append({
+            'id': str(subject_id),
+            'name': subject['name'],
+            'status': subject['status'],
+            'loads': row['loads'] if row else 0,
+            'deliveredLoads': row['delivered'] if row else 0,
+            'loadedMiles': row['loaded_miles'] if row else 0,
+            'revenue': float(row['revenue']) if row else 0.0,
+            'onDutyDays': on_duty_days,
+            'utilization': round(on_duty_days / window_days, 4),
+            'transitHours': round(transit.total_seconds() / 3600, 2) if transit is not None else 0.0,
+        })
+    rows.sort(key=lambda row: (-row['loadedMiles'], -row['loads'], row['name'] or ''))
+
+    active = [row for row in rows if row['loads']]
+    return {
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'by': by,
+        'days': window_days,
+        'totals': {
+            'subjects': len(rows),
+            'active': len(active),
+            'loads': sum(row['loads'] for row in rows),
+            'loadedMiles': sum(row['loadedMiles'] for row in rows),
+            'revenue': round(sum(row['revenue'] for row in rows), 2),
+            'averageUtilization': round(sum(row['utilization'] for row in rows) / len(rows), 4) if rows else None,
+        },
+        'results': rows,
+        'generatedAt': timezone.now().isoformat(),
+    }
+
+
+def get_utilization(user, start, end, by='driver', terminal=None, refresh=False):
+    """Cached ``build_utilization``; users with the same scope share entries"""
+    terminal_part = terminal.pk if terminal is not None else 'all'
+    key = f'utilization:{by}:{scope_key(user)}:{terminal_part}:{start.isoformat()}:{end.isoformat()}'
+    cache = report_cache()
+    if not refresh:
+        report = cache.get(key)
+        if report is not None:
+            return report
+
+    report = build_utilization(user, start, end, by=by, terminal=terminal)
+    cache.set(key, report, report_ttl(end))
+    return report
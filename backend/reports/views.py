@@ -0,0 +1,136 @@
+"""
+API views for reports app
+"""
+from django.http import StreamingHttpResponse
+from rest_framework import permissions, status
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
+from rest_framework.response import Response
+
+from api.throttling import throttles_for
+from companies.models import Terminal
+
+from .columnar import EXPORT_TABLES, arrow_stream
+from .incidents import get_incident_analytics
+from .lsw import get_lsw_daily_report
+from .rollups import load_volume as load_volume_series
+from .serializers import (
+    ExportQuerySerializer, IncidentAnalyticsQuerySerializer, LoadVolumeQuerySerializer, LSWDailyQuerySerializer,
+    UtilizationQuerySerializer,
+)
+from .utilization import get_utilization
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def lsw_daily(request):
+    """Aggregated LSW daily report for a terminal (or the user's whole scope) and date"""
+    serializer = LSWDailyQuerySerializer(data=request.query_params)
+    if not serializer.is_valid():
+        return Response({
+            'error': 'Invalid query',
+            'details': serializer.errors
+        }, status=status.HTTP_400_BAD_REQUEST)
+    params = serializer.validated_data
+    
+    terminal = None
+    if params.get('terminal'):
+        terminal = Terminal.objects.for_user(request.user).filter(id=params['terminal']).first()
+        if terminal is None:
+            return Response({'error': 'Terminal not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    report = get_lsw_daily_report(request.user, terminal, day=params.get('date'), refresh=params['refresh'])
+    return Response(report)
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def load_volume(request):
+    """Load count, weight, distance and revenue per day, week or month, from the daily rollups"""
+    serializer = LoadVolumeQuerySerializer(data=request.query_params)
+    if not serializer.is_valid():
+        return Response({
+            'error': 'Invalid query',
+            'details': serializer.errors
+        }, status=status.HTTP_400_BAD_REQUEST)
+    params = serializer.validated_data
+    
+    terminal = None
+    if params.get('terminal'):
+        terminal = Terminal.objects.for_user(request.user).filter(id=params['terminal']).first()
+        if terminal is None:
+            return Response({'error': 'Terminal not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    return Response(load_volume_series(
+        request.user, params['start'], params['end'], terminal=terminal, granularity=params['granularity'],
+    ))
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def utilization(request):
+    """Loaded miles, revenue, load count and on-duty days per driver or truck over a date window"""
+    serializer = UtilizationQuerySerializer(data=request.query_params)
+    if not serializer.is_valid():
+        return Response({
+            'error': 'Invalid query',
+            'details': serializer.errors
+        }, status=status.HTTP_400_BAD_REQUEST)
+    params = serializer.validated_data
+    
+    terminal = None
+    if params.get('terminal'):
+        terminal = Terminal.objects.for_user(request.user).filter(id=params['terminal']).first()
+        if terminal is None:
+            return Response({'error': 'Terminal not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    return Response(get_utilization(
+        request.user, params['start'], params['end'], by=params['by'], terminal=terminal, refresh=params['refresh'],
+    ))
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def incidents(request):
+    """Incident counts over time, time to resolution against SLAs and open-incident aging"""
+    serializer = IncidentAnalyticsQuerySerializer(data=request.query_params)
+    if not serializer.is_valid():
+        return Response({
+            'error': 'Invalid query',
+            'details': serializer.errors
+        }, status=status.HTTP_400_BAD_REQUEST)
+    params = serializer.validated_data
+    
+    terminal = None
+    if params.get('terminal'):
+        terminal = Terminal.objects.for_user(request.user).filter(id=params['terminal']).first()
+        if terminal is None:
+            return Response({'error': 'Terminal not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    return Response(get_incident_analytics(
+        request.user, params['start'], params['end'], types=params['types'], terminal=terminal,
+        granularity=params['granularity'], refresh=params['refresh'],
+    ))
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+@throttle_classes(throttles_for('export'))
+def export_table(request, table):
+    """Stream a table in the user's scope as an Arrow IPC stream with typed columns"""
+    if table not in EXPORT_TABLES:
+        return Response({'error': f'Unknown table {table}'}, status=status.HTTP_404_NOT_FOUND)
+    serializer = ExportQuerySerializer(data=request.query_params)
+    if not serializer.is_valid():
+        return Response({
+            'error': 'Invalid query',
+            'details': serializer.errors
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    model, _ = EXPORT_TABLES[table]
+    queryset = model.objects.for_user(request.user)
+    response = StreamingHttpResponse(
+        arrow_stream(table, queryset, since=serializer.validated_data.get('since')),
+        content_type='application/vnd.apache.arrow.stream',
+    )
+    response['Content-Disposition'] = f'attachment; filename="{table}.arrows"'
+    return response
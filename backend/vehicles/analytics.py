@@ -0,0 +1,168 @@
+"""
+Fleet maintenance cost analytics
+
+Maintenance records in scope are fetched once as ``values_list`` columns and
+aggregated with numpy (grouped sums via ``bincount``, percentiles per group)
+instead of per-object Python loops.
+"""
+import numpy as np
+from django.db.models import CharField, F, FloatField
+from django.db.models.functions import Cast, Coalesce, ExtractMonth, ExtractYear
+
+from .models import MaintenanceRecord, Trailer, Truck
+
+GROUPINGS = ('model', 'terminal')
+LABOR_PERCENTILES = (50, 90)
+
+
+def _columns(records, group_by):
+    """Scoped records as numpy column arrays; conversions happen in SQL so rows arrive as plain scalars"""
+    if group_by == 'terminal':
+        labels = {'group_terminal': Coalesce(F('truck__home_terminal__name'), F('trailer__home_terminal__name'))}
+    else:
+        labels = {
+            'group_year': Coalesce(F('truck__year'), F('trailer__year')),
+            'group_make': Coalesce(F('truck__make'), F('trailer__make')),
+            'group_model': Coalesce(F('truck__model'), F('trailer__model')),
+        }
+    rows = list(records.annotate(
+        vehicle=Cast(Coalesce(F('truck_id'), F('trailer_id')), CharField()),
+        month=ExtractYear('performed_date') * 100 + ExtractMonth('performed_date'),
+        cost_value=Cast('cost', FloatField()),
+        labor_value=Cast('labor_hours', FloatField()),
+        **labels,
+    ).order_by().values_list(
+        'vehicle', 'month', 'cost_value', 'labor_value', 'mileage_at_service', 'truck__mileage', *labels,
+    ))
+    if not rows:
+        return None
+    columns = list(zip(*rows))
+    vehicle, month, cost, labor_hours, service_miles, odometer = columns[:6]
+
+    # Build each distinct label once
+    label_cache = {}
+    group = []
+    for parts in zip(*columns[6:]):
+        label = label_cache.get(parts)
+        if label is None:
+            label = label_cache[parts] = ' '.join(str(part) for part in parts if part) or 'Unassigned'
+        group.append(label)
+    return {
+        'vehicle': np.array(vehicle),
+        'month': np.array(month, dtype=np.int64),
+        'cost': np.array(cost, dtype=float),
+        'labor_hours': np.array(labor_hours, dtype=float),
+        'service_miles': np.array(service_miles, dtype=float),
+        # Odometer is the truck's non-null mileage, so NaN marks trailer records
+        'odometer': np.array(odometer, dtype=float),
+        group_by: np.array(group),
+    }
+
+
+def _cost_per_mile(data):
+    """Fleet and per-truck maintenance cost per mile driven over the serviced mileage span"""
+    trucks = ~np.isnan(data['odometer'])
+    vehicles, index = np.unique(data['vehicle'][trucks], return_inverse=True)
+    if not len(vehicles):
+        return {'fleet': None, 'trucks': 0, 'median': None}
+    cost = np.bincount(index, weights=data['cost'][trucks])
+    miles = np.fmax(data['service_miles'][trucks], data['odometer'][trucks])
+    first = np.full(len(vehicles), np.inf)
+    last = np.full(len(vehicles), -np.inf)
+    valid = ~np.isnan(data['service_miles'][trucks])
+    np.minimum.at(first, index[valid], data['service_miles'][trucks][valid])
+    np.maximum.at(last, index[~np.isnan(miles)], miles[~np.isnan(miles)])
+    span = last - first
+    measured = np.isfinite(span) & (span > 0)
+    if not measured.any():
+        return {'fleet': None, 'trucks': 0, 'median': None}
+    per_truck = cost[measured] / span[measured]
+    return {
+        'fleet': round(float(cost[measured].sum() / span[measured].sum()), 4),
+        'trucks': int(measured.sum()),
+        'median': round(float(np.median(per_truck)), 4),
+    }
+
+
+def _monthly(data, fleet_size):
+    months, index = np.unique(data['month'], return_inverse=True)
+    cost = np.bincount(index, weights=data['cost'])
+    records = np.bincount(index)
+    # Distinct vehicles serviced per month
+    pairs = np.unique(np.stack([index, np.unique(data['vehicle'], return_inverse=True)[1]]), axis=1)
+    serviced = np.bincount(pairs[0], minlength=len(months))
+    return [
+        {
+            'month': f'{month // 100}-{month % 100:02d}',
+            'totalCost': round(float(cost[i]), 2),
+            'records': int(records[i]),
+            'vehiclesServiced': int(serviced[i]),
+            'costPerVehicle': round(float(cost[i] / fleet_size), 2) if fleet_size else None,
+            'costPerServicedVehicle': round(float(cost[i] / serviced[i]), 2),
+        }
+        for i, month in enumerate(months)
+    ]
+
+
+def _by_group(data, key):
+    labels, index = np.unique(data[key], return_inverse=True)
+    cost = np.bincount(index, weights=data['cost'])
+    records = np.bincount(index)
+    hours = data['labor_hours']
+    groups = []
+    order = np.argsort(index, kind='stable')
+    bounds = np.searchsorted(index[order], np.arange(len(labels) + 1))
+    for i, label in enumerate(labels):
+        group_hours = hours[order[bounds[i]:bounds[i + 1]]]
+        group_hours = group_hours[~np.isnan(group_hours)]
+        distribution = None
+        if len(group_hours):
+            percentiles = np.percentile(group_hours, LABOR_PERCENTILES)
+            distribution = {
+                'mean': round(float(group_hours.mean()), 2),
+                **{f'p{p}': round(float(value), 2) for p, value in zip(LABOR_PERCENTILES, percentiles)},
+                'max': round(float(group_hours.max()), 2),
+                'total': round(float(group_hours.sum()), 2),
+            }
+        groups.append({
+            'group': label,
+            'records': int(records[i]),
+            'totalCost': round(float(cost[i]), 2),
+            'averageCost': round(float(cost[i] / records[i]), 2),
+            'laborHours': distribution,
+        })
+    groups.sort(key=lambda group: group['totalCost'], reverse=True)
+    return groups
+
+
+def maintenance_analytics(user, start=None, end=None, group_by='model', vehicle_type=None):
+    """Cost per mile, monthly cost per vehicle and labor-hour distribution per group"""
+    records = MaintenanceRecord.objects.for_user(user)
+    if start:
+        records = records.filter(performed_date__gte=start)
+    if end:
+        records = records.filter(performed_date__lte=end)
+    if vehicle_type == 'truck':
+        records = records.filter(truck__isnull=False)
+    elif vehicle_type == 'trailer':
+        records = records.filter(truck__isnull=True, trailer__isnull=False)
+
+    fleet_size = 0
+    if vehicle_type != 'trailer':
+        fleet_size += Truck.objects.for_user(user).count()
+    if vehicle_type != 'truck':
+        fleet_size += Trailer.objects.for_user(user).count()
+
+    data = _columns(records, group_by)
+    if data is None:
+        return {'records': 0, 'totalCost': 0, 'fleetSize': fleet_size, 'costPerMile': None,
+                'monthly': [], 'groupBy': group_by, 'groups': []}
+    return {
+        'records': len(data['cost']),
+        'totalCost': round(float(data['cost'].sum()), 2),
+        'fleetSize': fleet_size,
+        'costPerMile': _cost_per_mile(data),
+        'monthly': _monthly(data, fleet_size),
+        'groupBy': group_by,
+        'groups': _by_group(data, group_by),
+    }
@@ -0,0 +1,197 @@
+"""
+Predicted next service dates for trucks and trailers
+
+A batch job over the whole fleet. Maintenance history is read once as
+column arrays and every per-vehicle statistic is a grouped ``bincount``
+sum, so the cost is a handful of queries and numpy passes regardless of
+fleet size:
+
+* service interval: the vehicle's mean mileage and day gaps between
+  consecutive services, falling back to the fleet median, then a default
+* mileage accrual: recent load ``distance`` per day when the truck has
+  been dispatched, else the least-squares slope of ``mileage_at_service``
+  over service dates, else the fleet median rate
+* prediction: the earlier of the day the interval mileage is reached and
+  the last service plus the day interval. Trailers have no odometer and
+  use the day interval only.
+
+Predictions are written back with ``bulk_update`` so the maintenance board
+is a single indexed query on ``(company, predicted_maintenance_due)``.
+"""
+from datetime import date, timedelta
+
+import numpy as np
+from django.conf import settings
+from django.db.models import Sum
+from django.utils import timezone
+
+from loads.models import Load
+
+from .models import MaintenanceRecord, Trailer, Truck
+
+_options = getattr(settings, 'MAINTENANCE_PREDICTION', {})
+DEFAULT_INTERVAL_MILES = _options.get('DEFAULT_INTERVAL_MILES', 25000)
+DEFAULT_INTERVAL_DAYS = _options.get('DEFAULT_INTERVAL_DAYS', 180)
+ACCRUAL_WINDOW_DAYS = _options.get('ACCRUAL_WINDOW_DAYS', 90)
+BATCH_SIZE = _options.get('BATCH_SIZE', 500)
+PREDICTED_FIELDS = ['predicted_maintenance_due', 'maintenance_predicted_at']
+
+
+def _history(vehicle_field, vehicles, index_of):
+    """Service history as (vehicle index, day ordinal, mileage) arrays sorted by vehicle and day"""
+    rows = MaintenanceRecord.objects.filter(**{f'{vehicle_field}__in': vehicles.values('pk')}).order_by().values_list(
+        f'{vehicle_field}_id', 'performed_date', 'mileage_at_service',
+    )
+    if vehicle_field == 'trailer':
+        rows = rows.filter(truck__isnull=True)
+    rows = list(rows)
+    if not rows:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0)
+    vehicles, days, miles = zip(*rows)
+    vehicle = np.array([index_of[pk] for pk in vehicles], dtype=np.int64)
+    day = np.array([performed.toordinal() for performed in days], dtype=np.int64)
+    mileage = np.array(miles, dtype=float)
+    order = np.lexsort((day, vehicle))
+    return vehicle[order], day[order], mileage[order]
+
+
+def _mean_gaps(vehicle, values, size):
+    """Per-vehicle mean of positive gaps between consecutive values (NaN where there are none)"""
+    gaps = np.diff(values)
+    same = vehicle[1:] == vehicle[:-1]
+    valid = same & np.isfinite(gaps) & (gaps > 0)
+    owner = vehicle[1:][valid]
+    totals = np.bincount(owner, weights=gaps[valid], minlength=size)
+    counts = np.bincount(owner, minlength=size)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return totals / counts
+
+
+def _with_fallback(values, default):
+    """Fill missing per-vehicle values with the fleet median, or ``default`` if nothing is known"""
+    known = np.isfinite(values)
+    fallback = float(np.median(values[known])) if known.any() else default
+    return np.where(known, values, fallback)
+
+
+def _mileage_slope(vehicle, day, mileage, size):
+    """Per-vehicle least-squares miles per day of ``mileage_at_service`` over service dates"""
+    valid = np.isfinite(mileage)
+    owner, x, y = vehicle[valid], day[valid].astype(float), mileage[valid]
+    # Center days to keep the sums well conditioned
+    x = x - (x.mean() if len(x) else 0)
+    n = np.bincount(owner, minlength=size).astype(float)
+    sx = np.bincount(owner, weights=x, minlength=size)
+    sy = np.bincount(owner, weights=y, minlength=size)
+    sxx = np.bincount(owner, weights=x * x, minlength=size)
+    sxy = np.bincount(owner, weights=x * y, minlength=size)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        variance = n * sxx - sx * sx
+        slope = (n * sxy - sx * sy) / variance
+    return np.where((n >= 2) & (variance > 0) & (slope > 0), slope, np.nan)
+
+
+def _last_service(vehicle, day, mileage, size):
+    """Per-vehicle last service day ordinal and last recorded service mileage"""
+    last_day = np.full(size, -1, dtype=np.int64)
+    np.maximum.at(last_day, vehicle, day)
+    last_miles = np.full(size, np.nan)
+    recorded = np.isfinite(mileage)
+    # Rows are sorted by vehicle and day, so the final write per vehicle wins
+    last_miles[vehicle[recorded]] = mileage[recorded]
+    return last_day, last_miles
+
+
+def _load_rate(trucks, index_of):
+    """Per-truck miles per day from the distance of loads picked up in the accrual window"""
+    since = timezone.now() - timedelta(days=ACCRUAL_WINDOW_DAYS)
+    rows = Load.objects.filter(
+        assigned_truck__in=trucks.values('pk'), pickup_date__gte=since, distance__isnull=False,
+    ).exclude(status='cancelled').values('assigned_truck').annotate(miles=Sum('distance')).order_by()
+    rate = np.full(len(index_of), np.nan)
+    for row in rows:
+        if row['miles']:
+            rate[index_of[row['assigned_truck']]] = row['miles'] / ACCRUAL_WINDOW_DAYS
+    return rate
+
+
+def _due_dates(base_day, interval_days, mileage_days=None):
+    due = base_day + np.ceil(interval_days)
+    if mileage_days is not None:
+        due = np.fmin(due, mileage_days)
+    return [date.fromordinal(int(day)) for day in due]
+
+
+def predict_trucks(trucks):
+    """Predicted due dates for a truck queryset; returns {truck id: date}"""
+    rows = list(trucks.order_by().values_list('id', 'mileage', 'last_maintenance'))
+    if not rows:
+        return {}
+    ids, odometer, last_maintenance = zip(*rows)
+    size = len(ids)
+    index_of = {pk: index for index, pk in enumerate(ids)}
+    today = timezone.localdate().toordinal()
+
+    vehicle, day, mileage = _history('truck', trucks, index_of)
+    interval_miles = _with_fallback(_mean_gaps(vehicle, mileage, size), DEFAULT_INTERVAL_MILES)
+    interval_days = _with_fallback(_mean_gaps(vehicle, day.astype(float), size), DEFAULT_INTERVAL_DAYS)
+
+    rate = _load_rate(trucks, index_of)
+    rate = np.where(np.isfinite(rate), rate, _mileage_slope(vehicle, day, mileage, size))
+    rate = _with_fallback(rate, np.nan)
+
+    last_day, last_miles = _last_service(vehicle, day, mileage, size)
+    base_day = np.maximum(last_day, [performed.toordinal() for performed in last_maintenance])
+    odometer = np.array(odometer, dtype=float)
+    # Miles since service from the odometer, else accrued at the rate since the service day
+    since_service = np.where(
+        np.isfinite(last_miles) & (odometer >= np.nan_to_num(last_miles)),
+        odometer - last_miles,
+        rate * (today - base_day),
+    )
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mileage_day = today + np.ceil((interval_miles - since_service) / rate)
+    # A truck already past its interval came due no earlier than its last service
+    mileage_day = np.where(np.isfinite(mileage_day), np.maximum(mileage_day, base_day), np.nan)
+    return dict(zip(ids, _due_dates(base_day, interval_days, mileage_day)))
+
+
+def predict_trailers(trailers):
+    """Predicted due dates for a trailer queryset; returns {trailer id: date}"""
+    rows = list(trailers.order_by().values_list('id', 'last_inspection', 'created_at'))
+    if not rows:
+        return {}
+    ids, last_inspection, created_at = zip(*rows)
+    size = len(ids)
+    index_of = {pk: index for index, pk in enumerate(ids)}
+
+    vehicle, day, mileage = _history('trailer', trailers, index_of)
+    interval_days = _with_fallback(_mean_gaps(vehicle, day.astype(float), size), DEFAULT_INTERVAL_DAYS)
+    last_day, _ = _last_service(vehicle, day, mileage, size)
+    known = np.array([
+        (inspected or timezone.localdate(created)).toordinal()
+        for inspected, created in zip(last_inspection, created_at)
+    ])
+    return dict(zip(ids, _due_dates(np.maximum(last_day, known), interval_days)))
+
+
+def _write(model, predictions, predicted_at):
+    instances = [
+        model(pk=pk, predicted_maintenance_due=due, maintenance_predicted_at=predicted_at)
+        for pk, due in predictions.items()
+    ]
+    model.objects.bulk_update(instances, PREDICTED_FIELDS, batch_size=BATCH_SIZE)
+    return len(instances)
+
+
+def predict_fleet(company_ids=None):
+    """Predict and store the next service date of every truck and trailer; returns (trucks, trailers)"""
+    trucks, trailers = Truck.objects.all(), Trailer.objects.all()
+    if company_ids is not None:
+        trucks = trucks.filter(company_id__in=company_ids)
+        trailers = trailers.filter(company_id__in=company_ids)
+    predicted_at = timezone.now()
+    return (
+        _write(Truck, predict_trucks(trucks), predicted_at),
+        _write(Trailer, predict_trailers(trailers), predicted_at),
+    )
@@ -0,0 +1 @@
+# Vehicles management commands
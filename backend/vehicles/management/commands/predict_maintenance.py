@@ -0,0 +1,25 @@
+"""
+Management command to predict the next service date of every truck and trailer
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from companies.models import Company
+from vehicles.maintenance import predict_fleet
+
+
+class Command(BaseCommand):
+    help = 'Predict next maintenance dates from service history and mileage accrual'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--company', help='Only predict for the company with this code')
+
+    def handle(self, *args, **options):
+        company_ids = None
+        if options['company']:
+            company = Company.objects.filter(code=options['company']).first()
+            if company is None:
+                raise CommandError(f"Company {options['company']} not found")
+            company_ids = [company.pk]
+
+        trucks, trailers = predict_fleet(company_ids=company_ids)
+        self.stdout.write(self.style.SUCCESS(f'Predicted maintenance for {trucks} trucks and {trailers} trailers'))
@@ -0,0 +1,39 @@
+# Generated by Django 5.0.4 on 2026-10-19 17:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0005_terminal_location'),
+        ('drivers', '0006_driver_driver_company_name_idx'),
+        ('vehicles', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='truck',
+            name='geohash',
+            field=models.CharField(blank=True, max_length=12),
+        ),
+        migrations.AddField(
+            model_name='truck',
+            name='last_known_lat',
+            field=models.DecimalField(blank=True, decimal_places=8, max_digits=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='truck',
+            name='last_known_lng',
+            field=models.DecimalField(blank=True, decimal_places=8, max_digits=11, null=True),
+        ),
+        migrations.AddField(
+            model_name='truck',
+            name='last_position_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='truck',
+            index=models.Index(fields=['company', 'geohash'], name='truck_company_geohash_idx', opclasses=['uuid_ops', 'varchar_pattern_ops']),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.0.4 on 2026-10-19 18:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0005_terminal_location'),
+        ('drivers', '0006_driver_driver_company_name_idx'),
+        ('vehicles', '0002_truck_last_known_position'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trailer',
+            name='maintenance_predicted_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='trailer',
+            name='predicted_maintenance_due',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='truck',
+            name='maintenance_predicted_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='truck',
+            name='predicted_maintenance_due',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='trailer',
+            index=models.Index(fields=['company', 'predicted_maintenance_due'], name='trailer_predicted_maint_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='truck',
+            index=models.Index(fields=['company', 'predicted_maintenance_due'], name='truck_predicted_maint_idx'),
+        ),
+    ]
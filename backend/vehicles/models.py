@@ -44,6 +44,16 @@ class Truck(BaseModel):
     # Current assignment
     current_load = models.CharField(max_length=100, blank=True)  # Load ID
     
+    # Predicted from maintenance history and mileage accrual (vehicles.maintenance)
+    predicted_maintenance_due = models.DateField(null=True, blank=True)
+    maintenance_predicted_at = models.DateTimeField(null=True, blank=True)
+    
+    # Last known position (see dispatch.geo)
+    last_known_lat = models.DecimalField(max_digits=10, decimal_places=8, null=True, blank=True)
+    last_known_lng = models.DecimalField(max_digits=11, decimal_places=8, null=True, blank=True)
+    last_position_at = models.DateTimeField(null=True, blank=True)
+    geohash = models.CharField(max_length=12, blank=True)
+    
     # Organizational context
     company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name='trucks')
     division = models.ForeignKey(Division, on_delete=models.SET_NULL, null=True, blank=True)
@@ -51,17 +61,49 @@ class Truck(BaseModel):
     home_terminal = models.ForeignKey(Terminal, on_delete=models.SET_NULL, null=True, blank=True)
     assigned_terminal = models.ForeignKey(Terminal, on_delete=models.SET_NULL, null=True, blank=True, related_name='assigned_trucks')
     
+    SCOPE_LOOKUPS = {
+        'company': ('company',),
+        'division': ('division',),
+        'department': ('department',),
+        'terminal': ('home_terminal', 'assigned_terminal'),
+    }
+    
     class Meta:
         unique_together = ['company', 'license_plate']
         ordering = ['make', 'model', 'year']
+        indexes = [
+            models.Index(
+                fields=['company', 'geohash'], name='truck_company_geohash_idx',
+                opclasses=['uuid_ops', 'varchar_pattern_ops'],
+            ),
+            models.Index(fields=['company', 'predicted_maintenance_due'], name='truck_predicted_maint_idx'),
+        ]
     
     def __str__(self):
         return f"{self.year} {self.make} {self.model} ({self.license_plate})"
     
+    def save(self, *args, **kwargs):
+        from dispatch.geo import encode
+        if self.last_known_lat is not None and self.last_known_lng is not None:
+            self.geohash = encode(self.last_known_lat, self.last_known_lng)
+        else:
+            self.geohash = ''
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'last_known_lat', 'last_known_lng'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'geohash'}
+        super().save(*args, **kwargs)
+    
+    @property
+    def maintenance_due_date(self):
+        """The earlier of the scheduled and the predicted service date"""
+        dates = [date for date in (self.next_maintenance_due, self.predicted_maintenance_due) if date]
+        return min(dates) if dates else None
+    
     @property
     def is_maintenance_due(self):
         from django.utils import timezone
-        return self.next_maintenance_due <= timezone.now().date()
+        due = self.maintenance_due_date
+        return due is not None and due <= timezone.now().date()
     
     @property
     def is_registration_expired(self):
@@ -108,6 +150,8 @@ class Trailer(BaseModel):
     last_inspection = models.DateField(null=True, blank=True)
     next_inspection_due = models.DateField(null=True, blank=True)
     registration_expiry = models.DateField(null=True, blank=True)
+    predicted_maintenance_due = models.DateField(null=True, blank=True)
+    maintenance_predicted_at = models.DateTimeField(null=True, blank=True)
     
     # Organizational context
     company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name='trailers')
@@ -115,9 +159,19 @@ class Trailer(BaseModel):
     department = models.ForeignKey(Department, on_delete=models.SET_NULL, null=True, blank=True)
     home_terminal = models.ForeignKey(Terminal, on_delete=models.SET_NULL, null=True, blank=True)
     
+    SCOPE_LOOKUPS = {
+        'company': ('company',),
+        'division': ('division',),
+        'department': ('department',),
+        'terminal': ('home_terminal',),
+    }
+    
     class Meta:
         unique_together = ['company', 'trailer_number']
         ordering = ['trailer_number']
+        indexes = [
+            models.Index(fields=['company', 'predicted_maintenance_due'], name='trailer_predicted_maint_idx'),
+        ]
     
     def __str__(self):
         return f"Trailer {self.trailer_number}"
@@ -148,6 +202,13 @@ class MaintenanceRecord(BaseModel):
     
     notes = models.TextField(blank=True)
     
+    SCOPE_LOOKUPS = {
+        'company': ('truck__company', 'trailer__company'),
+        'division': ('truck__division', 'trailer__division'),
+        'department': ('truck__department', 'trailer__department'),
+        'terminal': ('truck__home_terminal', 'trailer__home_terminal'),
+    }
+    
     def __str__(self):
         vehicle = self.truck or self.trailer
         return f"{vehicle} - {self.maintenance_type} on {self.performed_date}"
@@ -2,6 +2,7 @@
 Serializers for vehicles app
 """
 from rest_framework import serializers
+from .analytics import GROUPINGS
 from .models import Truck, Trailer, MaintenanceRecord
 
 
@@ -17,6 +18,7 @@ class TruckSerializer(serializers.ModelSerializer):
     insuranceExpiry = serializers.DateField(source='insurance_expiry')
     maintenanceNotes = serializers.CharField(source='maintenance_notes', allow_blank=True, required=False)
     currentLoad = serializers.CharField(source='current_load_id', allow_null=True, required=False)
+    predictedMaintenanceDue = serializers.DateField(source='predicted_maintenance_due', read_only=True)
     createdAt = serializers.DateTimeField(source='created_at')
     updatedAt = serializers.DateTimeField(source='updated_at')
     
@@ -40,7 +42,7 @@ class TruckSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'make', 'model', 'year', 'licensePlate', 'vin', 'color',
             'status', 'assignedDriverId', 'mileage', 'lastMaintenance',
-            'nextMaintenanceDue', 'registrationExpiry', 'insuranceExpiry',
+            'nextMaintenanceDue', 'predictedMaintenanceDue', 'registrationExpiry', 'insuranceExpiry',
             'maintenanceNotes', 'currentLoad', 'organizationalContext',
             'is_maintenance_due', 'is_registration_expired', 'is_insurance_expired',
             'createdAt', 'updatedAt'
@@ -59,6 +61,7 @@ class TrailerSerializer(serializers.ModelSerializer):
     nextMaintenanceDue = serializers.DateField(source='next_inspection_due', allow_null=True, required=False)
     registrationExpiry = serializers.DateField(source='registration_expiry', allow_null=True, required=False)
     insuranceExpiry = serializers.DateField(source='insurance_expiry', allow_null=True, required=False)
+    predictedMaintenanceDue = serializers.DateField(source='predicted_maintenance_due', read_only=True)
     createdAt = serializers.DateTimeField(source='created_at')
     updatedAt = serializers.DateTimeField(source='updated_at')
     
@@ -78,7 +81,7 @@ class TrailerSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'make', 'model', 'year', 'licensePlate', 'vin', 'type',
             'capacity', 'length', 'assignedTruckId', 'status',
-            'lastMaintenance', 'nextMaintenanceDue', 'registrationExpiry',
+            'lastMaintenance', 'nextMaintenanceDue', 'predictedMaintenanceDue', 'registrationExpiry',
             'insuranceExpiry', 'organizationalContext', 'createdAt', 'updatedAt'
         ]
         read_only_fields = ['id', 'createdAt', 'updatedAt']
@@ -96,3 +99,31 @@ class MaintenanceRecordSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is not None:
+            # Records (and the costs analytics sum) can only be attached to the user's own vehicles
+            self.fields['truck'].queryset = Truck.objects.for_user(request.user)
+            self.fields['trailer'].queryset = Trailer.objects.for_user(request.user)
+    
+    def validate(self, attrs):
+        truck = attrs['truck'] if 'truck' in attrs else getattr(self.instance, 'truck', None)
+        trailer = attrs['trailer'] if 'trailer' in attrs else getattr(self.instance, 'trailer', None)
+        if (truck is None) == (trailer is None):
+            raise serializers.ValidationError('Provide exactly one of truck or trailer')
+        return attrs
+
+
+class MaintenanceAnalyticsQuerySerializer(serializers.Serializer):
+    """Query parameters for maintenance cost analytics"""
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    groupBy = serializers.ChoiceField(choices=GROUPINGS, default='model')
+    vehicleType = serializers.ChoiceField(choices=['truck', 'trailer'], required=False)
+
+
+class MaintenanceBoardQuerySerializer(serializers.Serializer):
+    """Query parameters for the predicted maintenance board"""
+    days = serializers.IntegerField(min_value=0, max_value=365, default=30)
@@ -1,47 +1,94 @@
 """
 API views for vehicles app
 """
-from rest_framework import viewsets, permissions
+from datetime import timedelta
+
+from django.utils import timezone
+from rest_framework import viewsets, permissions, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from companies.permissions import HasTMSPermission, write_permissions
+from companies.scoping import ScopedQuerysetMixin
+from .analytics import maintenance_analytics
 from .models import Truck, Trailer, MaintenanceRecord
-from .serializers import TruckSerializer, TrailerSerializer, MaintenanceRecordSerializer
+from .serializers import (
+    TruckSerializer, TrailerSerializer, MaintenanceRecordSerializer, MaintenanceAnalyticsQuerySerializer,
+    MaintenanceBoardQuerySerializer,
+)
+
+
+class MaintenanceBoardMixin:
+    """Vehicles whose predicted service date falls within ``days``, read from the stored predictions"""
+    board_number_field = None
+    
+    @action(detail=False, methods=['get'], url_path='maintenance-board')
+    def maintenance_board(self, request):
+        serializer = MaintenanceBoardQuerySerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return Response({
+                'error': 'Invalid query',
+                'details': serializer.errors
+            }, status=status.HTTP_400_BAD_REQUEST)
+        today = timezone.localdate()
+        horizon = today + timedelta(days=serializer.validated_data['days'])
+        vehicles = self.get_queryset().filter(predicted_maintenance_due__lte=horizon).order_by(
+            'predicted_maintenance_due',
+        ).values('id', self.board_number_field, 'status', 'predicted_maintenance_due', 'maintenance_predicted_at')
+        return Response({
+            'through': horizon.isoformat(),
+            'vehicles': [
+                {
+                    'id': str(vehicle['id']),
+                    'number': vehicle[self.board_number_field],
+                    'status': vehicle['status'],
+                    'predictedMaintenanceDue': vehicle['predicted_maintenance_due'].isoformat(),
+                    'overdue': vehicle['predicted_maintenance_due'] < today,
+                    'predictedAt': vehicle['maintenance_predicted_at'],
+                }
+                for vehicle in vehicles
+            ],
+        })
 
 
-class TruckViewSet(viewsets.ModelViewSet):
+class TruckViewSet(MaintenanceBoardMixin, ScopedQuerysetMixin, viewsets.ModelViewSet):
     """ViewSet for managing trucks"""
     queryset = Truck.objects.all()
     serializer_class = TruckSerializer
-    permission_classes = [permissions.AllowAny]  # Temporarily allow unauthenticated access for testing
-    
-    def get_queryset(self):
-        """Return all trucks for now (no company filtering during testing)"""
-        return Truck.objects.all()
-    
-    def perform_create(self, serializer):
-        """Save truck without company requirement for now"""
-        serializer.save()
+    permission_classes = [permissions.IsAuthenticated, HasTMSPermission]
+    required_permissions = write_permissions('manage_vehicles', 'manage_department_vehicles')
+    board_number_field = 'license_plate'
 
 
-class TrailerViewSet(viewsets.ModelViewSet):
+class TrailerViewSet(MaintenanceBoardMixin, ScopedQuerysetMixin, viewsets.ModelViewSet):
     """ViewSet for managing trailers"""
     queryset = Trailer.objects.all()
     serializer_class = TrailerSerializer
-    permission_classes = [permissions.AllowAny]  # Temporarily allow unauthenticated access for testing
-    
-    def get_queryset(self):
-        """Return all trailers for now (no company filtering during testing)"""
-        return Trailer.objects.all()
-    
-    def perform_create(self, serializer):
-        """Save trailer without company requirement for now"""
-        serializer.save()
+    permission_classes = [permissions.IsAuthenticated, HasTMSPermission]
+    required_permissions = write_permissions('manage_vehicles', 'manage_department_vehicles')
+    board_number_field = 'trailer_number'
 
 
-class MaintenanceRecordViewSet(viewsets.ModelViewSet):
+class MaintenanceRecordViewSet(ScopedQuerysetMixin, viewsets.ModelViewSet):
     """ViewSet for managing maintenance records"""
-    queryset = MaintenanceRecord.objects.all()
+    queryset = MaintenanceRecord.objects.select_related('truck', 'trailer').order_by('-performed_date')
     serializer_class = MaintenanceRecordSerializer
-    permission_classes = [permissions.AllowAny]  # Temporarily allow unauthenticated access for testing
+    permission_classes = [permissions.IsAuthenticated, HasTMSPermission]
+    required_permissions = write_permissions('manage_vehicles', 'manage_department_vehicles')
     
-    def get_queryset(self):
-        """Return all maintenance records for now"""
-        return MaintenanceRecord.objects.all()
+    @action(detail=False, methods=['get'])
+    def analytics(self, request):
+        """Cost per mile, monthly cost per vehicle and labor-hour distributions"""
+        serializer = MaintenanceAnalyticsQuerySerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return Response({
+                'error': 'Invalid query',
+                'details': serializer.errors
+            }, status=status.HTTP_400_BAD_REQUEST)
+        params = serializer.validated_data
+        return Response(maintenance_analytics(
+            request.user,
+            start=params.get('start'),
+            end=params.get('end'),
+            group_by=params['groupBy'],
+            vehicle_type=params.get('vehicleType'),
+        ))